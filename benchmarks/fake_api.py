@@ -0,0 +1,205 @@
+import time
+from collections import defaultdict
+from threading import Lock
+
+
+class Info(object):
+    """
+    Stand-in for CloudShell API response objects
+    """
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class SyntheticInventory(object):
+    """
+    In-memory CloudShell inventory, resources have Chassis/Module/Sub Module/Port trees, ports of neighbour
+    resources are connected, reservations have routes and connectors between the connected ports
+    """
+    FAMILY = 'L1 Switch'
+    MODEL = 'Old Model'
+    NEW_MODEL = 'New Model'
+    DRIVER = 'Old Driver'
+
+    def __init__(self, resources, modules=2, ports=4, reservations=None, routes_per_reservation=2, name_tag='R'):
+        """
+        :param int resources: Number of resources
+        :param int modules: Modules per resource
+        :param int ports: Ports per module
+        :param int reservations: Number of reservations, a fifth of resources by default
+        :param int routes_per_reservation: Routes and connectors per reservation
+        :param str name_tag: Prefix of the resource names
+        """
+        self.name_tag = name_tag
+        self.resource_names = ['{} {}'.format(name_tag, index) for index in xrange(resources)]
+        self._modules = modules
+        self._ports = ports
+        self.details = {}
+        self.nodes = {}
+        self.reservations = {}
+
+        for index, name in enumerate(self.resource_names):
+            self.details[name] = self.build_resource(name, self.MODEL, '10.{}.{}.{}'.format(
+                index // 65536 % 256, index // 256 % 256, index % 256), self.DRIVER)
+        self._connect_neighbours()
+        if reservations is None:
+            reservations = max(1, resources // 5)
+        self._build_reservations(reservations, routes_per_reservation)
+
+    def build_resource(self, name, model, address, driver):
+        ports = []
+        modules = []
+        for module_index in xrange(1, self._modules + 1):
+            module_path = '{}/Chassis 1/Module {}'.format(name, module_index)
+            module_ports = []
+            for port_index in xrange(1, self._ports + 1):
+                port = Info(Name='{}/Sub Module 1/Port {}'.format(module_path, port_index),
+                            FullAddress='{}/1/{}/{}'.format(address, module_index, port_index),
+                            ResourceFamilyName='Port', ResourceModelName='Generic Port', ChildResources=[],
+                            Connections=[])
+                module_ports.append(port)
+            sub_module = Info(Name='{}/Sub Module 1'.format(module_path), ChildResources=module_ports,
+                              ResourceFamilyName='Sub Module', Connections=[])
+            modules.append(Info(Name=module_path, ChildResources=[sub_module], ResourceFamilyName='Module',
+                                Connections=[]))
+            ports.extend(module_ports)
+        chassis = Info(Name='{}/Chassis 1'.format(name), ChildResources=modules, ResourceFamilyName='Chassis',
+                       Connections=[])
+        attributes = [Info(Name='User', Value='admin', Type='String'),
+                      Info(Name='Password', Value='encrypted', Type='Password')]
+        root = Info(Name=name, Address=address, RootAddress=address, FullAddress=address, DriverName=driver,
+                    ResourceFamilyName=self.FAMILY, ResourceModelName=model, ResourceAttributes=attributes,
+                    ChildResources=[chassis], Connections=[])
+        for node in [root, chassis] + modules + [module.ChildResources[0] for module in modules] + ports:
+            self.nodes[node.Name] = node
+        return root
+
+    def _port_name(self, resource_index, module_index, port_index):
+        return '{}/Chassis 1/Module {}/Sub Module 1/Port {}'.format(self.resource_names[resource_index],
+                                                                      module_index, port_index)
+
+    def _connect_neighbours(self):
+        """
+        Module 1 ports of the even resource are connected to module 1 ports of the next one
+        """
+        for index in xrange(0, len(self.resource_names) - 1, 2):
+            for port_index in xrange(1, self._ports + 1):
+                self.connect(self._port_name(index, 1, port_index), self._port_name(index + 1, 1, port_index))
+
+    def connect(self, port_a, port_b):
+        for port in filter(None, (port_a, port_b)):
+            for connection in self.nodes[port].Connections:
+                self.nodes[connection.FullPath].Connections = []
+        self.nodes[port_a].Connections = [Info(FullPath=port_b, Weight=None)] if port_b else []
+        if port_b:
+            self.nodes[port_b].Connections = [Info(FullPath=port_a, Weight=None)]
+
+    def _build_reservations(self, reservations, routes_per_reservation):
+        pairs = max(1, len(self.resource_names) // 2)
+        for index in xrange(reservations):
+            active_routes = []
+            connectors = []
+            for route_index in xrange(routes_per_reservation):
+                pair = (index * routes_per_reservation + route_index) % pairs * 2
+                if pair + 1 >= len(self.resource_names):
+                    continue
+                port_index = (index + route_index) % self._ports + 1
+                source = self._port_name(pair, 2, port_index)
+                target = self._port_name(pair + 1, 2, port_index)
+                transit_a = self._port_name(pair, 1, port_index)
+                transit_b = self._port_name(pair + 1, 1, port_index)
+                segments = [Info(Source=source, Target=transit_a), Info(Source=transit_a, Target=transit_b),
+                            Info(Source=transit_b, Target=target)]
+                active_routes.append(Info(Source=source, Target=target, RouteType='bi', Alias='Route', Shared=False,
+                                          Segments=segments))
+                connectors.append(Info(Source=self._port_name(pair, 2, port_index),
+                                       Target=self._port_name(pair + 1, 2, port_index),
+                                       Direction='bi', Type='Connector', Alias='Connector'))
+            self.reservations['reservation-{}'.format(index)] = Info(ActiveRoutesInfo=active_routes,
+                                                                       RequestedRoutesInfo=[], Connectors=connectors)
+
+
+class FakeApi(object):
+    """
+    CloudShellAPISession replacement serving the synthetic inventory, every call is delayed for the latency
+    """
+
+    def __init__(self, inventory, latency=0.0):
+        """
+        :type inventory: SyntheticInventory
+        :param float latency: Per-call latency in seconds
+        """
+        self._inventory = inventory
+        self._latency = latency
+        self._lock = Lock()
+        self.calls = defaultdict(int)
+
+    def _call(self, method_name):
+        with self._lock:
+            self.calls[method_name] += 1
+        if self._latency:
+            time.sleep(self._latency)
+
+    @property
+    def calls_count(self):
+        return sum(self.calls.values())
+
+    def GetResourceList(self):
+        self._call('GetResourceList')
+        resources = [Info(Name=details.Name, Address=details.Address, ResourceFamilyName=details.ResourceFamilyName,
+                          ResourceModelName=details.ResourceModelName) for details in
+                     self._inventory.details.itervalues()]
+        return Info(Resources=resources)
+
+    def GetResourceDetails(self, resourceFullPath=''):
+        self._call('GetResourceDetails')
+        return self._inventory.nodes[resourceFullPath]
+
+    def GetCurrentReservations(self):
+        self._call('GetCurrentReservations')
+        return Info(Reservations=[Info(Id=reservation_id) for reservation_id in sorted(self._inventory.reservations)])
+
+    def GetReservationDetails(self, reservationId=''):
+        self._call('GetReservationDetails')
+        return Info(ReservationDescription=self._inventory.reservations[reservationId])
+
+    def CreateResource(self, resourceFamily='', resourceModel='', resourceName='', resourceAddress=''):
+        self._call('CreateResource')
+        self._inventory.details[resourceName] = Info(
+            Name=resourceName, Address=resourceAddress, RootAddress=resourceAddress, FullAddress=resourceAddress,
+            DriverName=None, ResourceFamilyName=resourceFamily, ResourceModelName=resourceModel,
+            ResourceAttributes=[Info(Name='User', Value='', Type='String'),
+                                Info(Name='Password', Value='', Type='Password')],
+            ChildResources=[], Connections=[])
+        self._inventory.nodes[resourceName] = self._inventory.details[resourceName]
+
+    def AutoLoad(self, resourceFullPath=''):
+        self._call('AutoLoad')
+        details = self._inventory.details[resourceFullPath]
+        loaded = self._inventory.build_resource(details.Name, details.ResourceModelName, details.Address,
+                                                details.DriverName)
+        loaded.ResourceAttributes = details.ResourceAttributes
+        self._inventory.details[resourceFullPath] = loaded
+
+    def UpdatePhysicalConnection(self, resourceAFullPath='', resourceBFullPath='', overrideExistingConnections=True):
+        self._call('UpdatePhysicalConnection')
+        self._inventory.connect(resourceAFullPath, resourceBFullPath)
+
+    def UpdatePhysicalConnections(self, physicalConnectionUpdateRequest=[], overrideExistingConnections=True):
+        self._call('UpdatePhysicalConnections')
+        for request in physicalConnectionUpdateRequest:
+            self._inventory.connect(request.ResourceAFullName, request.ResourceBFullName)
+
+    def DecryptPassword(self, encryptedString=''):
+        self._call('DecryptPassword')
+        return Info(Value='decrypted')
+
+    def __getattr__(self, name):
+        if not name[:1].isupper():
+            raise AttributeError(name)
+
+        def api_method(*args, **kwargs):
+            self._call(name)
+
+        return api_method
@@ -0,0 +1,234 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from copy import deepcopy
+from itertools import count
+
+import click
+import yaml
+
+from benchmarks.fake_api import SyntheticInventory, FakeApi
+from cloudshell.migration.command_handlers.backup_handler import BackupHandler
+from cloudshell.migration.command_handlers.migration_handler import MigrationHandler
+from cloudshell.migration.command_handlers.restore_handler import RestoreHandler
+from cloudshell.migration.helpers.backup_codecs import YamlCodec, JsonLinesCodec, ManifestCodec
+from cloudshell.migration.helpers.backup_writer import BackupWriter
+from cloudshell.migration.operations.config_operations import ConfigOperations
+from cloudshell.migration.operations.resource_operations import ResourceOperations
+from cloudshell.migration.operations.route_connector_operations import RouteConnectorOperations
+
+VERSION_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'version.txt')
+RUN_COUNTER = count()
+
+
+class _LegacyEntity(object):
+    """
+    Dict-based replica of the entity, every string is a separate copy as it arrives from the API
+    """
+
+    def __init__(self, entity):
+        for name, value in entity.__getstate__().iteritems():
+            setattr(self, name, _legacy_value(value))
+
+
+def _legacy_value(value):
+    if isinstance(value, basestring):
+        return value[:1] + value[1:]
+    if isinstance(value, list):
+        return [_legacy_value(item) for item in value]
+    if isinstance(value, dict):
+        return {_legacy_value(key): _legacy_value(item) for key, item in value.iteritems()}
+    if hasattr(value, '__getstate__'):
+        return _LegacyEntity(value)
+    return value
+
+
+def _deep_size(value, seen):
+    """
+    Size of the object graph, shared objects are counted once
+    """
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, list):
+        size += sum(_deep_size(item, seen) for item in value)
+    elif isinstance(value, dict):
+        size += sum(_deep_size(key, seen) + _deep_size(item, seen) for key, item in value.iteritems())
+    elif hasattr(value, '__dict__'):
+        size += _deep_size(vars(value), seen)
+    elif hasattr(value, '__slots__'):
+        size += sum(_deep_size(getattr(value, name), seen) for name in value.__slots__)
+    return size
+
+
+class BenchmarkRun(object):
+    """
+    Migration planning and execution benchmarks for one synthetic inventory
+    """
+
+    def __init__(self, resources, latency, modules, ports, reservations, work_dir):
+        """
+        :param int resources: Number of resources in the inventory
+        :param float latency: Per-call API latency in seconds
+        :param int modules: Modules per resource
+        :param int ports: Ports per module
+        :param int reservations: Number of reservations
+        :param str work_dir: Folder for the backup files
+        """
+        self._resources = resources
+        # Resources names have to be unique across the runs
+        self._inventory = SyntheticInventory(resources, modules, ports, reservations,
+                                             name_tag='R{}'.format(next(RUN_COUNTER)))
+        self._api = FakeApi(self._inventory, latency)
+        self._work_dir = work_dir
+        self._logger = logging.getLogger('benchmarks')
+        self._config_operations = ConfigOperations(os.path.join(work_dir, 'benchmark_config.yml'))
+        self.results = []
+        self._opened_operations = []
+
+    def _measure(self, benchmark, func, *args):
+        calls_before = self._api.calls_count
+        start = time.time()
+        result = func(*args)
+        self.results.append({'benchmark': benchmark,
+                             'resources': self._resources,
+                             'seconds': round(time.time() - start, 6),
+                             'api_calls': self._api.calls_count - calls_before})
+        return result
+
+    def _measure_memory(self, resources):
+        """
+        Memory held by the loaded resources compared with the dict-based entities holding copies of the paths
+        """
+        entities_bytes = _deep_size(resources, set())
+        legacy_bytes = _deep_size(_legacy_value(resources), set())
+        self.results.append({'benchmark': 'entities_memory',
+                             'resources': self._resources,
+                             'bytes': entities_bytes,
+                             'legacy_bytes': legacy_bytes,
+                             'saved_bytes': legacy_bytes - entities_bytes})
+
+    def _measure_codecs(self, resources):
+        """
+        Backup write and read throughput of the codecs, pure Python YAML is the format of the previous versions.
+        Incremental backup is written twice, the second backup has no changed resources
+        """
+        store_path = os.path.join(self._work_dir, 'store_{}'.format(self._resources))
+        codecs = [('yaml-python', YamlCodec(yaml.Dumper, yaml.Loader)), ('yaml', YamlCodec()),
+                  ('jsonl', JsonLinesCodec()), ('manifest', ManifestCodec(store_path)),
+                  ('manifest-unchanged', ManifestCodec(store_path))]
+        for name, codec in codecs:
+            backup_file = os.path.join(self._work_dir, 'codec_{}_{}{}'.format(self._resources, name, codec.EXTENSION))
+            start = time.time()
+            with BackupWriter(backup_file, codec) as backup_writer:
+                for resource in resources:
+                    backup_writer.write(resource)
+            write_seconds = time.time() - start
+            start = time.time()
+            with open(backup_file) as backup_stream:
+                codec.read_header(backup_stream, backup_file)
+                loaded = len(list(codec.load(backup_stream)))
+            read_seconds = time.time() - start
+            self.results.append({'benchmark': 'backup_codec:{}'.format(name),
+                                 'resources': self._resources,
+                                 'bytes': os.path.getsize(backup_file),
+                                 'write_seconds': round(write_seconds, 6),
+                                 'read_seconds': round(read_seconds, 6),
+                                 'loaded': loaded})
+            if isinstance(codec, ManifestCodec):
+                self.results[-1]['records_written'] = codec.stored
+
+    def _operations(self):
+        resource_operations = ResourceOperations(self._api, self._logger, self._config_operations, dry_run=True)
+        route_connector_operations = RouteConnectorOperations(self._api, self._logger, self._config_operations,
+                                                              dry_run=True, path_trie=resource_operations.path_trie)
+        self._opened_operations.extend([resource_operations, route_connector_operations])
+        return resource_operations, route_connector_operations
+
+    def run(self):
+        try:
+            return self._run()
+        finally:
+            for operations in self._opened_operations:
+                operations.close()
+
+    def _run(self):
+        resource_operations, route_connector_operations = self._operations()
+        migration_handler = MigrationHandler(self._api, self._logger, self._config_operations, resource_operations,
+                                             route_connector_operations)
+        src_argument = '*/{}/{}'.format(SyntheticInventory.FAMILY, SyntheticInventory.MODEL)
+        dst_argument = '*/{}/{}'.format(SyntheticInventory.FAMILY, SyntheticInventory.NEW_MODEL)
+        resources_pairs = self._measure('define_resources_pairs', migration_handler.define_resources_pairs,
+                                        src_argument, dst_argument)
+        actions_container = self._measure('initialize_actions', migration_handler.initialize_actions,
+                                          resources_pairs, False)
+        sequence = self._measure('ActionsContainer.sequence', actions_container.sequence)
+        self.results[-1]['actions'] = len(sequence)
+
+        src_resources = [src for src, dst in resources_pairs]
+        backup_handler = BackupHandler(self._api, self._logger, self._config_operations,
+                                       os.path.join(self._work_dir, 'backup_{}.yaml'.format(self._resources)),
+                                       resource_operations, route_connector_operations)
+        # Backed up resources are released
+        self._measure('BackupHandler.backup_resources', backup_handler.backup_resources, deepcopy(src_resources))
+        self._measure_memory(src_resources)
+        self._measure_codecs(src_resources)
+
+        resource_operations, route_connector_operations = self._operations()
+        restore_handler = RestoreHandler(self._api, self._logger, self._config_operations, None,
+                                         resource_operations, route_connector_operations)
+        self._measure('RestoreHandler.define_actions', restore_handler.define_actions, deepcopy(src_resources),
+                      True, True, True, False)
+        return self.results
+
+
+def _read_version():
+    with open(VERSION_FILE) as version_file:
+        return version_file.read().strip()
+
+
+@click.command()
+@click.option(u'--sizes', default='100,1000,10000,50000', help="Comma-separated inventory sizes (resources).")
+@click.option(u'--latency', type=float, default=0.0, help="Per-call API latency in seconds.")
+@click.option(u'--modules', type=int, default=2, help="Modules per resource.")
+@click.option(u'--ports', type=int, default=4, help="Ports per module.")
+@click.option(u'--reservations', type=int, default=None, help="Number of reservations, a fifth of resources by "
+                                                               "default.")
+@click.option(u'--output', 'output_path', default=None, help="Write results to a JSON file.", metavar="FILE-PATH")
+def main(sizes, latency, modules, ports, reservations, output_path):
+    """
+    Time migration planning and execution against synthetic inventories.
+
+    Run from the repository root: python -m benchmarks.run_benchmarks --sizes 100,1000
+    """
+    logging.getLogger('benchmarks').addHandler(logging.NullHandler())
+    work_dir = tempfile.mkdtemp(prefix='migration_benchmarks_')
+    results = []
+    try:
+        for size in [int(size) for size in sizes.split(',')]:
+            results.extend(BenchmarkRun(size, latency, modules, ports, reservations, work_dir).run())
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = json.dumps({'version': _read_version(),
+                         'python': platform.python_version(),
+                         'latency': latency,
+                         'modules': modules,
+                         'ports': ports,
+                         'results': results}, indent=2, sort_keys=True)
+    if output_path:
+        with open(output_path, 'w') as output_file:
+            output_file.write(report)
+    click.echo(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,24 +2,61 @@
 # -*- coding: utf-8 -*-
 import os
 import sys
+from collections import defaultdict
 
 import click
 import pkg_resources
 
-from cloudshell.api.cloudshell_api import CloudShellAPISession
 from cloudshell.migration.command_handlers.backup_handler import BackupHandler
 from cloudshell.migration.command_handlers.configuration_handler import ConfigurationHandler
 from cloudshell.migration.command_handlers.migration_handler import MigrationHandler
 from cloudshell.migration.command_handlers.resources_handler import ResourcesHandler
 from cloudshell.migration.command_handlers.restore_handler import RestoreHandler
+from cloudshell.migration.helpers.api_cassette import RecordingApiSession, ReplayApiSession
+from cloudshell.migration.helpers.api_statistics import ApiStatistics, StatisticsApiSession
+from cloudshell.migration.helpers.backup_store import BackupStore
+from cloudshell.migration.helpers.backup_writer import find_manifests, prune_store
 from cloudshell.migration.helpers.log_helper import ExceptionLogger
+from cloudshell.migration.helpers.session_helper import PACKAGE_NAME, create_api_session, create_logger
+from cloudshell.migration.helpers.snapshot_cache import SnapshotCache, CachingApiSession
+from cloudshell.migration.operational_entities.actions import ActionsContainer
+from cloudshell.migration.operational_entities.actions_journal import ActionsJournal
+from cloudshell.migration.operational_entities.actions_sharding import ShardedActionsExecutor
 from cloudshell.migration.operations.config_operations import ConfigOperations
 
-from cloudshell.logging.qs_logger import get_qs_logger
 from cloudshell.migration.operations.route_connector_operations import RouteConnectorOperations
 from cloudshell.migration.operations.resource_operations import ResourceOperations
 
-PACKAGE_NAME = u'cloudshell-migration'
+LOGGER_META_KEY = 'migration_tool.logger'
+
+
+def api_options(cache=True):
+    """
+    CloudShell API session options shared by the commands, passed to _initialize_api
+    :param bool cache: Add the inventory snapshot cache options
+    """
+    options = [
+        click.option(u'--record', 'record_path', default=None, help="Record CloudShell API traffic to a cassette file.",
+                     metavar="CASSETTE-PATH"),
+        click.option(u'--replay', 'replay_path', default=None,
+                     help="Replay CloudShell API traffic from a cassette file instead of connecting to CloudShell.",
+                     metavar="CASSETTE-PATH"),
+        click.option(u'--replay-latency', is_flag=True, default=False,
+                     help="Inject the recorded API latencies on replay."),
+        click.option(u'--stats', is_flag=True, default=False, help="Show CloudShell API calls statistics."),
+    ]
+    if cache:
+        options = [click.option(u'--refresh', is_flag=True, default=False,
+                                help="Refresh the inventory snapshot cache."),
+                   click.option(u'--no-cache', is_flag=True, default=False,
+                                help="Do not use the inventory snapshot cache.")] + options
+
+    def decorator(command):
+        for option in reversed(options):
+            command = option(command)
+        return command
+
+    return decorator
 
 
 @click.group(invoke_without_command=True)
@@ -70,13 +107,18 @@ def config(key, value, config_path):
 @click.option(u'--config', 'config_path', default=None, help="Show resources based on a custom config file.",
               metavar="FILE-PATH")
 @click.option(u'--family', 'family', default=None, help="Show resources of a particular Family.")
-def show(config_path, family):
+@api_options()
+def show(config_path, family, refresh, no_cache, record_path, replay_path, replay_latency, stats):
     """
     Show L1 resources.
     """
     config_operations = ConfigOperations(config_path)
-    api = _initialize_api(config_operations)
-    resources_handler = ResourcesHandler(api)
+    if stats:
+        # Statistics are written to the log as well
+        _initialize_logger(config_operations)
+    api = _initialize_api(config_operations, refresh, no_cache, record_path, replay_path, replay_latency,
+                          stats)
+    resources_handler = ResourcesHandler(api, config_operations)
     click.echo(resources_handler.show_resources(family))
 
 
@@ -92,33 +134,58 @@ def show(config_path, family):
 @click.option(u'--no-backup', is_flag=True, default=False,
               help='Do not create a backup file before migration.(Do not use this option. '
                    'You are advised to create a backup file before performing any migration.)')
-@click.argument(u'src_resources', type=str, default=None, required=True)
-@click.argument(u'dst_resources', type=str, default=None, required=True)
-def migrate(config_path, dry_run, src_resources, dst_resources, yes, backup_file, no_backup, override):
+@click.argument(u'src_resources', type=str, default=None, required=False)
+@click.argument(u'dst_resources', type=str, default=None, required=False)
+@api_options(cache=False)
+@click.option(u'--stream', is_flag=True, default=False,
+              help="Migrate every resource pair as soon as it is loaded, instead of planning all pairs first.")
+@click.option(u'--resume', 'resume_path', default=None, help="Resume the interrupted migration from its journal file.",
+              metavar="JOURNAL-PATH")
+def migrate(config_path, dry_run, src_resources, dst_resources, yes, backup_file, no_backup, override, record_path,
+            replay_path, replay_latency, stats, stream, resume_path):
     """
     Migrate connections from source (SRC) resource(s) to destination (DST) resource(s),
     for example specifying the Family/Model, or a comma-separated list of the source resources to migrate.
     For additional info - see the tool's user guide at:
     https://github.com/QualiSystems/Cloudshell-L1-Migration/blob/master/README.md.
     """
+    if not resume_path and not (src_resources and dst_resources):
+        raise click.UsageError('SRC_RESOURCES and DST_RESOURCES are required, unless --resume is used')
     config_operations = ConfigOperations(config_path)
-    api = _initialize_api(config_operations)
+    api = _initialize_api(config_operations, record_path=record_path, replay_path=replay_path,
+                          replay_latency=replay_latency, stats=stats, modifies=True)
     logger = _initialize_logger(config_operations)
     resource_operations = ResourceOperations(api, logger, config_operations, dry_run)
-    logical_route_operations = RouteConnectorOperations(api, logger, dry_run)
+    logical_route_operations = RouteConnectorOperations(api, logger, config_operations, dry_run,
+                                                        resource_operations.path_trie)
+    _close_on_exit(resource_operations, logical_route_operations)
+    if resume_path:
+        _resume(resume_path, yes, config_operations, logger, resource_operations, logical_route_operations)
+        return
+
     migration_handler = MigrationHandler(api, logger, config_operations, resource_operations,
                                          logical_route_operations)
     with ExceptionLogger(logger):
-        resources_pairs = migration_handler.define_resources_pairs(src_resources, dst_resources)
-        actions_container = migration_handler.initialize_actions(resources_pairs, override)
+        resources_pairs = migration_handler.define_resources_pairs(src_resources, dst_resources, not stream)
+        if not stream:
+            actions_container = migration_handler.initialize_actions(resources_pairs, override)
     # print(resources_pairs)
 
     click.echo('Resources:')
     for pair in resources_pairs:
-        click.echo('{0}=>{1}'.format(*pair))
+        click.echo('{0}=>{1}'.format(*pair) + (' (will be created)' if stream and not pair[1].exist else ''))
 
-    click.echo('Next actions will be executed:')
-    click.echo(actions_container.to_string())
+    if stream:
+        with ExceptionLogger(logger):
+            actions_container, connected_ports = migration_handler.preview_actions(resources_pairs)
+        click.echo('DST resources will be created and every pair migrated as soon as it is loaded.')
+        click.echo('Connections of {} SRC ports will be migrated to the associated DST ports.'.format(
+            connected_ports))
+        click.echo('Next route and connector actions will be executed:')
+        click.echo(actions_container.to_string())
+    else:
+        click.echo('Next actions will be executed:')
+        click.echo(actions_container.to_string())
 
     if no_backup:
         click.echo('---- Backup will be skipped! ----')
@@ -130,18 +197,83 @@ def migrate(config_path, dry_run, src_resources, dst_resources, yes, backup_file
         click.echo('Aborted')
         sys.exit(1)
 
+    backup_handler = None
     if not no_backup and not dry_run:
         backup_handler = BackupHandler(api, logger, config_operations, backup_file, resource_operations,
                                        logical_route_operations)
+
+    with ExceptionLogger(logger):
+        journal = None if dry_run else _initialize_journal(config_operations)
+    # Cassette and statistics have to contain the traffic of all the sessions
+    actions_executor = _initialize_executor(config_operations, logger, dry_run, journal,
+                                            not stream and not record_path and not replay_path and not stats)
+    if stream:
+        with ExceptionLogger(logger):
+            _stream_migration(migration_handler, resources_pairs, override, backup_handler, actions_executor, journal)
+        return
+
+    if backup_handler:
         with ExceptionLogger(logger):
             backup_file = backup_handler.backup_resources([src for src, dst in resources_pairs])
             click.echo('Backup File: {}'.format(backup_file))
 
     with ExceptionLogger(logger):
+        if journal:
+            journal.planned(actions_container.sequence())
         click.echo("Executing actions:")
-        for action in actions_container.sequence():
-            result = action.execute()
+        for result in actions_executor.execute(actions_container):
+            click.echo(result)
+
+
+def _stream_migration(migration_handler, resources_pairs, override, backup_handler, actions_executor, journal=None):
+    """
+    Every loaded pair is backed up and its routes, connectors and connections are removed and updated right away,
+    routes and connectors are created when all pairs are migrated
+    :type migration_handler: cloudshell.migration.command_handlers.migration_handler.MigrationHandler
+    :type resources_pairs: list
+    :type override: bool
+    :type backup_handler: cloudshell.migration.command_handlers.backup_handler.BackupHandler
+    :type actions_executor: cloudshell.migration.operational_entities.actions_sharding.ShardedActionsExecutor
+    :type journal: cloudshell.migration.operational_entities.actions_journal.ActionsJournal
+    """
+    backup_writer = None
+    if backup_handler:
+        backup_writer = backup_handler.open_backup()
+        click.echo('Backup File: {}'.format(backup_writer.backup_file))
+    try:
+        _stream_pairs(migration_handler, resources_pairs, override, backup_handler, backup_writer, actions_executor,
+                      journal)
+    finally:
+        if backup_writer:
+            backup_writer.close()
+
+
+def _stream_pairs(migration_handler, resources_pairs, override, backup_handler, backup_writer, actions_executor,
+                  journal):
+    # Pairs sharing routes and connectors plan the same actions
+    handled_actions = defaultdict(set)
+    create_actions_container = ActionsContainer()
+    for pair, pair_actions_container in migration_handler.stream_actions(resources_pairs, override):
+        click.echo('Migrating {0}=>{1}:'.format(*pair))
+        if backup_writer:
+            # SRC resource is on the disk before its connections are changed
+            backup_handler.write_resources(backup_writer, [pair[0]])
+
+        if journal:
+            journal.planned(pair_actions_container.sequence())
+        actions = {}
+        for name in ['remove_routes', 'remove_connectors', 'update_connections']:
+            actions[name] = [action for action in getattr(pair_actions_container, name)
+                             if action not in handled_actions[name]]
+            handled_actions[name].update(actions[name])
+        for result in actions_executor.execute(ActionsContainer(**actions)):
             click.echo(result)
+        create_actions_container.update(ActionsContainer(create_routes=pair_actions_container.create_routes,
+                                                         create_connectors=pair_actions_container.create_connectors))
+
+    click.echo('Creating routes and connectors:')
+    for result in actions_executor.execute(create_actions_container):
+        click.echo(result)
 
 
 @cli.command()
@@ -153,7 +285,9 @@ def migrate(config_path, dry_run, src_resources, dst_resources, yes, backup_file
 @click.option(u'--connectors', 'connectors', default=True, help="Backup connectors.")
 @click.option(u'--yes', is_flag=True, default=False, help='Assume "yes" to all questions.')
 @click.argument(u'resources', type=str, default=None, required=False, metavar='RESOURCES')
-def backup(config_path, backup_file, resources, connections, routes, connectors, yes):
+@api_options()
+def backup(config_path, backup_file, resources, connections, routes, connectors, yes, refresh, no_cache, record_path,
+           replay_path, replay_latency, stats):
     """
     Backup connections and routes.
 
@@ -161,10 +295,13 @@ def backup(config_path, backup_file, resources, connections, routes, connectors,
     """
     config_operations = ConfigOperations(config_path)
 
-    api = _initialize_api(config_operations)
+    api = _initialize_api(config_operations, refresh, no_cache, record_path, replay_path, replay_latency,
+                          stats)
     logger = _initialize_logger(config_operations)
     resource_operations = ResourceOperations(api, logger, config_operations)
-    logical_route_operations = RouteConnectorOperations(api, logger)
+    logical_route_operations = RouteConnectorOperations(api, logger, config_operations,
+                                                        path_trie=resource_operations.path_trie)
+    _close_on_exit(resource_operations, logical_route_operations)
     backup_handler = BackupHandler(api, logger, config_operations, backup_file, resource_operations,
                                    logical_route_operations)
     with ExceptionLogger(logger):
@@ -183,11 +320,45 @@ def backup(config_path, backup_file, resources, connections, routes, connectors,
     click.echo('Backup done')
 
 
+@cli.command()
+@click.option(u'--config', 'config_path', default=None, help="Use a custom config file.", metavar="FILE-PATH")
+@click.option(u'--backup-file', 'backup_files', multiple=True,
+              help="Manifest moved or copied after it was written, can be repeated.",
+              metavar="BACKUP FILE-PATH")
+@click.option(u'--dry-run', is_flag=True, default=False, help="Show the number of the records to remove, nothing "
+                                                              "is removed.")
+@click.option(u'--yes', is_flag=True, default=False, help='Assume "yes" to all questions.')
+def prune(config_path, backup_files, dry_run, yes):
+    """
+    Remove the records of the incremental backups store not referenced by any manifest.
+    """
+    config_operations = ConfigOperations(config_path)
+    logger = _initialize_logger(config_operations)
+    backup_location = config_operations.read_key_or_default(config_operations.KEY.BACKUP_LOCATION)
+    backup_store = BackupStore(os.path.join(backup_location, BackupHandler.STORE_FOLDER))
+    manifest_files = find_manifests(backup_location) + list(backup_files)
+    with ExceptionLogger(logger):
+        read_manifests, unreferenced = prune_store(backup_store, manifest_files, True)
+
+    click.echo('Manifests: {}'.format(len(read_manifests)))
+    click.echo('Records to remove: {}'.format(len(unreferenced)))
+    if not unreferenced or dry_run:
+        return
+    if not yes and not click.confirm('Do you want to continue?'):
+        click.echo('Aborted')
+        sys.exit(1)
+
+    with ExceptionLogger(logger):
+        _, removed = prune_store(backup_store, manifest_files)
+        logger.info('Backup store {} records removed {}'.format(backup_store.store_path, len(removed)))
+    click.echo('Records removed: {}'.format(len(removed)))
+
+
 @cli.command()
 @click.option(u'--config', 'config_path', default=None, help="Use a custom config file.", metavar="FILE-PATH")
 @click.option(u'--dry-run', is_flag=True, default=False, help="Dry run creates resources but does not switch "
                                                               "physical connections or create and remove routes.")
-@click.option(u'--backup-file', default=None, required=True, help="Backup file path.")
+@click.option(u'--backup-file', default=None, help="Backup file path.")
 @click.option(u'--override', is_flag=True, default=False, help="Port connections on the source resource override any "
                                                                "existing portconnections on the destination resource.")
 @click.option(u'--yes', is_flag=True, default=False, help='Assume "yes" to all questions.')
@@ -195,7 +366,11 @@ def backup(config_path, backup_file, resources, connections, routes, connectors,
 @click.option(u'--routes', 'routes', default=True, help="Restore routes.")
 @click.option(u'--connectors', 'connectors', default=True, help="Restore connectors.")
 @click.argument(u'resources', type=str, default=None, required=False)
-def restore(config_path, backup_file, dry_run, resources, connections, routes, connectors, override, yes):
+@api_options(cache=False)
+@click.option(u'--resume', 'resume_path', default=None, help="Resume the interrupted restore from its journal file.",
+              metavar="JOURNAL-PATH")
+def restore(config_path, backup_file, dry_run, resources, connections, routes, connectors, override, yes, record_path,
+            replay_path, replay_latency, stats, resume_path):
     """
     Restore connections and routes.
 
@@ -207,11 +382,20 @@ def restore(config_path, backup_file, dry_run, resources, connections, routes, c
         You do not need to specify the full path from the root of the desired resource(s).
             However, the tool will create the new resource(s) in the root.
     """
+    if not resume_path and not backup_file:
+        raise click.UsageError('--backup-file is required, unless --resume is used')
     config_operations = ConfigOperations(config_path)
-    api = _initialize_api(config_operations)
+    api = _initialize_api(config_operations, record_path=record_path, replay_path=replay_path,
+                          replay_latency=replay_latency, stats=stats, modifies=True)
     logger = _initialize_logger(config_operations)
     resource_operations = ResourceOperations(api, logger, config_operations, dry_run)
-    logical_route_operations = RouteConnectorOperations(api, logger, dry_run)
+    logical_route_operations = RouteConnectorOperations(api, logger, config_operations, dry_run,
+                                                        resource_operations.path_trie)
+    _close_on_exit(resource_operations, logical_route_operations)
+    if resume_path:
+        _resume(resume_path, yes, config_operations, logger, resource_operations, logical_route_operations)
+        return
+
     restore_handler = RestoreHandler(api, logger, config_operations, backup_file, resource_operations,
                                      logical_route_operations)
     with ExceptionLogger(logger):
@@ -227,26 +411,154 @@ def restore(config_path, backup_file, dry_run, resources, connections, routes, c
         click.echo('Aborted')
         sys.exit(1)
     with ExceptionLogger(logger):
+        journal = None if dry_run else _initialize_journal(config_operations)
+        if journal:
+            journal.planned(actions_container.sequence())
         click.echo("Executing actions:")
-        for action in actions_container.sequence():
-            result = action.execute()
+        actions_executor = _initialize_executor(config_operations, logger, dry_run, journal,
+                                                not record_path and not replay_path and not stats)
+        for result in actions_executor.execute(actions_container):
             click.echo(result)
 
 
-def _initialize_api(config_operations):
+def _resume(journal_path, yes, config_operations, logger, resource_operations, logical_route_operations):
     """
+    Execute actions of the interrupted run which were not completed, the journal is continued
+    :param str journal_path: Journal of the interrupted run
+    :param bool yes: Do not ask for confirmation
     :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+    :type logger: cloudshell.migration.helpers.log_helper.Logger
+    :type resource_operations: cloudshell.migration.operations.resource_operations.ResourceOperations
+    :type logical_route_operations: cloudshell.migration.operations.route_connector_operations.RouteConnectorOperations
     """
-    try:
-        return CloudShellAPISession(config_operations.read_key_or_default(config_operations.KEY.HOST),
-                                    config_operations.read_key_or_default(config_operations.KEY.USERNAME),
-                                    config_operations.read_key_or_default(config_operations.KEY.PASSWORD),
-                                    config_operations.read_key_or_default(config_operations.KEY.DOMAIN),
-                                    port=config_operations.read_key_or_default(config_operations.KEY.PORT))
-    except IOError as e:
-        click.echo('ERROR: Cannot initialize Cloudshell API connection, check API settings, details: {}'.format(e),
-                   err=True)
+    with ExceptionLogger(logger):
+        actions_container = ActionsJournal.resume(journal_path, resource_operations, logical_route_operations, logger)
+
+    if actions_container.is_empty():
+        click.echo('Nothing to do')
+        sys.exit(0)
+    click.echo('Next actions will be executed:')
+    click.echo(actions_container.to_string())
+    if not yes and not click.confirm('Do you want to continue?'):
+        click.echo('Aborted')
         sys.exit(1)
+    with ExceptionLogger(logger):
+        journal = ActionsJournal(journal_path)
+        click.get_current_context().call_on_close(journal.close)
+        click.echo("Executing actions:")
+        # Resumed actions depend on the connections updated before the interruption, they stay in this process
+        actions_executor = _initialize_executor(config_operations, logger, journal=journal, sharding=False)
+        for result in actions_executor.execute(actions_container):
+            click.echo(result)
+
+
+def _initialize_executor(config_operations, logger, dry_run=False, journal=None, sharding=True):
+    """
+    :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+    :type logger: cloudshell.migration.helpers.log_helper.Logger
+    :param bool dry_run: Dry run
+    :type journal: cloudshell.migration.operational_entities.actions_journal.ActionsJournal
+    :param bool sharding: Execute independent components of the actions in the worker processes
+    :rtype: cloudshell.migration.operational_entities.actions_sharding.ShardedActionsExecutor
+    """
+    processes = config_operations.read_int_key_or_default(config_operations.KEY.EXECUTION_PROCESSES) \
+        if sharding else 1
+    return ShardedActionsExecutor(logger, config_operations, processes, config_operations.read_int_key_or_default(
+        config_operations.KEY.EXECUTION_WORKERS), dry_run, journal)
+
+
+def _initialize_journal(config_operations):
+    """
+    :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+    :rtype: cloudshell.migration.operational_entities.actions_journal.ActionsJournal
+    """
+    journal = ActionsJournal(ActionsJournal.new_journal_path(config_operations))
+    click.get_current_context().call_on_close(journal.close)
+    click.echo('Journal File: {}'.format(journal.journal_path))
+    return journal
+
+
+def _initialize_api(config_operations, refresh=False, no_cache=False, record_path=None, replay_path=None,
+                    replay_latency=False, stats=False, modifies=False):
+    """
+    :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+    :param bool refresh: Refresh the inventory snapshot cache
+    :param bool no_cache: Do not use the inventory snapshot cache
+    :param str record_path: Record API traffic to the cassette
+    :param str replay_path: Replay API traffic from the cassette
+    :param bool replay_latency: Inject recorded latencies on replay
+    :param bool stats: Report API calls statistics when the command finished
+    :param bool modifies: The command changes CloudShell data, the snapshot cache is not used and the stored
+        snapshot is dropped
+    """
+    if replay_path:
+        try:
+            api = ReplayApiSession(replay_path, replay_latency)
+        except IOError as e:
+            click.echo('ERROR: Cannot read cassette file, details: {}'.format(e), err=True)
+            sys.exit(1)
+    else:
+        try:
+            api = create_api_session(config_operations)
+        except IOError as e:
+            click.echo('ERROR: Cannot initialize Cloudshell API connection, check API settings, details: {}'.format(e),
+                       err=True)
+            sys.exit(1)
+
+    if record_path:
+        api = RecordingApiSession(api, record_path)
+        click.get_current_context().call_on_close(api.close)
+
+    if stats:
+        api_statistics = ApiStatistics()
+        api = StatisticsApiSession(api, api_statistics)
+        click.get_current_context().call_on_close(lambda: _report_api_statistics(api_statistics))
+
+    if replay_path:
+        return api
+    snapshot_cache = _initialize_snapshot_cache(config_operations, refresh)
+    if modifies:
+        # Commands planning changes read the current state, the following commands must not see the old snapshot
+        snapshot_cache.delete()
+        click.get_current_context().call_on_close(snapshot_cache.delete)
+    elif not no_cache and not record_path:
+        # The cassette has to contain all the traffic, snapshot cache is not used
+        click.get_current_context().call_on_close(snapshot_cache.save)
+        api = CachingApiSession(api, snapshot_cache)
+    return api
+
+
+def _close_on_exit(*operations):
+    """
+    Operations are closed when the command ends
+    """
+    context = click.get_current_context()
+    for operation in operations:
+        context.call_on_close(operation.close)
+
+
+def _initialize_snapshot_cache(config_operations, refresh=False):
+    """
+    :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+    :param bool refresh: Ignore the stored snapshot
+    :rtype: cloudshell.migration.helpers.snapshot_cache.SnapshotCache
+    """
+    return SnapshotCache(config_operations.read_key_or_default(config_operations.KEY.CACHE_LOCATION),
+                         config_operations.read_key_or_default(config_operations.KEY.HOST),
+                         config_operations.read_key_or_default(config_operations.KEY.DOMAIN),
+                         config_operations.read_key_or_default(config_operations.KEY.USERNAME),
+                         config_operations.read_int_key_or_default(config_operations.KEY.CACHE_TTL), refresh)
+
+
+def _report_api_statistics(api_statistics):
+    """
+    :type api_statistics: cloudshell.migration.helpers.api_statistics.ApiStatistics
+    """
+    click.echo('API calls statistics:')
+    click.echo(api_statistics.to_string())
+    logger = click.get_current_context().meta.get(LOGGER_META_KEY)
+    if logger:
+        logger.info('API calls statistics:{}{}'.format(os.linesep, api_statistics.to_string()))
 
 
 def _initialize_logger(config_operations):
@@ -254,8 +566,7 @@ def _initialize_logger(config_operations):
     :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
     """
 
-    os.environ['LOG_PATH'] = config_operations.read_key_or_default(config_operations.KEY.LOG_PATH)
-    logger = get_qs_logger(str(PACKAGE_NAME), 'migration_tool', 'migration_tool')
-    logger.setLevel(config_operations.read_key_or_default(config_operations.KEY.LOG_LEVEL))
+    logger = create_logger(config_operations)
     click.echo('Log file: {}'.format(logger.handlers[0].baseFilename))
+    click.get_current_context().meta[LOGGER_META_KEY] = logger
     return logger
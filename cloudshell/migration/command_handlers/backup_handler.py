@@ -1,9 +1,10 @@
 import os
 from datetime import datetime
 
-import yaml
-
 from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.backup_codecs import get_codec, ManifestCodec
+from cloudshell.migration.helpers.backup_compression import compression_by_extension, EXTENSIONS
+from cloudshell.migration.helpers.backup_writer import BackupWriter
 from cloudshell.migration.operations.argument_operations import ArgumentOperations
 
 
@@ -11,6 +12,10 @@ class BackupHandler(object):
     SEPARATOR = ','
     RESOURCES_KEY = 'RESOURCES'
     LOGICAL_ROUTES_KEY = 'LOGICAL_ROUTES'
+    # Resources details requested at once
+    CHUNK_SIZE = 100
+    # Records of the incremental backups in the backup location
+    STORE_FOLDER = 'Store'
 
     def __init__(self, api, logger, config_operations, backup_file, resource_operations, logical_route_operations):
         """
@@ -24,24 +29,38 @@ class BackupHandler(object):
         self._api = api
         self._logger = logger
         self._config_operations = config_operations
+        self._codec = self._initialize_codec()
+        # Extension of the specified backup file takes precedence over the configured compression
+        self._compression = (backup_file and compression_by_extension(backup_file)) or \
+                            config_operations.read_key_or_default(config_operations.KEY.BACKUP_COMPRESSION)
         self._backup_file = backup_file or self._backup_file_path()
 
         self._resource_operations = resource_operations
         self._logical_route_operations = logical_route_operations
 
-    def _backup_file_path(self):
+    def _backup_location(self):
         backup_path = self._config_operations.read_key_or_default(self._config_operations.KEY.BACKUP_LOCATION)
         if not backup_path:
             raise MigrationToolException('Backup location was not specified')
-        filename = datetime.now().strftime('%Y-%m-%d_%H-%M-%S') + '.yaml'
+        return backup_path
+
+    def _initialize_codec(self):
+        codec_name = self._config_operations.read_key_or_default(self._config_operations.KEY.BACKUP_FORMAT)
+        if codec_name == ManifestCodec.NAME:
+            return ManifestCodec(os.path.join(self._backup_location(), self.STORE_FOLDER))
+        return get_codec(codec_name)
+
+    def _backup_file_path(self):
+        backup_path = self._backup_location()
+        filename = datetime.now().strftime('%Y-%m-%d_%H-%M-%S') + self._codec.EXTENSION + EXTENSIONS.get(
+            self._compression, '')
         return os.path.join(backup_path, filename)
 
-    def _write_to_file(self, data):
-        dir_path = os.path.dirname(self._backup_file)
-        if not os.path.exists(dir_path):
-            os.makedirs(dir_path)
-        with open(self._backup_file, 'w') as backup_file:
-            backup_file.write(data)
+    def open_backup(self):
+        """
+        :rtype: BackupWriter
+        """
+        return BackupWriter(self._backup_file, self._codec, self._compression)
 
     def initialize_resources(self, resources_arguments):
         """
@@ -56,29 +75,38 @@ class BackupHandler(object):
 
     def backup_resources(self, resources, connections=True, routes=True, connectors=True):
         self._logger.info('Doing backup ...')
+        with self.open_backup() as backup_writer:
+            self.write_resources(backup_writer, resources, connections, routes, connectors)
+        if isinstance(self._codec, ManifestCodec):
+            self._logger.info('Backup records written {}, unchanged {}'.format(self._codec.stored,
+                                                                               self._codec.reused))
+        self._logger.info('Backup file {}'.format(self._backup_file))
+        return self._backup_file
+
+    def write_resources(self, backup_writer, resources, connections=True, routes=True, connectors=True):
+        """
+        Every resource is written as soon as its details are loaded and released after it, resources are on the
+        disk when it returns
+        :type backup_writer: BackupWriter
+        :type resources: list
+        """
         if not connections and not routes and not connectors:
             connections = routes = connectors = True
 
-        # logical_routes = set()
-        for resource in resources:
-            self._resource_operations.update_details(resource)
-            if not resource.attributes:
-                self._resource_operations.load_resource_attributes(resource)
-            if connections and not resource.ports:
-                self._resource_operations.load_resource_ports(resource)
-                # self._resource_operations.load_resource_attributes(resource)
-            if routes and not resource.associated_logical_routes:
-                self._logical_route_operations.load_logical_routes(resource)
-                # logical_routes.update(resource.associated_logical_routes)
-            if connectors and not resource.associated_connectors:
-                self._logical_route_operations.load_connectors(resource)
-
-        # backup_dict = {self.RESOURCES_KEY: resources,
-        #                self.LOGICAL_ROUTES_KEY: list(logical_routes)}
-
-        # self._resource_operations.define_port_connections(*resources)
-
-        data = yaml.dump(resources, default_flow_style=False, allow_unicode=True, encoding=None)
-        self._write_to_file(data)
-        self._logger.info('Backup file {}'.format(self._backup_file))
-        return self._backup_file
+        for index in xrange(0, len(resources), self.CHUNK_SIZE):
+            chunk = resources[index:index + self.CHUNK_SIZE]
+            self._resource_operations.load_resources_details(chunk)
+            for resource in chunk:
+                self._resource_operations.update_details(resource)
+                if not resource.attributes:
+                    self._resource_operations.load_resource_attributes(resource)
+                if connections and not resource.ports:
+                    self._resource_operations.load_resource_ports(resource)
+                if routes and not resource.associated_logical_routes:
+                    self._logical_route_operations.load_logical_routes(resource)
+                if connectors and not resource.associated_connectors:
+                    self._logical_route_operations.load_connectors(resource)
+                backup_writer.write(resource)
+                # Memory stays flat, only the resources of the chunk are loaded at once
+                self._resource_operations.release_resource(resource)
+        backup_writer.flush()
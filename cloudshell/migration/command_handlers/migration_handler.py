@@ -1,6 +1,8 @@
+import os
 from copy import copy
 
 from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.concurrency_helper import concurrent_map_unordered
 from cloudshell.migration.helpers.port_associator import PortAssociator
 from cloudshell.migration.operational_entities.actions import ActionsContainer, RemoveRouteAction, CreateRouteAction, \
     UpdateConnectionAction, CreateConnectorAction, RemoveConnectorAction
@@ -23,17 +25,23 @@ class MigrationHandler(object):
         self._resource_operations = resource_operations
         self._route_connector_operations = logical_route_operations
         self._updated_connections = {}
+        self._port_associator = PortAssociator(config_operations, logger, resource_operations.path_trie)
 
-    def define_resources_pairs(self, src_resources_arguments, dst_resources_arguments):
+    def define_resources_pairs(self, src_resources_arguments, dst_resources_arguments, synchronize=True):
+        """
+        :param bool synchronize: Create and synchronize DST resources, otherwise only DST names are defined
+        """
         argument_parser = ArgumentOperations(self._logger, self._resource_operations)
         src_resources = argument_parser.initialize_existing_resources(src_resources_arguments)
         dst_resources = argument_parser.initialize_resources_with_stubs(dst_resources_arguments)
-        return self._initialize_resources_pairs(src_resources, dst_resources)
+        self._resource_operations.load_resources_details(src_resources)
+        return self._initialize_resources_pairs(src_resources, dst_resources, synchronize)
 
-    def _initialize_resources_pairs(self, src_resources, dst_resources):
+    def _initialize_resources_pairs(self, src_resources, dst_resources, synchronize=True):
         """
         :type src_resources: list
         :type dst_resources: list
+        :type synchronize: bool
         """
 
         if len(src_resources) < len(dst_resources):
@@ -49,17 +57,25 @@ class MigrationHandler(object):
                 dst_resources.append(dst)
             pair = src, dst
             resources_pairs.append(pair)
-        return map(self._validate_resources_pair, map(self._synchronize_resources_pair, resources_pairs))
+        # Pairs are validated before DST resources are created
+        self._validate_resources_pairs(map(self._define_dst_name, resources_pairs))
+        if not synchronize:
+            return resources_pairs
+        return map(self._synchronize_resources_pair, resources_pairs)
 
-    def _synchronize_resources_pair(self, resources_pair):
+    def _define_dst_name(self, resources_pair):
         src, dst = resources_pair
+        if not dst.exist and not dst.name:
+            dst.name = self._config_operations.read_key_or_default(
+                self._config_operations.KEY.NEW_RESOURCE_NAME_PREFIX) + src.name
+        return resources_pair
+
+    def _synchronize_resources_pair(self, resources_pair):
+        src, dst = self._define_dst_name(resources_pair)
 
         # Create DST if not exist
         if not dst.exist:
             self._resource_operations.update_details(src)
-            if not dst.name:
-                dst.name = self._config_operations.read_key_or_default(
-                    self._config_operations.KEY.NEW_RESOURCE_NAME_PREFIX) + src.name
             dst.address = src.address
             self._resource_operations.create_resource(dst)
 
@@ -77,26 +93,36 @@ class MigrationHandler(object):
 
         return resources_pair
 
-    def _validate_resources_pair(self, resources_pair, handled_resources=[]):
-        src, dst = resources_pair
-
-        if src.name == dst.name:
-            raise MigrationToolException('SRC and DST resources cannot have the same name {}'.format(src.name))
-        if not src.exist:
-            raise MigrationToolException('SRC resource {} does not exist'.format(src.name))
-
-        if not dst.exist:
-            if dst.name in [resource.name for resource in
-                            self._resource_operations.sorted_by_family_model_resources.get((dst.family, dst.model),
-                                                                                           [])]:
-                raise MigrationToolException('Resource with name {} already exist'.format(dst.name))
-        for resource in resources_pair:
-            if resource.name in handled_resources:
-                raise MigrationToolException(
-                    'Resource with name {} already used in another migration pair'.format(resource.name))
-            else:
-                handled_resources.append(resource.name)
-        return resources_pair
+    def _validate_resources_pairs(self, resources_pairs):
+        """
+        All pairs are validated in one pass, every conflict is reported
+        :param list resources_pairs: Pairs with the DST names defined
+        """
+        resources_by_family_model = self._resource_operations.sorted_by_family_model_resources
+        errors = []
+        existing_names = {}
+        handled_resources = set()
+        for src, dst in resources_pairs:
+            if src.name == dst.name:
+                errors.append('SRC and DST resources cannot have the same name {}'.format(src.name))
+            if not src.exist:
+                errors.append('SRC resource {} does not exist'.format(src.name))
+
+            if not dst.exist:
+                family_model = dst.family, dst.model
+                names = existing_names.get(family_model)
+                if names is None:
+                    names = existing_names[family_model] = {resource.name for resource in
+                                                            resources_by_family_model.get(family_model, [])}
+                if dst.name in names:
+                    errors.append('Resource with name {} already exist'.format(dst.name))
+            for resource in (src, dst):
+                if resource.name in handled_resources:
+                    errors.append('Resource with name {} already used in another migration pair'.format(resource.name))
+                else:
+                    handled_resources.add(resource.name)
+        if errors:
+            raise MigrationToolException(os.linesep.join(errors))
 
     def _load_resources(self, resource_pair):
         """
@@ -119,17 +145,66 @@ class MigrationHandler(object):
         for resource in resource_pair:
             if not resource.ports:
                 self._resource_operations.load_resource_ports(resource)
+        return resource_pair
+
+    def _load_routes_connectors(self, resource_pair):
+        src, dst = resource_pair
         self._route_connector_operations.load_logical_routes(src)
         self._route_connector_operations.load_connectors(src)
 
     def initialize_actions(self, resources_pairs, override):
+        """
+        Pairs are loaded concurrently, actions of the pair are planned as soon as it loaded
+        """
+        workers = self._config_operations.read_int_key_or_default(self._config_operations.KEY.AUTOLOAD_WORKERS)
+        pairs_containers = [None] * len(resources_pairs)
+        for (index, pair), _ in concurrent_map_unordered(lambda item: self._load_resources(item[1]),
+                                                         enumerate(resources_pairs), workers):
+            pairs_containers[index] = self._initialize_pair_actions(pair, override)
+
         actions_container = ActionsContainer()
-        for pair in resources_pairs:
-            self._load_resources(pair)
-            actions_container.update(self._initialize_logical_route_actions(pair))
-            actions_container.update(self._initialize_connection_actions(pair, override))
-            actions_container.update(self._initialize_connector_actions(pair, override))
+        for pair_container in pairs_containers:
+            actions_container.update(pair_container)
+        return actions_container
+
+    def stream_actions(self, resources_pairs, override):
+        """
+        DST resources are created, synchronized and loaded concurrently, actions of the pair are yielded as soon as
+        it loaded
+        :param list resources_pairs: Pairs defined without synchronization
+        :return: Tuples of the pair and its actions container
+        :rtype: collections.Iterable
+        """
+        workers = self._config_operations.read_int_key_or_default(self._config_operations.KEY.AUTOLOAD_WORKERS)
+        for pair, _ in concurrent_map_unordered(lambda pair: self._load_resources(
+                self._synchronize_resources_pair(pair)), resources_pairs, workers):
+            yield pair, self._initialize_pair_actions(pair, override)
 
+    def preview_actions(self, resources_pairs):
+        """
+        Route and connector actions planned from the SRC resources, DST resources are not created
+        :param list resources_pairs: Pairs defined without synchronization
+        :return: Actions container and the number of the SRC ports which connections are migrated
+        :rtype: tuple
+        """
+        actions_container = ActionsContainer()
+        connected_ports = 0
+        for resource_pair in resources_pairs:
+            src = resource_pair[0]
+            if not src.ports:
+                self._resource_operations.load_resource_ports(src)
+            self._load_routes_connectors(resource_pair)
+            actions_container.update(self._initialize_logical_route_actions(resource_pair))
+            actions_container.update(self._initialize_connector_actions(resource_pair, False))
+            connected_ports += len([port for port in src.ports if port.connected_to])
+        return actions_container, connected_ports
+
+    def _initialize_pair_actions(self, resource_pair, override):
+        self._load_routes_connectors(resource_pair)
+        actions_container = ActionsContainer()
+        actions_container.update(self._initialize_logical_route_actions(resource_pair))
+        actions_container.update(self._initialize_connection_actions(resource_pair, override))
+        actions_container.update(self._initialize_connector_actions(resource_pair, override))
         return actions_container
 
     def _initialize_logical_route_actions(self, resource_pair):
@@ -148,11 +223,9 @@ class MigrationHandler(object):
 
     def _initialize_connection_actions(self, resource_pair, override):
         src_resource, dst_resource = resource_pair
-        port_associator = PortAssociator(src_resource, dst_resource, self._config_operations, self._logger)
-
         connection_actions = []
 
-        for src_port, dst_port in port_associator.associated_pairs():
+        for src_port, dst_port in self._port_associator.associated_pairs(src_resource, dst_resource):
             if override or not dst_port.connected_to:
                 connection_actions.append(
                     UpdateConnectionAction(src_port, dst_port, self._resource_operations,
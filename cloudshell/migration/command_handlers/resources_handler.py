@@ -1,11 +1,17 @@
 from cloudshell.migration.entities import Resource
+from cloudshell.migration.helpers.async_api import AsyncApiClient
 from cloudshell.migration.operational_entities.config_unit import ConfigUnit
 
 
 class ResourcesHandler(object):
 
-    def __init__(self, api):
+    def __init__(self, api, config_operations):
+        """
+        :type api: cloudshell.api.cloudshell_api.CloudShellAPISession
+        :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+        """
         self._api = api
+        self._config_operations = config_operations
         self.__installed_resources = None
 
     def show_resources(self, family):
@@ -13,16 +19,19 @@ class ResourcesHandler(object):
         return ConfigUnit.FORMAT + '\n' + resources_output
 
     def _get_installed_resources(self, family=None):
+        resources_info = [resource for resource in self._api.GetResourceList().Resources if
+                          not family or resource.ResourceFamilyName == family]
+        async_api = AsyncApiClient(self._api, self._config_operations.read_int_key_or_default(
+            self._config_operations.KEY.API_WORKERS))
+        try:
+            details = AsyncApiClient.gather([async_api.GetResourceDetails(resource.Name)
+                                             for resource in resources_info], lambda index, e: None)
+        finally:
+            async_api.close()
+
         resources_list = []
-        for resource in self._api.GetResourceList().Resources:
-            resource_family = resource.ResourceFamilyName
-            if family and resource_family != family:
-                continue
-            address = resource.Address
-            name = resource.Name
-            model = resource.ResourceModelName
-            details = self._api.GetResourceDetails(name)
-            driver = details.DriverName
-            # driver = None
-            resources_list.append(Resource(name, address, resource_family, model, driver, True))
+        for resource, resource_details in zip(resources_info, details):
+            driver = resource_details.DriverName if resource_details else None
+            resources_list.append(Resource(resource.Name, resource.Address, resource.ResourceFamilyName,
+                                           resource.ResourceModelName, driver, True))
         return resources_list
@@ -1,10 +1,9 @@
 from copy import copy
 
-import yaml
-
 from cloudshell.migration.exceptions import MigrationToolException
-from cloudshell.migration.operational_entities.actions import ActionsContainer, CreateRouteAction, RemoveRouteAction, \
-    UpdateConnectionAction, CreateConnectorAction
+from cloudshell.migration.helpers.backup_writer import load_backup, load_backup_resources
+from cloudshell.migration.operational_entities.actions import ActionsContainer, ActionsSet, CreateRouteAction, \
+    RemoveRouteAction, UpdateConnectionAction, CreateConnectorAction
 from cloudshell.migration.operations.argument_operations import ArgumentOperations
 
 
@@ -30,9 +29,7 @@ class RestoreHandler(object):
         self._updated_connections = {}
 
     def _load_backup(self):
-        with open(self._backup_file, 'r') as backup_file:
-            data = yaml.load(backup_file)
-            return data
+        return load_backup(self._backup_file)
 
     def initialize_resources(self, resources_arguments):
         """
@@ -42,15 +39,17 @@ class RestoreHandler(object):
         requested_resources = ArgumentOperations(self._logger,
                                                  self._resource_operations).initialize_existing_resources(
             resources_arguments)
-        backup_resources = self._load_backup()
+        if not requested_resources:
+            return self._load_backup()
+
+        backup_resources = load_backup_resources(self._backup_file, [resource.name for resource in
+                                                                     requested_resources])
         requested_backup_resources = []
-        if requested_resources:
-            for resource in requested_resources:
-                if resource not in backup_resources:
-                    raise MigrationToolException('Requested resource {} is not in the backup file'.format(resource))
-                requested_backup_resources.append(backup_resources[backup_resources.index(resource)])
-        else:
-            requested_backup_resources = backup_resources
+        for resource in requested_resources:
+            backup_resource = backup_resources.get(resource.name)
+            if not backup_resource:
+                raise MigrationToolException('Requested resource {} is not in the backup file'.format(resource))
+            requested_backup_resources.append(backup_resource)
         return requested_backup_resources
 
     def define_actions(self, requested_backup_resources, connections, routes, connectors, override):
@@ -98,11 +97,11 @@ class RestoreHandler(object):
         :type backup_resource: cloudshell.migration.entities.Resource
         :type override: bool
         """
-        create_route_actions = set()
-        remove_route_actions = set()
+        create_route_actions = ActionsSet()
+        remove_route_actions = ActionsSet()
         for route in backup_resource.associated_logical_routes:
-            src_related_route = self._route_connector_operations.logical_routes_by_segment.get(route.source)
-            dst_related_route = self._route_connector_operations.logical_routes_by_segment.get(route.target)
+            src_related_route = self._route_connector_operations.route_index.by_segment(route.source)
+            dst_related_route = self._route_connector_operations.route_index.by_segment(route.target)
             if not src_related_route and not dst_related_route:
                 create_route_actions.add(
                     CreateRouteAction(route, self._route_connector_operations, self._updated_connections, self._logger))
@@ -140,7 +139,7 @@ class RestoreHandler(object):
                 update_connection_actions.append(
                     UpdateConnectionAction(backup_port, cs_port, self._resource_operations, self._updated_connections,
                                            self._logger))
-                logical_route = self._route_connector_operations.logical_routes_by_segment.get(cs_port.name)
+                logical_route = self._route_connector_operations.route_index.by_segment(cs_port.name)
                 if logical_route:
                     remove_route_actions.append(
                         RemoveRouteAction(logical_route[0], self._route_connector_operations, self._logger))
@@ -1,15 +1,51 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
-
-
-class Resource(object):
+from copy import copy
+
+
+def intern_path(path):
+    """
+    Equal paths share one string, port name, peer connection and logical routes endpoints refer to the same object
+    :param str path: Full path or name
+    :rtype: str
+    """
+    if type(path) is str:
+        return intern(path)
+    return path
+
+
+class _Entity(object):
+    """
+    Compact entity, the state is a dictionary of the slots so backups keep the format of the dict-based entities
+    """
+    __slots__ = ()
+    # Attributes interned when set from the state
+    _INTERNED = ()
+    # Values of the attributes missing in the state
+    _DEFAULTS = {}
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name in self.__slots__:
+            value = state[name] if name in state else copy(self._DEFAULTS.get(name))
+            setattr(self, name, intern_path(value) if name in self._INTERNED else value)
+
+
+class Resource(_Entity):
+    __slots__ = ('name', 'address', 'family', 'model', 'driver', 'ports', 'associated_logical_routes',
+                 'associated_connectors', 'attributes', 'exist')
+    _INTERNED = ('name', 'family', 'model', 'driver')
+    _DEFAULTS = {'ports': [], 'associated_logical_routes': [], 'associated_connectors': [], 'attributes': {},
+                 'exist': False}
 
     def __init__(self, name, address=None, family=None, model=None, driver=None, exist=False):
-        self.name = name
+        self.name = intern_path(name)
         self.address = address
-        self.family = family
-        self.model = model
-        self.driver = driver
+        self.family = intern_path(family)
+        self.model = intern_path(model)
+        self.driver = intern_path(driver)
         self.ports = []
         self.associated_logical_routes = []
         self.associated_connectors = []
@@ -33,11 +69,14 @@ class Resource(object):
         return Resource(self.name, self.address, self.family, self.model, self.driver, self.exist)
 
 
-class Port(object):
+class Port(_Entity):
+    __slots__ = ('name', 'address', 'connected_to', 'connection_weight')
+    _INTERNED = ('name', 'connected_to')
+
     def __init__(self, name, address=None, connected_to=None, connection_weight=None):
-        self.name = name
+        self.name = intern_path(name)
         self.address = address
-        self.connected_to = connected_to
+        self.connected_to = intern_path(connected_to)
         self.connection_weight = connection_weight
 
     def to_string(self):
@@ -60,12 +99,16 @@ class Port(object):
         return self.name < other.name
 
 
-class LogicalRoute(object):
+class LogicalRoute(_Entity):
+    __slots__ = ('source', 'target', 'reservation_id', 'route_type', 'route_alias', 'active', 'shared')
+    _INTERNED = ('source', 'target', 'reservation_id', 'route_type')
+    _DEFAULTS = {'active': True, 'shared': False}
+
     def __init__(self, source, target, reservation_id, route_type, route_alias, active=True, shared=False):
-        self.source = source
-        self.target = target
-        self.reservation_id = reservation_id
-        self.route_type = route_type
+        self.source = intern_path(source)
+        self.target = intern_path(target)
+        self.reservation_id = intern_path(reservation_id)
+        self.route_type = intern_path(route_type)
         self.route_alias = route_alias
         self.active = active
         self.shared = shared
@@ -87,13 +130,17 @@ class LogicalRoute(object):
         return hash(self.source + self.target)
 
 
-class Connector(object):
+class Connector(_Entity):
+    __slots__ = ('source', 'target', 'reservation_id', 'direction', 'connector_type', 'alias', 'active', 'shared')
+    _INTERNED = ('source', 'target', 'reservation_id', 'direction', 'connector_type')
+    _DEFAULTS = {'active': True, 'shared': False}
+
     def __init__(self, source, target, reservation_id, direction, connector_type, alias, active=True, shared=False):
-        self.source = source
-        self.target = target
-        self.reservation_id = reservation_id
-        self.direction = direction
-        self.connector_type = connector_type
+        self.source = intern_path(source)
+        self.target = intern_path(target)
+        self.reservation_id = intern_path(reservation_id)
+        self.direction = intern_path(direction)
+        self.connector_type = intern_path(connector_type)
         self.alias = alias
         self.active = active
         self.shared = shared
@@ -112,4 +159,3 @@ class Connector(object):
 
     def __hash__(self):
         return hash(self.source + self.target)
-
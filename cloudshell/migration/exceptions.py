@@ -4,4 +4,19 @@
 
 class MigrationToolException(Exception):
     def __init__(self, message):
+        # Arguments are kept, the exception is passed from the worker processes
+        super(MigrationToolException, self).__init__(message)
         self.message = message
+
+
+class ReplayedApiError(MigrationToolException):
+    """
+    Recorded API error which type cannot be restored
+    """
+
+    def __init__(self, message, error_type=None):
+        super(ReplayedApiError, self).__init__(message)
+        self.error_type = error_type
+
+    def __str__(self):
+        return '{}: {}'.format(self.error_type, self.message) if self.error_type else self.message
@@ -0,0 +1,158 @@
+import cPickle as pickle
+import importlib
+import os
+import time
+from collections import defaultdict, deque
+from threading import Lock
+
+from cloudshell.migration.exceptions import MigrationToolException, ReplayedApiError
+from cloudshell.migration.helpers.api_proxy import ApiSessionProxy
+
+# Error attributes kept in the cassette
+_PLAIN_TYPES = (basestring, int, long, float, bool, type(None))
+
+
+def _freeze(value):
+    """
+    Hashable representation of API method argument
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_freeze, value))
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if hasattr(value, '__dict__'):
+        return value.__class__.__name__, _freeze(vars(value))
+    return value
+
+
+def _call_key(method_name, args, kwargs):
+    return method_name, _freeze(args), _freeze(kwargs)
+
+
+def _error_record(error):
+    """
+    Type, arguments and plain attributes of the API error
+    :type error: Exception
+    :rtype: dict
+    """
+    return {'type': '{}.{}'.format(error.__class__.__module__, error.__class__.__name__),
+            'args': tuple(arg for arg in error.args if isinstance(arg, _PLAIN_TYPES)),
+            'state': {name: value for name, value in vars(error).iteritems() if isinstance(value, _PLAIN_TYPES)}}
+
+
+def _build_error(message, error_record):
+    """
+    API error of the recorded type, ReplayedApiError if the type cannot be restored
+    :param str message: Error message
+    :param dict error_record: Error record, None for the cassettes recorded without it
+    :rtype: Exception
+    """
+    if not error_record:
+        return ReplayedApiError(message)
+    module_name, _, class_name = error_record['type'].rpartition('.')
+    try:
+        error_class = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError, ValueError):
+        error_class = None
+    if not isinstance(error_class, type) or not issubclass(error_class, Exception):
+        return ReplayedApiError(message, error_record['type'])
+    # The constructor is not called, the error arguments are not known
+    error = error_class.__new__(error_class)
+    error.args = error_record['args']
+    error.__dict__.update(error_record['state'])
+    return error
+
+
+class RecordingApiSession(ApiSessionProxy):
+    """
+    Records every API call with its response and latency to the cassette file
+    """
+
+    def __init__(self, api, cassette_path):
+        """
+        :type api: cloudshell.api.cloudshell_api.CloudShellAPISession
+        :type cassette_path: str
+        """
+        super(RecordingApiSession, self).__init__(api)
+        dir_path = os.path.dirname(os.path.abspath(cassette_path))
+        if not os.path.exists(dir_path):
+            os.makedirs(dir_path)
+        self._cassette_file = open(cassette_path, 'wb')
+        self._lock = Lock()
+
+    def _call(self, method_name, method, args, kwargs):
+        start = time.time()
+        try:
+            result = method(*args, **kwargs)
+        except Exception as e:
+            self._record(method_name, args, kwargs, None, e, time.time() - start)
+            raise
+        self._record(method_name, args, kwargs, result, None, time.time() - start)
+        return result
+
+    def _record(self, method_name, args, kwargs, result, error, latency):
+        record = {'key': _call_key(method_name, args, kwargs), 'result': result, 'error': error and str(error),
+                  'error_record': error and _error_record(error), 'latency': latency}
+        with self._lock:
+            pickle.dump(record, self._cassette_file, pickle.HIGHEST_PROTOCOL)
+            self._cassette_file.flush()
+
+    def close(self):
+        with self._lock:
+            self._cassette_file.close()
+
+
+class ReplayApiSession(object):
+    """
+    Serves API calls from the recorded cassette without CloudShell connection
+    """
+
+    def __init__(self, cassette_path, inject_latency=False):
+        """
+        :param str cassette_path: Recorded cassette
+        :param bool inject_latency: Delay every response for the recorded latency
+        """
+        self._inject_latency = inject_latency
+        self._records = self._load(cassette_path)
+        self._last_records = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _load(cassette_path):
+        records = defaultdict(deque)
+        with open(cassette_path, 'rb') as cassette_file:
+            while True:
+                try:
+                    record = pickle.load(cassette_file)
+                except EOFError:
+                    break
+                records[record['key']].append(record)
+        return records
+
+    def __getattr__(self, name):
+        if not name[:1].isupper():
+            raise AttributeError(name)
+
+        def api_method(*args, **kwargs):
+            return self._replay(_call_key(name, args, kwargs))
+
+        return api_method
+
+    def _replay(self, key):
+        """
+        Recorded calls with the same arguments are replayed in the recorded order, the last one is repeated
+        """
+        with self._lock:
+            recorded = self._records.get(key)
+            if recorded:
+                record = recorded.popleft()
+                self._last_records[key] = record
+            else:
+                record = self._last_records.get(key)
+        if not record:
+            raise MigrationToolException('Cassette has no recorded response for {}{}'.format(key[0], key[1]))
+        if self._inject_latency:
+            time.sleep(record['latency'])
+        if record['error']:
+            raise _build_error(record['error'], record.get('error_record'))
+        return record['result']
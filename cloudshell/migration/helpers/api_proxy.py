@@ -0,0 +1,29 @@
+class ApiSessionProxy(object):
+    """
+    Wraps CloudShellAPISession, every API method call is passed through _call
+    """
+
+    def __init__(self, api):
+        """
+        :type api: cloudshell.api.cloudshell_api.CloudShellAPISession
+        """
+        self._api = api
+
+    def __getattr__(self, name):
+        attribute = getattr(self._api, name)
+        if not callable(attribute) or not name[:1].isupper():
+            return attribute
+
+        def api_method(*args, **kwargs):
+            return self._call(name, attribute, args, kwargs)
+
+        return api_method
+
+    def _call(self, method_name, method, args, kwargs):
+        """
+        :type method_name: str
+        :type method: function
+        :type args: tuple
+        :type kwargs: dict
+        """
+        return method(*args, **kwargs)
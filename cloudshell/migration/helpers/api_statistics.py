@@ -0,0 +1,81 @@
+import math
+import os
+import time
+from collections import defaultdict
+from threading import Lock
+
+from cloudshell.migration.helpers.api_proxy import ApiSessionProxy
+
+
+class ApiStatistics(object):
+    """
+    Calls count and latencies of the API methods
+    """
+    PERCENTILES = [50, 95, 99]
+    NEW_LINE = os.linesep
+
+    def __init__(self):
+        self._latencies = defaultdict(list)
+        self._lock = Lock()
+
+    def add(self, method_name, latency):
+        """
+        :param str method_name: API method
+        :param float latency: Call latency in seconds
+        """
+        with self._lock:
+            self._latencies[method_name].append(latency)
+
+    @staticmethod
+    def _percentile(sorted_latencies, percent):
+        index = int(math.ceil(percent / 100.0 * len(sorted_latencies))) - 1
+        return sorted_latencies[max(index, 0)]
+
+    def summary(self):
+        """
+        Statistics per API method ordered by total time
+        :rtype: list
+        """
+        with self._lock:
+            latencies = {method_name: sorted(values) for method_name, values in self._latencies.iteritems()}
+        summary = []
+        for method_name, values in latencies.iteritems():
+            method_summary = {'method': method_name, 'calls': len(values), 'total': sum(values)}
+            for percent in self.PERCENTILES:
+                method_summary['p{}'.format(percent)] = self._percentile(values, percent)
+            summary.append(method_summary)
+        return sorted(summary, key=lambda x: x['total'], reverse=True)
+
+    def to_string(self):
+        header = ['API method', 'Calls', 'Total, s'] + ['p{}, ms'.format(percent) for percent in self.PERCENTILES]
+        row_format = '{:<36}{:>8}{:>12}' + '{:>10}' * len(self.PERCENTILES)
+        lines = [row_format.format(*header)]
+        for method_summary in self.summary():
+            lines.append(row_format.format(
+                method_summary['method'], method_summary['calls'], '{:.3f}'.format(method_summary['total']),
+                *['{:.1f}'.format(method_summary['p{}'.format(percent)] * 1000) for percent in self.PERCENTILES]))
+        return self.NEW_LINE.join(lines)
+
+    def __str__(self):
+        return self.to_string()
+
+
+class StatisticsApiSession(ApiSessionProxy):
+    """
+    Measures every API call
+    """
+
+    def __init__(self, api, api_statistics):
+        """
+        :type api: cloudshell.api.cloudshell_api.CloudShellAPISession
+        :type api_statistics: ApiStatistics
+        """
+        super(StatisticsApiSession, self).__init__(api)
+        self._api_statistics = api_statistics
+
+    def _call(self, method_name, method, args, kwargs):
+        start = time.time()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._api_statistics.add(method_name, time.time() - start)
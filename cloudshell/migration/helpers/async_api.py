@@ -0,0 +1,105 @@
+import sys
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+
+
+class CompletedResult(object):
+    """
+    Result of the call executed in place, has AsyncResult interface
+    """
+
+    def __init__(self, value=None, exc_info=None):
+        self._value = value
+        self._exc_info = exc_info
+
+    def ready(self):
+        return True
+
+    def successful(self):
+        return self._exc_info is None
+
+    def wait(self, timeout=None):
+        pass
+
+    def get(self, timeout=None):
+        if self._exc_info:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+        return self._value
+
+
+class AsyncApiClient(object):
+    """
+    Non-blocking API client, every API method call is issued on the client's worker threads and returns AsyncResult,
+    many requests are in flight while the caller continues. Results must not be waited inside the pool threads.
+    The worker threads are started with the first call and stopped by close
+    """
+
+    def __init__(self, api, workers):
+        """
+        :type api: cloudshell.api.cloudshell_api.CloudShellAPISession
+        :param int workers: Max number of concurrent requests, 1 executes the calls in place
+        """
+        self._api = api
+        self._workers = workers
+        self._pool = None
+        self._pool_lock = Lock()
+
+    def _get_pool(self):
+        """
+        :rtype: ThreadPool
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPool(self._workers)
+            return self._pool
+
+    def close(self):
+        """
+        Stop the worker threads, pending calls are completed first
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def call(self, method_name, *args, **kwargs):
+        """
+        :param str method_name: API method
+        :rtype: multiprocessing.pool.AsyncResult
+        """
+        method = getattr(self._api, method_name)
+        if self._workers <= 1:
+            try:
+                return CompletedResult(method(*args, **kwargs))
+            except Exception:
+                return CompletedResult(exc_info=sys.exc_info())
+        return self._get_pool().apply_async(method, args, kwargs)
+
+    def __getattr__(self, name):
+        if not name[:1].isupper():
+            raise AttributeError(name)
+
+        def api_method(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        return api_method
+
+    @staticmethod
+    def gather(async_results, error_handler=None):
+        """
+        Wait for the results, they are returned in the same order
+        :param list async_results: Results of the calls
+        :param function error_handler: Called with index and exception if the call failed, its result returned
+            instead. Exception is re-raised if not specified
+        :rtype: list
+        """
+        results = []
+        for index, async_result in enumerate(async_results):
+            try:
+                results.append(async_result.get())
+            except Exception as e:
+                if not error_handler:
+                    raise
+                results.append(error_handler(index, e))
+        return results
@@ -0,0 +1,283 @@
+import json
+import os
+from collections import namedtuple
+
+import yaml
+
+from cloudshell.migration.entities import Resource, Port, LogicalRoute, Connector
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.backup_store import BackupStore
+
+# Resource attribute restored from JSON Lines backup, has the interface of the API resource attribute
+BackupAttribute = namedtuple('BackupAttribute', ['Name', 'Value', 'Type'])
+
+# Fields of the entities records, nested entities of the resource are records of their schemas
+SCHEMAS = {
+    Resource: ('name', 'address', 'family', 'model', 'driver', 'exist'),
+    Port: ('name', 'address', 'connected_to', 'connection_weight'),
+    LogicalRoute: ('source', 'target', 'reservation_id', 'route_type', 'route_alias', 'active', 'shared'),
+    Connector: ('source', 'target', 'reservation_id', 'direction', 'connector_type', 'alias', 'active', 'shared'),
+}
+
+
+def entity_record(entity):
+    """
+    :param entity: Port, LogicalRoute or Connector
+    :rtype: dict
+    """
+    return {name: getattr(entity, name) for name in SCHEMAS[entity.__class__]}
+
+
+def build_entity(entity_class, record):
+    """
+    Entity of the record, fields missing in the record get their default values
+    :param type entity_class: Port, LogicalRoute or Connector
+    :param dict record: Entity record
+    """
+    entity = entity_class.__new__(entity_class)
+    entity.__setstate__({name: _native(record[name]) for name in SCHEMAS[entity_class] if name in record})
+    return entity
+
+
+def _native(value):
+    # JSON strings are unicode, ASCII values are kept as str like the YAML loader does
+    if type(value) is unicode:
+        try:
+            return value.encode('ascii')
+        except UnicodeEncodeError:
+            pass
+    return value
+
+
+class YamlCodec(object):
+    """
+    Every resource is a YAML document with Python object tags, libyaml emitter and loader are used if available
+    """
+    NAME = 'yaml'
+    EXTENSION = '.yaml'
+
+    def __init__(self, dumper=getattr(yaml, 'CDumper', yaml.Dumper), loader=getattr(yaml, 'CLoader', yaml.Loader)):
+        self._dumper = dumper
+        self._loader = loader
+
+    def write_header(self, stream, backup_file):
+        pass
+
+    def read_header(self, stream, backup_file):
+        pass
+
+    def close(self):
+        pass
+
+    def dump(self, resource, stream):
+        """
+        :type resource: Resource
+        :type stream: file
+        """
+        yaml.dump(resource, stream, Dumper=self._dumper, explicit_start=True, default_flow_style=False,
+                  allow_unicode=True)
+
+    def load(self, stream):
+        """
+        Documents following the header, single-document backups of the previous versions contain the list of the
+        resources
+        :type stream: file
+        :rtype: collections.Iterable
+        """
+        for document in yaml.load_all(stream, Loader=self._loader):
+            if isinstance(document, list):
+                for resource in document:
+                    yield resource
+            elif document is not None:
+                yield document
+
+    def load_document(self, data):
+        """
+        :param str data: Resource document
+        :rtype: Resource
+        """
+        return yaml.load(data, Loader=self._loader)
+
+
+class JsonLinesCodec(object):
+    """
+    Header line followed by a JSON line for every resource, entities are records of their schemas
+    """
+    NAME = 'jsonl'
+    EXTENSION = '.jsonl'
+    FORMAT = 'cloudshell-migration-backup'
+    VERSION = 1
+
+    def write_header(self, stream, backup_file):
+        stream.write(json.dumps({'format': self.FORMAT, 'version': self.VERSION}) + '\n')
+
+    def close(self):
+        pass
+
+    def read_header(self, stream, backup_file):
+        """
+        :return: Header of the backup
+        :rtype: dict
+        """
+        header = json.loads(stream.readline())
+        if header.get('format') != self.FORMAT or header.get('version') > self.VERSION:
+            raise MigrationToolException('Unsupported backup format {}'.format(header))
+        return header
+
+    def dump(self, resource, stream):
+        """
+        :type resource: Resource
+        :type stream: file
+        """
+        stream.write(json.dumps(self.resource_record(resource), sort_keys=True) + '\n')
+
+    def load(self, stream):
+        """
+        Lines following the header
+        :type stream: file
+        :rtype: collections.Iterable
+        """
+        for line in stream:
+            if line.strip():
+                yield self.load_document(line)
+
+    def load_document(self, data):
+        """
+        :param str data: Resource line
+        :rtype: Resource
+        """
+        return self.build_resource(json.loads(data))
+
+    @staticmethod
+    def resource_record(resource):
+        """
+        :type resource: Resource
+        :rtype: dict
+        """
+        record = entity_record(resource)
+        record['ports'] = map(entity_record, resource.ports)
+        record['associated_logical_routes'] = map(entity_record, resource.associated_logical_routes)
+        record['associated_connectors'] = map(entity_record, resource.associated_connectors)
+        record['attributes'] = {name: attribute and [attribute.Name, attribute.Value, attribute.Type] for
+                                name, attribute in resource.attributes.iteritems()}
+        return record
+
+    @staticmethod
+    def build_resource(record):
+        """
+        :param dict record: Resource record
+        :rtype: Resource
+        """
+        resource = build_entity(Resource, record)
+        resource.ports = [build_entity(Port, port) for port in record.get('ports', [])]
+        resource.associated_logical_routes = [build_entity(LogicalRoute, route) for route in
+                                              record.get('associated_logical_routes', [])]
+        resource.associated_connectors = [build_entity(Connector, connector) for connector in
+                                          record.get('associated_connectors', [])]
+        resource.attributes = {_native(name): attribute and BackupAttribute(*map(_native, attribute)) for
+                               name, attribute in record.get('attributes', {}).iteritems()}
+        return resource
+
+
+class ManifestCodec(JsonLinesCodec):
+    """
+    Incremental backup, the manifest refers to the resources records in the backup store, only the records of the
+    changed resources are written
+    """
+    NAME = 'manifest'
+    EXTENSION = '.manifest'
+    FORMAT = 'cloudshell-migration-manifest'
+
+    def __init__(self, store_path=None):
+        """
+        :param str store_path: Store of the written backup, the store of the read backup is defined by its header
+        """
+        self._store = BackupStore(store_path) if store_path else None
+        self.stored = 0
+        self.reused = 0
+
+    def write_header(self, stream, backup_file):
+        store_path = os.path.abspath(self._store.store_path)
+        try:
+            store_path = os.path.relpath(store_path, os.path.dirname(os.path.abspath(backup_file)))
+        except ValueError:
+            # Different drives
+            pass
+        self._store.begin(backup_file)
+        stream.write(json.dumps({'format': self.FORMAT, 'version': self.VERSION, 'store': store_path}) + '\n')
+
+    def read_header(self, stream, backup_file):
+        header = super(ManifestCodec, self).read_header(stream, backup_file)
+        self._store = BackupStore(os.path.join(os.path.dirname(os.path.abspath(backup_file)), header['store']))
+        return header
+
+    def close(self):
+        """
+        Written manifest is closed, its records are referenced by the manifest from now on
+        """
+        if self._store:
+            self._store.end()
+
+    def dump(self, resource, stream):
+        """
+        :type resource: Resource
+        :type stream: file
+        """
+        digest, stored = self._store.put(self.resource_record(resource))
+        if stored:
+            self.stored += 1
+        else:
+            self.reused += 1
+        stream.write(json.dumps({'name': resource.name, 'digest': digest}) + '\n')
+
+    @property
+    def store_path(self):
+        return self._store.store_path
+
+    def read_digests(self, stream):
+        """
+        Digests of the records referenced by the manifest lines following the header, the records are not read
+        :type stream: file
+        :rtype: collections.Iterable
+        """
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)['digest']
+
+    def load_document(self, data):
+        """
+        :param str data: Manifest line
+        :rtype: Resource
+        """
+        return self.build_resource(self._store.get(json.loads(data)['digest']))
+
+
+CODECS = {codec.NAME: codec for codec in [YamlCodec, JsonLinesCodec, ManifestCodec]}
+
+
+def get_codec(name):
+    """
+    :param str name: Codec name
+    """
+    codec_class = CODECS.get(name)
+    if not codec_class:
+        raise MigrationToolException('Unknown backup format {}, supported formats: {}'.format(
+            name, ', '.join(sorted(CODECS))))
+    return codec_class()
+
+
+def detect_codec(stream):
+    """
+    Codec of the backup by its first line, the stream position is kept
+    :type stream: file
+    """
+    position = stream.tell()
+    first_line = stream.readline()
+    stream.seek(position)
+    if not first_line.lstrip().startswith('{'):
+        return YamlCodec()
+    header_format = json.loads(first_line).get('format')
+    for codec_class in [JsonLinesCodec, ManifestCodec]:
+        if codec_class.FORMAT == header_format:
+            return codec_class()
+    raise MigrationToolException('Unsupported backup format {}'.format(header_format))
@@ -0,0 +1,64 @@
+import gzip
+import os
+
+from cloudshell.migration.exceptions import MigrationToolException
+
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+NONE = 'none'
+GZIP = 'gzip'
+XZ = 'xz'
+EXTENSIONS = {GZIP: '.gz', XZ: '.xz'}
+_MAGIC_NUMBERS = {GZIP: '\x1f\x8b', XZ: '\xfd7zXZ\x00'}
+
+
+def compression_by_extension(backup_file):
+    """
+    :param str backup_file: Backup file path
+    :return: Compression of the file extension, None if not compressed
+    :rtype: str
+    """
+    extension = os.path.splitext(backup_file)[1].lower()
+    for compression, compression_extension in EXTENSIONS.iteritems():
+        if extension == compression_extension:
+            return compression
+
+
+def _compression_by_content(backup_file):
+    with open(backup_file, 'rb') as backup_stream:
+        header = backup_stream.read(max(map(len, _MAGIC_NUMBERS.itervalues())))
+    for compression, magic_number in _MAGIC_NUMBERS.iteritems():
+        if header.startswith(magic_number):
+            return compression
+
+
+def _lzma():
+    if lzma is None:
+        raise MigrationToolException('xz compression requires lzma module, install backports.lzma')
+    return lzma
+
+
+def open_backup_file(backup_file, mode='r', compression=None):
+    """
+    Backup file is compressed and decompressed on the fly, compression of the read file is detected by its content
+    :param str backup_file: Backup file path
+    :param str mode: 'r' or 'w'
+    :param str compression: gzip, xz or none for the written file
+    :rtype: file
+    """
+    if mode.startswith('r'):
+        compression = _compression_by_content(backup_file)
+    if not compression or compression == NONE:
+        return open(backup_file, mode)
+    if compression == GZIP:
+        return gzip.open(backup_file, mode + 'b')
+    if compression == XZ:
+        return _lzma().LZMAFile(backup_file, mode + 'b')
+    raise MigrationToolException('Unknown backup compression {}, supported compressions: {}'.format(
+        compression, ', '.join([NONE] + sorted(EXTENSIONS))))
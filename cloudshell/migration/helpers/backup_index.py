@@ -0,0 +1,62 @@
+import json
+import os
+
+
+class BackupIndex(object):
+    """
+    Sidecar index of the backup file, offset and length of every resource document in the uncompressed content
+    """
+    EXTENSION = '.index'
+    VERSION = 1
+
+    def __init__(self, codec_name, records=None, backup_size=None):
+        """
+        :param str codec_name: Codec of the backup
+        :param dict records: Resource name to (offset, length)
+        :param int backup_size: Size of the backup file the index was written for
+        """
+        self.codec_name = codec_name
+        self.records = records if records is not None else {}
+        self.backup_size = backup_size
+
+    @classmethod
+    def index_path(cls, backup_file):
+        return backup_file + cls.EXTENSION
+
+    def add(self, resource_name, offset, length):
+        self.records[resource_name] = (offset, length)
+
+    def save(self, backup_file):
+        """
+        Written when the backup is complete, the index of an interrupted backup does not exist
+        :param str backup_file: Backup file path
+        """
+        self.backup_size = os.path.getsize(backup_file)
+        index_path = self.index_path(backup_file)
+        temp_path = index_path + '.tmp'
+        with open(temp_path, 'w') as index_file:
+            json.dump({'version': self.VERSION, 'codec': self.codec_name, 'backup_size': self.backup_size,
+                       'resources': self.records}, index_file)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        os.rename(temp_path, index_path)
+
+    @classmethod
+    def load(cls, backup_file):
+        """
+        :param str backup_file: Backup file path
+        :return: Index of the backup, None if it does not exist or does not match the backup
+        :rtype: BackupIndex
+        """
+        index_path = cls.index_path(backup_file)
+        if not os.path.isfile(index_path):
+            return None
+        try:
+            with open(index_path) as index_file:
+                data = json.load(index_file)
+        except ValueError:
+            return None
+        if data.get('version') != cls.VERSION or data.get('backup_size') != os.path.getsize(backup_file):
+            return None
+        return cls(data['codec'], {name.encode('utf-8'): tuple(record) for name, record in
+                                   data['resources'].iteritems()}, data['backup_size'])
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+from cloudshell.migration.exceptions import MigrationToolException
+
+
+class BackupStore(object):
+    """
+    Content-addressed store of the resources records, a record is written once and shared by all the backups
+    containing the same resource state. Records are never removed by the backups, records not referenced by any
+    manifest are removed by prune. Every written manifest is registered in the store, digests stored by a backup in
+    progress are kept in its pending file until the manifest is closed. Writes and prune take the store lock
+    """
+    EXTENSION = '.json'
+    LOCK_FILE = '.lock'
+    MANIFESTS_FILE = 'manifests'
+    PENDING_FOLDER = 'pending'
+    PENDING_EXTENSION = '.pending'
+
+    def __init__(self, store_path):
+        """
+        :param str store_path: Store folder
+        """
+        self.store_path = store_path
+        self._thread_lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+        self._pending_file = None
+
+    def _record_path(self, digest):
+        return os.path.join(self.store_path, digest[:2], digest + self.EXTENSION)
+
+    @staticmethod
+    def _make_dirs(dir_path):
+        if not os.path.exists(dir_path):
+            try:
+                os.makedirs(dir_path)
+            except OSError:
+                # Created by another process meanwhile
+                if not os.path.isdir(dir_path):
+                    raise
+
+    @contextmanager
+    def lock(self):
+        """
+        Exclusive lock of the store shared by the processes, the lock is reentrant in the thread and released by
+        the system if the process is terminated
+        """
+        with self._thread_lock:
+            if not self._lock_depth:
+                self._make_dirs(self.store_path)
+                lock_file = open(os.path.join(self.store_path, self.LOCK_FILE), 'a')
+                try:
+                    _lock_file(lock_file)
+                except Exception:
+                    lock_file.close()
+                    raise
+                self._lock_file = lock_file
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if not self._lock_depth:
+                    lock_file, self._lock_file = self._lock_file, None
+                    try:
+                        _unlock_file(lock_file)
+                    finally:
+                        lock_file.close()
+
+    def begin(self, manifest_file):
+        """
+        Registers the manifest and opens its pending file, digests stored until end is called are kept by prune
+        :param str manifest_file: Manifest being written
+        """
+        manifest_file = os.path.abspath(manifest_file)
+        with self.lock():
+            self.end()
+            with open(os.path.join(self.store_path, self.MANIFESTS_FILE), 'a') as manifests_file:
+                manifests_file.write(manifest_file + '\n')
+            pending_path = os.path.join(self.store_path, self.PENDING_FOLDER, uuid.uuid4().hex + self.PENDING_EXTENSION)
+            self._make_dirs(os.path.dirname(pending_path))
+            self._pending_file = open(pending_path, 'w')
+            self._pending_file.write(manifest_file + '\n')
+            self._pending_file.flush()
+
+    def end(self):
+        """
+        Removes the pending file of the manifest, the manifest has to be closed
+        """
+        with self.lock():
+            if self._pending_file:
+                pending_file, self._pending_file = self._pending_file, None
+                pending_file.close()
+                os.remove(pending_file.name)
+
+    def manifests(self):
+        """
+        :return: Registered manifests, removed manifests included
+        :rtype: list
+        """
+        try:
+            with open(os.path.join(self.store_path, self.MANIFESTS_FILE)) as manifests_file:
+                manifest_files = [line.rstrip('\n') for line in manifests_file if line.strip()]
+        except IOError:
+            return []
+        return sorted(set(manifest_files))
+
+    def pending(self):
+        """
+        Digests stored by the backups in progress, pending files of the interrupted backups are kept
+        :return: Digests by the manifest
+        :rtype: dict
+        """
+        pending_path = os.path.join(self.store_path, self.PENDING_FOLDER)
+        if not os.path.isdir(pending_path):
+            return {}
+        pending = {}
+        for file_name in os.listdir(pending_path):
+            if not file_name.endswith(self.PENDING_EXTENSION):
+                continue
+            with open(os.path.join(pending_path, file_name)) as pending_file:
+                lines = [line.rstrip('\n') for line in pending_file if line.strip()]
+            if lines:
+                pending.setdefault(lines[0], set()).update(lines[1:])
+        return pending
+
+    def put(self, record):
+        """
+        :param dict record: Resource record
+        :return: Digest of the record and True if the record was written, False if it is already stored
+        :rtype: tuple
+        """
+        data = json.dumps(record, sort_keys=True)
+        digest = hashlib.sha1(data).hexdigest()
+        record_path = self._record_path(digest)
+        with self.lock():
+            if self._pending_file:
+                self._pending_file.write(digest + '\n')
+                self._pending_file.flush()
+            if os.path.exists(record_path):
+                return digest, False
+            self._make_dirs(os.path.dirname(record_path))
+            temp_path = '{}.{}.tmp'.format(record_path, os.getpid())
+            with open(temp_path, 'w') as record_file:
+                record_file.write(data)
+            os.rename(temp_path, record_path)
+        return digest, True
+
+    def get(self, digest):
+        """
+        :param str digest: Digest of the record
+        :rtype: dict
+        """
+        try:
+            with open(self._record_path(digest)) as record_file:
+                return json.load(record_file)
+        except IOError:
+            raise MigrationToolException('Record {} is missing in the backup store {}'.format(digest,
+                                                                                             self.store_path))
+
+    def digests(self):
+        """
+        :return: Digests of the stored records, records being written are skipped
+        :rtype: collections.Iterable
+        """
+        if not os.path.isdir(self.store_path):
+            return
+        for dir_name in sorted(os.listdir(self.store_path)):
+            dir_path = os.path.join(self.store_path, dir_name)
+            if not os.path.isdir(dir_path):
+                continue
+            for file_name in sorted(os.listdir(dir_path)):
+                if file_name.endswith(self.EXTENSION):
+                    yield file_name[:-len(self.EXTENSION)]
+
+    def prune(self, referenced_digests, dry_run=False):
+        """
+        Records referenced by the backups in progress are kept, removed manifests are unregistered
+        :param set referenced_digests: Digests of the records referenced by the manifests
+        :param bool dry_run: Records are not removed
+        :return: Digests of the removed records
+        :rtype: list
+        """
+        with self.lock():
+            referenced_digests = set(referenced_digests)
+            for digests in self.pending().itervalues():
+                referenced_digests.update(digests)
+            removed = [digest for digest in self.digests() if digest not in referenced_digests]
+            if not dry_run:
+                for digest in removed:
+                    os.remove(self._record_path(digest))
+                manifests_path = os.path.join(self.store_path, self.MANIFESTS_FILE)
+                with open(manifests_path + '.tmp', 'w') as manifests_file:
+                    for manifest_file in self.manifests():
+                        if os.path.exists(manifest_file):
+                            manifests_file.write(manifest_file + '\n')
+                if os.path.exists(manifests_path):
+                    os.remove(manifests_path)
+                os.rename(manifests_path + '.tmp', manifests_path)
+        return removed
+
+
+def _lock_file(lock_file):
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        return
+    lock_file.seek(0)
+    while True:
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except IOError:
+            # Gave up after 10 seconds, the store is locked by a long prune
+            pass
+
+
+def _unlock_file(lock_file):
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
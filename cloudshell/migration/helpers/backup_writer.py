@@ -0,0 +1,183 @@
+import mmap
+import os
+
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.backup_codecs import YamlCodec, ManifestCodec, detect_codec, get_codec
+from cloudshell.migration.helpers.backup_compression import EXTENSIONS, open_backup_file, compression_by_extension
+from cloudshell.migration.helpers.backup_index import BackupIndex
+
+
+class BackupWriter(object):
+    """
+    Writes every resource to the backup file as a separate document, the file is flushed every FLUSH_INTERVAL
+    documents, written resources are not kept. Offsets of the documents are saved to the sidecar index when the
+    writer is closed
+    """
+    FLUSH_INTERVAL = 50
+
+    def __init__(self, backup_file, codec=None, compression=None, flush_interval=FLUSH_INTERVAL):
+        """
+        :param str backup_file: Backup file path, existing file is overwritten
+        :param codec: Backup codec, YAML by default
+        :param str compression: gzip, xz or none, defined by the file extension by default
+        :param int flush_interval: Number of documents written between the flushes
+        """
+        self.backup_file = backup_file
+        self._codec = codec or YamlCodec()
+        self._flush_interval = flush_interval
+        dir_path = os.path.dirname(os.path.abspath(backup_file))
+        if not os.path.exists(dir_path):
+            os.makedirs(dir_path)
+        self._file = open_backup_file(backup_file, 'w', compression or compression_by_extension(backup_file))
+        self._codec.write_header(self._file, backup_file)
+        self._index = BackupIndex(self._codec.NAME)
+        self._not_flushed = 0
+        self.written = 0
+
+    def write(self, resource):
+        """
+        :type resource: cloudshell.migration.entities.Resource
+        """
+        offset = self._file.tell()
+        self._codec.dump(resource, self._file)
+        self._index.add(resource.name, offset, self._file.tell() - offset)
+        self.written += 1
+        self._not_flushed += 1
+        if self._not_flushed >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Written documents are synced to the disk
+        """
+        if self._not_flushed:
+            self._file.flush()
+            try:
+                os.fsync(self._file.fileno())
+            except (AttributeError, IOError):
+                # Compressed file without the underlying file descriptor
+                pass
+            self._not_flushed = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+            self._index.save(self.backup_file)
+            self._codec.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+def load_backup(backup_file):
+    """
+    Resources of the backup, the format and the compression are detected by the content, compressed backup is
+    decompressed as it is read
+    :param str backup_file: Backup file path
+    :rtype: list
+    """
+    with open_backup_file(backup_file) as backup_stream:
+        codec = detect_codec(backup_stream)
+        codec.read_header(backup_stream, backup_file)
+        return list(codec.load(backup_stream))
+
+
+def load_backup_resources(backup_file, resources_names):
+    """
+    Requested resources of the backup, only their documents are read if the backup has the index, the whole backup
+    is read otherwise
+    :param str backup_file: Backup file path
+    :param list resources_names: Names of the requested resources
+    :return: Resource name to resource, requested resources missing in the backup are not included
+    :rtype: dict
+    """
+    backup_index = BackupIndex.load(backup_file)
+    if not backup_index:
+        requested_names = set(resources_names)
+        return {resource.name: resource for resource in load_backup(backup_file) if resource.name in requested_names}
+
+    codec = get_codec(backup_index.codec_name)
+    records = [(name, backup_index.records[name]) for name in resources_names if name in backup_index.records]
+    resources = {}
+    with open_backup_file(backup_file) as backup_stream:
+        codec.read_header(backup_stream, backup_file)
+        if isinstance(backup_stream, file):
+            # Not compressed, documents are sliced from the memory-mapped file
+            if not records:
+                return resources
+            backup_map = mmap.mmap(backup_stream.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for name, (offset, length) in records:
+                    resources[name] = codec.load_document(backup_map[offset:offset + length])
+            finally:
+                backup_map.close()
+        else:
+            for name, (offset, length) in sorted(records, key=lambda record: record[1][0]):
+                backup_stream.seek(offset)
+                resources[name] = codec.load_document(backup_stream.read(length))
+    for name, resource in resources.iteritems():
+        if resource.name != name:
+            raise MigrationToolException('Backup index {} does not match the backup'.format(
+                BackupIndex.index_path(backup_file)))
+    return resources
+
+
+def find_manifests(backup_location):
+    """
+    :param str backup_location: Folder of the backups
+    :return: Manifests of the incremental backups in the folder, compressed ones included
+    :rtype: list
+    """
+    if not os.path.isdir(backup_location):
+        return []
+    extensions = tuple(ManifestCodec.EXTENSION + extension for extension in [''] + sorted(EXTENSIONS.values()))
+    return [os.path.join(backup_location, file_name) for file_name in sorted(os.listdir(backup_location))
+            if file_name.endswith(extensions)]
+
+
+def referenced_digests(manifest_files, store_path):
+    """
+    Records of the store referenced by the manifests, manifests of other stores are skipped
+    :param list manifest_files: Manifests paths
+    :param str store_path: Backup store folder
+    :rtype: set
+    """
+    store_path = os.path.normcase(os.path.abspath(store_path))
+    digests = set()
+    for manifest_file in manifest_files:
+        with open_backup_file(manifest_file) as manifest_stream:
+            codec = detect_codec(manifest_stream)
+            if not isinstance(codec, ManifestCodec):
+                raise MigrationToolException('{} is not a manifest'.format(manifest_file))
+            codec.read_header(manifest_stream, manifest_file)
+            if os.path.normcase(os.path.abspath(codec.store_path)) == store_path:
+                digests.update(codec.read_digests(manifest_stream))
+    return digests
+
+
+def prune_store(backup_store, manifest_files=(), dry_run=False):
+    """
+    Removes the records not referenced by the registered manifests, the given manifests and the backups in progress,
+    the store is locked while the manifests are read and the records are removed
+    :type backup_store: BackupStore
+    :param list manifest_files: Manifests not registered in the store, moved or copied after they were written
+    :param bool dry_run: Records are not removed
+    :return: Read manifests and digests of the removed records
+    :rtype: tuple
+    """
+    with backup_store.lock():
+        pending = {os.path.normcase(manifest_file) for manifest_file in backup_store.pending()}
+        registered = [manifest_file for manifest_file in backup_store.manifests() if os.path.exists(manifest_file)]
+        manifests = {}
+        for manifest_file in registered + list(manifest_files):
+            manifest_file = os.path.abspath(manifest_file)
+            if os.path.normcase(manifest_file) not in pending:
+                manifests.setdefault(os.path.normcase(manifest_file), manifest_file)
+        manifest_files = sorted(manifests.values())
+        return manifest_files, backup_store.prune(referenced_digests(manifest_files, backup_store.store_path),
+                                                  dry_run)
@@ -0,0 +1,30 @@
+from multiprocessing.pool import ThreadPool
+
+
+def concurrent_map_unordered(func, items, workers):
+    """
+    Apply function to every item using bounded pool of worker threads, items with their results are yielded as soon
+    as the calls finished
+    :param function func: Function to apply
+    :param list items: Items
+    :param int workers: Max number of concurrent calls
+    :return: Tuples of item and result
+    :rtype: collections.Iterable
+    """
+    items = list(items)
+
+    def _call(item):
+        return item, func(item)
+
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield _call(item)
+        return
+
+    pool = ThreadPool(min(workers, len(items)))
+    try:
+        for item, result in pool.imap_unordered(_call, items):
+            yield item, result
+    finally:
+        pool.terminate()
+        pool.join()
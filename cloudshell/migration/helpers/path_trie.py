@@ -0,0 +1,131 @@
+from threading import Lock
+
+from cloudshell.migration.entities import intern_path
+
+
+class _PathNode(object):
+    __slots__ = ('name', 'path', 'resource', 'children', 'known')
+
+    def __init__(self, name, path, resource):
+        self.name = name
+        self.path = path
+        # Root resource node, the node itself for the resource
+        self.resource = resource or self
+        self.children = {}
+        # Added explicitly, not only a prefix of another path
+        self.known = False
+
+
+class PathTrie(object):
+    """
+    Trie of the known resources and ports full paths, filled from the resources list, the loaded ports and the
+    routes segments. Every path is split once when it's added, nodes are also indexed by the full path so lookups
+    and subtree queries do not split strings. Lookups do not change the trie, paths that were not added are split in
+    place
+    """
+
+    def __init__(self):
+        self._root = _PathNode(None, '', None)
+        self._nodes = {}
+        self._lock = Lock()
+
+    def add(self, path):
+        """
+        Path is split once, missing prefixes are added as the unknown nodes
+        :param str path: Resource or port full path
+        """
+        with self._lock:
+            node = self._root
+            for name in path.split('/'):
+                child = node.children.get(name)
+                if child is None:
+                    child_path = intern_path('{}/{}'.format(node.path, name) if node.path else name)
+                    child = node.children[name] = _PathNode(intern_path(name), child_path,
+                                                            node.resource if node.path else None)
+                    self._nodes[child_path] = child
+                node = child
+            node.known = True
+
+    def discard(self, path):
+        """
+        Path and the paths under it are removed
+        :param str path: Resource or port full path
+        """
+        with self._lock:
+            node = self._nodes.get(path)
+            if node is None:
+                return
+            parent_path = path.rsplit('/', 1)[0] if '/' in path else None
+            parent = self._nodes.get(parent_path) if parent_path else self._root
+            parent.children.pop(node.name, None)
+            nodes = [node]
+            while nodes:
+                node = nodes.pop()
+                del self._nodes[node.path]
+                nodes.extend(node.children.itervalues())
+
+    def __contains__(self, path):
+        node = self._nodes.get(path)
+        return bool(node and node.known)
+
+    def resource(self, path):
+        """
+        :param str path: Full path
+        :return: Root resource name
+        :rtype: str
+        """
+        node = self._nodes.get(path)
+        if node is None:
+            return path.split('/', 1)[0]
+        return node.resource.name
+
+    def relative(self, path):
+        """
+        :param str path: Full path
+        :return: Path inside the root resource
+        :rtype: str
+        """
+        node = self._nodes.get(path)
+        if node is None:
+            return path.split('/', 1)[1] if '/' in path else ''
+        return node.path[len(node.resource.path) + 1:]
+
+    def leaf(self, path):
+        """
+        :param str path: Full path
+        :return: Last path element
+        :rtype: str
+        """
+        node = self._nodes.get(path)
+        if node is None:
+            return path.rsplit('/', 1)[-1]
+        return node.name
+
+    def subtree(self, prefix):
+        """
+        :param str prefix: Resource or sub-resource full path
+        :return: Known paths under the prefix, including itself
+        :rtype: list
+        """
+        with self._lock:
+            return list(self._known_paths(prefix))
+
+    def has_prefix(self, prefix):
+        """
+        :param str prefix: Resource or sub-resource full path
+        :return: True if known path exists under the prefix
+        """
+        with self._lock:
+            return any(True for _ in self._known_paths(prefix))
+
+    def _known_paths(self, prefix):
+        """
+        Called under the lock
+        """
+        node = self._nodes.get(prefix)
+        nodes = [node] if node else []
+        while nodes:
+            node = nodes.pop()
+            if node.known:
+                yield node.path
+            nodes.extend(node.children.itervalues())
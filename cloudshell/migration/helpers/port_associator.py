@@ -1,116 +1,130 @@
+import logging
 import re
 
-from backports.functools_lru_cache import lru_cache
+from cloudshell.migration.helpers.path_trie import PathTrie
 
 
-class PortAssociator(object):
-    def __init__(self, src_resource, dst_resource, config_operations, logger):
+class _AssociationRule(object):
+    """
+    Association configuration of the family/model with the pattern compiled once, normalized keys of the addresses
+    are cached, identical resources share them
+    """
+
+    def __init__(self, association_configuration, config_operations):
         """
-        :type src_resource: cloudshell.migration.entities.Resource
-        :type dst_resource: cloudshell.migration.entities.Resource
+        :param dict association_configuration: Association configuration
         :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
-        :type logger: cloudshell.migration.helpers.log_helper.Logger
         """
+        self.pattern = re.compile(association_configuration.get(config_operations.KEY.PATTERN), re.IGNORECASE)
+        self.by_address = association_configuration.get(config_operations.KEY.ASSOCIATE_BY_ADDRESS, True)
+        self.by_name = association_configuration.get(config_operations.KEY.ASSOCIATE_BY_NAME, False)
+        self.by_port_name = association_configuration.get(config_operations.KEY.ASSOCIATE_BY_PORT_NAME, False)
+        self._address_keys = {}
 
-        self._src_resource = src_resource
-        self._dst_resource = dst_resource
-        self._config_operations = config_operations
-        self._logger = logger
-
-        self._src_association_configuration = self._config_operations.get_association_configuration(
-            self._src_resource.family, self._src_resource.model)
-        self._dst_association_configuration = self._config_operations.get_association_configuration(
-            self._dst_resource.family, self._dst_resource.model)
-
-        self._src_port_pattern = re.compile(
-            self._src_association_configuration.get(self._config_operations.KEY.PATTERN),
-            re.IGNORECASE)
-        self._dst_port_pattern = re.compile(
-            self._dst_association_configuration.get(self._config_operations.KEY.PATTERN),
-            re.IGNORECASE)
-
-    @property
-    @lru_cache()
-    def _dst_port_sorted_by_associated_address(self):
-        address_dict = {}
-        for port in self._dst_resource.ports:
-            f_addr = self._format_dst_address(port.address)
-            if f_addr:
-                address_dict[f_addr] = port
-        return address_dict
-
-    @property
-    @lru_cache()
-    def _dst_port_sorted_by_name(self):
-        return {self._format_name(port.name): port for port in self._dst_resource.ports}
-
-    @property
-    @lru_cache()
-    def _dst_port_sorted_by_port_name(self):
-        return {self._format_port_name(port.name): port for port in self._dst_resource.ports}
-
-    def associated_pairs(self):
-        for src_port in self._src_resource.ports:
-            if src_port.connected_to:
-                associated_dst_port = self.associate_dst_port(src_port)
-                if associated_dst_port:
-                    yield src_port, associated_dst_port
-
-    def associate_dst_port(self, src_port):
+    def address_key(self, address):
         """
-        :type src_port: cloudshell.migration.entities.Port
+        :param str address: Port address
+        :return: Address groups matched by the pattern, None if not matched
+        :rtype: tuple
         """
-        result_list = []
-        if self._dst_association_configuration.get(self._config_operations.KEY.ASSOCIATE_BY_ADDRESS, True):
-            dst_port_by_address = self._dst_port_sorted_by_associated_address.get(
-                self._format_src_address(src_port.address))
-            if dst_port_by_address:
-                result_list.append(dst_port_by_address)
+        try:
+            return self._address_keys[address]
+        except KeyError:
+            match = self.pattern.search(address)
+            address_key = tuple(group.zfill(2) for group in match.groups()) if match else None
+            self._address_keys[address] = address_key
+            return address_key
 
-        if self._dst_association_configuration.get(self._config_operations.KEY.ASSOCIATE_BY_NAME, False):
-            dst_port_by_name = self._dst_port_sorted_by_name.get(self._format_name(src_port.name))
-            if dst_port_by_name:
-                result_list.append(dst_port_by_name)
 
-        if self._dst_association_configuration.get(self._config_operations.KEY.ASSOCIATE_BY_PORT_NAME, False):
-            dst_port_by_port_name = self._dst_port_sorted_by_port_name.get(self._format_port_name(src_port.name))
-            if dst_port_by_port_name:
-                result_list.append(dst_port_by_port_name)
-
-        if not result_list:
-            self._logger.error('Cannot find associated DST port, for {}'.format(src_port))
-        elif len(set(result_list)) > 1:
-            self._logger.warning('Multiple associations {} for {}'.format(result_list, src_port))
-            return result_list[0]
-        else:
-            self._logger.debug('Association found {} -> {}'.format(src_port, result_list[0]))
-            return result_list[0]
-
-    def _format_dst_address(self, address):
-        self._logger.debug('Matching dst address {} for pattern {}'.format(address, self._dst_port_pattern.pattern))
-        return self._format_address(address, self._dst_port_pattern)
-
-    def _format_src_address(self, address):
-        self._logger.debug('Matching src address {} for pattern {}'.format(address, self._src_port_pattern.pattern))
-        return self._format_address(address, self._src_port_pattern)
-
-    def _format_address(self, address, pattern):
-        match = re.search(pattern, address)
-        if match:
-            x = tuple(map(lambda x: x.zfill(2), match.groups()))
-            return x
-        self._logger.error('Cannot match address {} for pattern {}'.format(address, pattern.pattern))
+class PortAssociator(object):
+    """
+    Associates SRC ports with DST ports, one associator is reused for all the resources pairs
+    """
 
-    def _format_name(self, name):
+    def __init__(self, config_operations, logger, path_trie=None):
         """
-        :param str name:
-        :rtype: str
+        :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+        :type logger: cloudshell.migration.helpers.log_helper.Logger
+        :param PathTrie path_trie: Loaded resources and ports
         """
-        return "/".join(name.split("/")[1:])
+        self._config_operations = config_operations
+        self._logger = logger
+        self._path_trie = path_trie if path_trie is not None else PathTrie()
+        self._rules = {}
+        self._rules_by_configuration = {}
 
-    def _format_port_name(self, port_name):
+    def _rule(self, resource):
+        """
+        :type resource: cloudshell.migration.entities.Resource
+        :rtype: _AssociationRule
         """
-        :param str port_name:
-        :rtype: str
+        family_model = resource.family, resource.model
+        rule = self._rules.get(family_model)
+        if rule is None:
+            association_configuration = self._config_operations.get_association_configuration(*family_model)
+            # Family/model pairs resolved to the same configuration share the rule
+            rule = self._rules_by_configuration.get(id(association_configuration))
+            if rule is None:
+                rule = _AssociationRule(association_configuration, self._config_operations)
+                self._rules_by_configuration[id(association_configuration)] = rule
+            self._rules[family_model] = rule
+        return rule
+
+    def _address_key(self, rule, address, resource_type):
+        address_key = rule.address_key(address)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Matching {} address {} for pattern {}'.format(resource_type, address,
+                                                                              rule.pattern.pattern))
+        if address_key is None:
+            self._logger.error('Cannot match address {} for pattern {}'.format(address, rule.pattern.pattern))
+        return address_key
+
+    def associated_pairs(self, src_resource, dst_resource):
+        """
+        DST ports are indexed once, connected SRC ports are associated in one pass
+        :type src_resource: cloudshell.migration.entities.Resource
+        :type dst_resource: cloudshell.migration.entities.Resource
+        :return: Tuples of the SRC port and the associated DST port
+        :rtype: collections.Iterable
         """
-        return port_name.split("/")[-1]
+        src_rule = self._rule(src_resource)
+        dst_rule = self._rule(dst_resource)
+        dst_ports_by_address = {}
+        dst_ports_by_name = {}
+        dst_ports_by_port_name = {}
+        for port in dst_resource.ports:
+            if dst_rule.by_address:
+                address_key = self._address_key(dst_rule, port.address, 'dst')
+                if address_key:
+                    dst_ports_by_address[address_key] = port
+            if dst_rule.by_name:
+                dst_ports_by_name[self._path_trie.relative(port.name)] = port
+            if dst_rule.by_port_name:
+                dst_ports_by_port_name[self._path_trie.leaf(port.name)] = port
+
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        for src_port in src_resource.ports:
+            if not src_port.connected_to:
+                continue
+            result_list = []
+            if dst_rule.by_address:
+                dst_port = dst_ports_by_address.get(self._address_key(src_rule, src_port.address, 'src'))
+                if dst_port:
+                    result_list.append(dst_port)
+            if dst_rule.by_name:
+                dst_port = dst_ports_by_name.get(self._path_trie.relative(src_port.name))
+                if dst_port:
+                    result_list.append(dst_port)
+            if dst_rule.by_port_name:
+                dst_port = dst_ports_by_port_name.get(self._path_trie.leaf(src_port.name))
+                if dst_port:
+                    result_list.append(dst_port)
+
+            if not result_list:
+                self._logger.error('Cannot find associated DST port, for {}'.format(src_port))
+                continue
+            if len(set(result_list)) > 1:
+                self._logger.warning('Multiple associations {} for {}'.format(result_list, src_port))
+            elif debug:
+                self._logger.debug('Association found {} -> {}'.format(src_port, result_list[0]))
+            yield src_port, result_list[0]
@@ -0,0 +1,123 @@
+from collections import defaultdict
+
+from cloudshell.migration.entities import LogicalRoute
+from cloudshell.migration.helpers.path_trie import PathTrie
+
+
+class RouteIndex(object):
+    """
+    Logical routes of the reservations indexed by segment port, resource and reservation, with the resources every
+    route passes, built in one pass over the routes segments
+    """
+
+    def __init__(self, path_trie=None):
+        """
+        :param PathTrie path_trie: Loaded resources and ports
+        """
+        self._path_trie = path_trie if path_trie is not None else PathTrie()
+        # Port name to (logical route, endpoint), the first route passing the port is kept
+        self.segments = {}
+        self._routes = set()
+        self._active_routes = set()
+        # Root resource name to the logical routes passing its ports
+        self._routes_by_resource = defaultdict(set)
+        # Logical route to the resources of its segments ports
+        self._resources_by_route = {}
+        self._routes_by_reservation = defaultdict(list)
+
+    def add_reservation(self, reservation_id, details):
+        """
+        Active routes of the reservation are added first, requested routes are skipped if active route with the
+        same endpoints exists
+        :param str reservation_id: Reservation
+        :param details: cloudshell.api.cloudshell_api.ReservationDescriptionInfo
+        """
+        for route_info in details.ActiveRoutesInfo:
+            self._add_route(reservation_id, route_info, True)
+            self._active_routes.add((route_info.Source, route_info.Target))
+        for route_info in details.RequestedRoutesInfo:
+            if (route_info.Source, route_info.Target) not in self._active_routes:
+                self._add_route(reservation_id, route_info, False)
+
+    def _add_route(self, reservation_id, route_info, active):
+        if not route_info.Source or not route_info.Target or not route_info.Segments:
+            return
+        logical_route = LogicalRoute(route_info.Source, route_info.Target, reservation_id, route_info.RouteType,
+                                     route_info.Alias, active, route_info.Shared)
+        if logical_route in self._routes:
+            return
+        self._routes.add(logical_route)
+        self._routes_by_reservation[reservation_id].append(logical_route)
+        # Ports of the endpoint segments take precedence over the transit ones
+        segments = route_info.Segments
+        for segment, endpoint in [(segments[0], True), (segments[-1], True)] + [(segment, False) for segment in
+                                                                                 segments[1:-1]]:
+            self._add_port(logical_route, segment.Source, endpoint)
+            self._add_port(logical_route, segment.Target, endpoint)
+
+    def _add_port(self, logical_route, port_name, endpoint):
+        if port_name not in self.segments:
+            self.segments[port_name] = (logical_route, endpoint)
+        self._path_trie.add(port_name)
+        resource_name = self._path_trie.resource(port_name)
+        self._routes_by_resource[resource_name].add(logical_route)
+        self._resources_by_route.setdefault(logical_route, set()).add(resource_name)
+
+    def by_segment(self, port_name):
+        """
+        :param str port_name: Port full name
+        :return: Logical route passing the port and whether the port belongs to the route's endpoint segment
+        :rtype: tuple
+        """
+        return self.segments.get(port_name)
+
+    def is_endpoint(self, port_name):
+        """
+        :param str port_name: Port full name
+        :return: True for the port of the endpoint segment, False for the transit port, None if no route passes it
+        """
+        route_endpoint = self.segments.get(port_name)
+        return route_endpoint[1] if route_endpoint else None
+
+    def by_resource(self, resource_name):
+        """
+        :param str resource_name: Root resource name
+        :return: Logical routes passing the resource ports, endpoint and transit ones
+        :rtype: set
+        """
+        return self._routes_by_resource.get(resource_name, set())
+
+    def by_reservation(self, reservation_id):
+        """
+        :param str reservation_id: Reservation
+        :return: Logical routes of the reservation
+        :rtype: list
+        """
+        return self._routes_by_reservation.get(reservation_id, [])
+
+    def route_resources(self, logical_route):
+        """
+        :param cloudshell.migration.entities.LogicalRoute logical_route: Logical route
+        :return: Resources of the route segments ports, endpoint and transit ones
+        :rtype: set
+        """
+        return self._resources_by_route.get(logical_route, set())
+
+    def connector_resources(self, connector):
+        """
+        :param cloudshell.migration.entities.Connector connector: Connector
+        :return: Resources of the segments ports of the reservation routes connecting the connector endpoints
+        :rtype: set
+        """
+        endpoints = {connector.source, connector.target}
+        resources = set()
+        for logical_route in self.by_reservation(connector.reservation_id):
+            if {logical_route.source, logical_route.target} == endpoints:
+                resources.update(self.route_resources(logical_route))
+        return resources
+
+    def __contains__(self, logical_route):
+        return logical_route in self._routes
+
+    def __len__(self):
+        return len(self._routes)
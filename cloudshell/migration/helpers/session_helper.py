@@ -0,0 +1,30 @@
+import os
+
+from cloudshell.api.cloudshell_api import CloudShellAPISession
+from cloudshell.logging.qs_logger import get_qs_logger
+
+PACKAGE_NAME = u'cloudshell-migration'
+
+
+def create_api_session(config_operations):
+    """
+    New CloudShell API session with the configured credentials
+    :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+    :rtype: CloudShellAPISession
+    """
+    return CloudShellAPISession(config_operations.read_key_or_default(config_operations.KEY.HOST),
+                                config_operations.read_key_or_default(config_operations.KEY.USERNAME),
+                                config_operations.read_key_or_default(config_operations.KEY.PASSWORD),
+                                config_operations.read_key_or_default(config_operations.KEY.DOMAIN),
+                                port=config_operations.read_key_or_default(config_operations.KEY.PORT))
+
+
+def create_logger(config_operations):
+    """
+    :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+    :rtype: logging.Logger
+    """
+    os.environ['LOG_PATH'] = config_operations.read_key_or_default(config_operations.KEY.LOG_PATH)
+    logger = get_qs_logger(str(PACKAGE_NAME), 'migration_tool', 'migration_tool')
+    logger.setLevel(config_operations.read_key_or_default(config_operations.KEY.LOG_LEVEL))
+    return logger
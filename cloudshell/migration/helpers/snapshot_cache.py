@@ -0,0 +1,263 @@
+import json
+import os
+import re
+import time
+from threading import RLock
+
+from cloudshell.migration.helpers.api_proxy import ApiSessionProxy
+
+
+class ApiRecord(object):
+    """
+    API response restored from the snapshot, has the attributes of the recorded response
+    """
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def to_record(value):
+    """
+    API response as a structure of the plain types, public attributes of the response objects become dictionaries
+    """
+    if isinstance(value, (list, tuple)):
+        return map(to_record, value)
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return {name: to_record(item) for name, item in vars(value).iteritems()
+                if not name.startswith('_') and not callable(item)}
+    return value
+
+
+def from_record(record):
+    """
+    :return: API response of the record, dictionaries become ApiRecord
+    """
+    if isinstance(record, list):
+        return map(from_record, record)
+    if isinstance(record, dict):
+        return ApiRecord(**{str(name): from_record(item) for name, item in record.iteritems()})
+    return _native(record)
+
+
+def _native(value):
+    # JSON strings are unicode, ASCII values are kept as str like the API returns them
+    if type(value) is unicode:
+        try:
+            return value.encode('ascii')
+        except UnicodeEncodeError:
+            pass
+    return value
+
+
+def _key(record):
+    return tuple(_key(item) for item in record) if isinstance(record, list) else _native(record)
+
+
+class SnapshotCache(object):
+    """
+    Inventory snapshot stored on the disk as JSON records, one file per CloudShell host, domain and user
+    """
+    FILE_EXTENSION = '.json'
+    VERSION = 1
+
+    def __init__(self, cache_location, host, domain, username, ttl, refresh=False):
+        """
+        :param str cache_location: Cache folder
+        :param str host: CloudShell host
+        :param str domain: CloudShell domain
+        :param str username: CloudShell user, users can see different resources and reservations
+        :param int ttl: Entry time to live in seconds
+        :param bool refresh: Ignore the stored snapshot
+        """
+        self._cache_file = os.path.join(cache_location, self._file_name(host, domain, username))
+        self._ttl = ttl
+        self._refresh = refresh
+        self._lock = RLock()
+        self.__entries = None
+
+    @classmethod
+    def _file_name(cls, host, domain, username):
+        return re.sub(r'[^\w.-]', '_', '{}_{}_{}'.format(host, domain, username)) + cls.FILE_EXTENSION
+
+    @property
+    def _entries(self):
+        """
+        :rtype: dict
+        """
+        with self._lock:
+            if self.__entries is None:
+                self.__entries = {} if self._refresh else self._read()
+            return self.__entries
+
+    def _read(self):
+        if not os.path.isfile(self._cache_file):
+            return {}
+        try:
+            with open(self._cache_file) as cache_file:
+                data = json.load(cache_file)
+            if data.get('version') != self.VERSION:
+                return {}
+            entries = {_key(key): (timestamp, from_record(value)) for key, timestamp, value in data['entries']}
+        except Exception:
+            return {}
+        return {key: entry for key, entry in entries.iteritems() if not self._expired(entry)}
+
+    def _expired(self, entry):
+        timestamp, value = entry
+        return time.time() - timestamp > self._ttl
+
+    def get(self, key):
+        """
+        :type key: tuple
+        :return: Tuple (found, value)
+        :rtype: tuple
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                return False, None
+            return True, entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_method(self, method_name):
+        """
+        Invalidate entries for all calls of the API method
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == method_name]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def save(self):
+        with self._lock:
+            if self.__entries is None:
+                return
+            dir_path = os.path.dirname(self._cache_file)
+            if not os.path.exists(dir_path):
+                os.makedirs(dir_path)
+            tmp_file_path = self._cache_file + '.tmp'
+            with open(tmp_file_path, 'w') as cache_file:
+                json.dump({'version': self.VERSION,
+                           'entries': [[key, timestamp, to_record(value)] for key, (timestamp, value) in
+                                       self.__entries.iteritems()]}, cache_file)
+            if os.path.exists(self._cache_file):
+                os.remove(self._cache_file)
+            os.rename(tmp_file_path, self._cache_file)
+
+    def delete(self):
+        """
+        Stored snapshot is removed, it is not saved by this cache
+        """
+        with self._lock:
+            self.__entries = None
+            if os.path.exists(self._cache_file):
+                os.remove(self._cache_file)
+
+
+class CachingApiSession(ApiSessionProxy):
+    """
+    Serves inventory discovery calls from the snapshot cache, mutations invalidate affected entries
+    """
+    RESOURCE_LIST = 'GetResourceList'
+    RESOURCE_DETAILS = 'GetResourceDetails'
+    RESERVATIONS = 'GetCurrentReservations'
+    RESERVATION_DETAILS = 'GetReservationDetails'
+    CACHED_METHODS = [RESOURCE_LIST, RESOURCE_DETAILS, RESERVATIONS, RESERVATION_DETAILS]
+    READ_ONLY_PREFIXES = ('Get', 'Decrypt', 'Find', 'Logon', 'SecureLogon')
+
+    RESOURCE_METHODS = ['UpdateResourceDriver', 'SetAttributeValue', 'SetAttributesValues', 'ExcludeResource',
+                        'IncludeResource', 'AutoLoad', 'SyncResourceFromDevice']
+    INVENTORY_METHODS = ['CreateResource', 'CreateResources', 'DeleteResource', 'RenameResource']
+    CONNECTION_METHODS = ['UpdatePhysicalConnection', 'UpdatePhysicalConnections', 'UpdateConnectionWeight']
+    RESERVATION_METHODS = ['RemoveRoutesFromReservation', 'CreateRouteInReservation', 'CreateRoutesInReservation',
+                           'AddRoutesToReservation', 'SetConnectorsInReservation', 'RemoveConnectorsFromReservation']
+
+    def __init__(self, api, snapshot_cache):
+        """
+        :type api: cloudshell.api.cloudshell_api.CloudShellAPISession
+        :type snapshot_cache: SnapshotCache
+        """
+        super(CachingApiSession, self).__init__(api)
+        self._snapshot_cache = snapshot_cache
+
+    @staticmethod
+    def _cache_key(method_name, args, kwargs):
+        return (method_name,) + tuple(args) + tuple(sorted(kwargs.items()))
+
+    def _cacheable(self, method_name, args):
+        if method_name == self.RESOURCE_DETAILS:
+            # Only root resources details are cached, child resources are the part of the root details
+            return bool(args) and '/' not in args[0]
+        return method_name in self.CACHED_METHODS
+
+    def _call(self, method_name, method, args, kwargs):
+        if self._cacheable(method_name, args):
+            key = self._cache_key(method_name, args, kwargs)
+            found, value = self._snapshot_cache.get(key)
+            if not found:
+                value = method(*args, **kwargs)
+                self._snapshot_cache.set(key, value)
+            return value
+
+        self._invalidate(method_name, args, kwargs)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._invalidate(method_name, args, kwargs)
+
+    def _invalidate(self, method_name, args, kwargs):
+        arguments = list(args) + [value for key, value in sorted(kwargs.items())]
+        if method_name in self.RESOURCE_METHODS:
+            self._invalidate_resources(arguments[:1])
+        elif method_name in self.INVENTORY_METHODS:
+            self._snapshot_cache.invalidate_method(self.RESOURCE_LIST)
+            self._invalidate_resources([argument for argument in arguments if isinstance(argument, basestring)])
+        elif method_name in self.CONNECTION_METHODS:
+            self._invalidate_connections(method_name, arguments)
+        elif method_name in self.RESERVATION_METHODS:
+            self._snapshot_cache.invalidate(self._cache_key(self.RESERVATION_DETAILS, arguments[:1], {}))
+        elif not method_name.startswith(self.READ_ONLY_PREFIXES):
+            self._snapshot_cache.clear()
+
+    def _invalidate_connections(self, method_name, arguments):
+        if method_name == 'UpdatePhysicalConnections':
+            paths = []
+            for request in arguments[0]:
+                paths.extend([request.ResourceAFullName, request.ResourceBFullName])
+        else:
+            paths = arguments[:2]
+        paths = [path for path in paths if path]
+        # Previously connected ports lose their connections too
+        for path in list(paths):
+            paths.extend(self._cached_connections(path))
+        self._invalidate_resources(paths)
+
+    def _cached_connections(self, path):
+        found, details = self._snapshot_cache.get(self._cache_key(self.RESOURCE_DETAILS, [self._root(path)], {}))
+        if not found:
+            return []
+        child_details = [details]
+        while child_details:
+            child_detail = child_details.pop()
+            if child_detail.Name == path:
+                return [connection.FullPath for connection in child_detail.Connections]
+            child_details.extend(child_detail.ChildResources)
+        return []
+
+    def _invalidate_resources(self, paths):
+        for root in set(map(self._root, paths)):
+            self._snapshot_cache.invalidate(self._cache_key(self.RESOURCE_DETAILS, [root], {}))
+
+    @staticmethod
+    def _root(path):
+        return path.split('/')[0]
@@ -1,23 +1,102 @@
 import os
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+
+
+def _resource_key(path_trie, full_path):
+    """
+    :type path_trie: cloudshell.migration.helpers.path_trie.PathTrie
+    :param str full_path: Resource or port full path
+    """
+    return 'resource', path_trie.resource(full_path)
+
+
+def _reservation_key(reservation_id):
+    return 'reservation', reservation_id
+
+
+def _resource_name_key(resource_name):
+    return 'resource', resource_name
+
+
+class ActionsSet(object):
+    """
+    Insertion ordered set of actions, the first added of the equal actions is kept
+    """
+
+    def __init__(self, actions=None):
+        self._actions = OrderedDict()
+        if actions:
+            self.update(actions)
+
+    def add(self, action):
+        self._actions.setdefault(action, action)
+
+    append = add
+
+    def update(self, actions):
+        """
+        :param collections.Iterable actions: Actions
+        """
+        for action in actions:
+            self._actions.setdefault(action, action)
+
+    def __iter__(self):
+        return self._actions.iterkeys()
+
+    def __len__(self):
+        return len(self._actions)
+
+    def __contains__(self, action):
+        return action in self._actions
 
 
 class ActionsContainer(object):
+    BATCH_SIZE = 200
+
     def __init__(self, remove_routes=None, update_connections=None, create_routes=None, remove_connectors=None,
                  create_connectors=None):
-        self.remove_routes = remove_routes or []
-        self.update_connections = update_connections or []
-        self.create_routes = create_routes or []
-        self.remove_connectors = remove_connectors or []
-        self.create_connectors = create_connectors or []
+        self.remove_routes = ActionsSet(remove_routes)
+        self.update_connections = ActionsSet(update_connections)
+        self.create_routes = ActionsSet(create_routes)
+        self.remove_connectors = ActionsSet(remove_connectors)
+        self.create_connectors = ActionsSet(create_connectors)
+
+    def phases(self):
+        """
+        Actions grouped by the execution phase, in the execution order, actions of the phase are in the order they
+        were added
+        :rtype: list
+        """
+        return [list(self.remove_routes), list(self.remove_connectors), list(self.update_connections),
+                list(self.create_routes), list(self.create_connectors)]
+
+    def batched_phases(self):
+        """
+        Execution phases where the actions sharing a batch key are joined into batches of up to BATCH_SIZE actions
+        :rtype: list
+        """
+        return [self._batch(phase) for phase in self.phases()]
+
+    def _batch(self, actions):
+        batched = []
+        groups = OrderedDict()
+        for action in actions:
+            batch_key = action.batch_key
+            if batch_key is None:
+                batched.append(action)
+            else:
+                groups.setdefault((action.__class__, batch_key), []).append(action)
+        for (action_class, batch_key), group in groups.iteritems():
+            for index in xrange(0, len(group), self.BATCH_SIZE):
+                chunk = group[index:index + self.BATCH_SIZE]
+                batched.append(action_class.batch_class(chunk) if len(chunk) > 1 else chunk[0])
+        return batched
 
     def sequence(self):
         sequence = []
-        sequence.extend(set(self.remove_routes))
-        sequence.extend(set(self.remove_connectors))
-        sequence.extend(set(self.update_connections))
-        sequence.extend(set(self.create_routes))
-        sequence.extend(set(self.create_connectors))
+        for phase in self.phases():
+            sequence.extend(phase)
         return sequence
 
     def execute_actions(self):
@@ -25,19 +104,17 @@ class ActionsContainer(object):
 
     def update(self, container):
         """
+        Actions of the container are merged in, existing actions are kept
         :type container: ActionsContainer
         """
-        self.remove_routes = set(self.remove_routes) | set(container.remove_routes)
-        self.update_connections = set(self.update_connections) | set(container.update_connections)
-        self.create_routes = set(self.create_routes) | set(container.create_routes)
-        self.remove_connectors = set(self.remove_connectors) | set(container.remove_connectors)
-        self.create_connectors = set(self.create_connectors) | set(container.create_connectors)
+        self.remove_routes.update(container.remove_routes)
+        self.update_connections.update(container.update_connections)
+        self.create_routes.update(container.create_routes)
+        self.remove_connectors.update(container.remove_connectors)
+        self.create_connectors.update(container.create_connectors)
 
     def to_string(self):
-        out = ''
-        for action in self.sequence():
-            out += action.to_string() + os.linesep
-        return out
+        return ''.join(action.to_string() + os.linesep for action in self.sequence())
 
     def is_empty(self):
         return False if self.remove_routes or self.update_connections or self.create_routes or self.create_connectors or self.remove_connectors else True
@@ -54,19 +131,149 @@ class Action(object):
         :type logger: cloudshell.migration.helpers.log_helper.Logger
         """
         self.logger = logger
+        self._identity = None
 
     @abstractmethod
     def execute(self):
         pass
 
+    @property
+    def identity(self):
+        """
+        Stable identity of the action, it is defined on the first access and does not change after the execution
+        :rtype: str
+        """
+        if self._identity is None:
+            self._identity = '{}:{}'.format(self.__class__.__name__, self._identity_unit())
+        return self._identity
+
+    @identity.setter
+    def identity(self, value):
+        self._identity = value
+
+    def _identity_unit(self):
+        return id(self)
+
     @abstractmethod
     def to_string(self):
         pass
 
+    @property
+    def dependency_keys(self):
+        """
+        Resources and reservations affected by the action, actions of the later phases sharing a key have to wait
+        for it
+        :rtype: set
+        """
+        return set()
+
+    @property
+    def reads_connections(self):
+        """
+        Ports which updated connections the action uses
+        :rtype: set
+        """
+        return set()
+
+    @property
+    def writes_connections(self):
+        """
+        Ports which updated connections the action defines
+        :rtype: set
+        """
+        return set()
+
+    @property
+    def batch_key(self):
+        """
+        Actions of the same class and batch key can be executed by one batch_class batch, None if the action is
+        executed alone
+        """
+        return None
+
     def __str__(self):
         return self.to_string()
 
 
+class ActionsBatch(Action):
+    __metaclass__ = ABCMeta
+
+    def __init__(self, actions):
+        """
+        :param list actions: Actions executed together
+        """
+        super(ActionsBatch, self).__init__(actions[0].logger)
+        self.actions = actions
+
+    @abstractmethod
+    def execute(self):
+        """
+        :return: Result of every action
+        :rtype: list
+        """
+        pass
+
+    def _fallback(self, error):
+        self.logger.warning('Batch of {} actions failed, reason {}, executing actions one by one'.format(
+            len(self.actions), str(error)))
+        return [action.execute() for action in self.actions]
+
+    @property
+    def dependency_keys(self):
+        return set().union(*[action.dependency_keys for action in self.actions])
+
+    @property
+    def reads_connections(self):
+        return set().union(*[action.reads_connections for action in self.actions])
+
+    @property
+    def writes_connections(self):
+        return set().union(*[action.writes_connections for action in self.actions])
+
+    def to_string(self):
+        return os.linesep.join([action.to_string() for action in self.actions])
+
+
+class RemoveRoutesBatch(ActionsBatch):
+    def execute(self):
+        try:
+            self.actions[0].logical_route_operations.remove_routes([action.logical_route for action in self.actions])
+            return [action.to_string() + " ... Done" for action in self.actions]
+        except Exception as e:
+            return self._fallback(e)
+
+
+class CreateRoutesBatch(ActionsBatch):
+    def execute(self):
+        for action in self.actions:
+            action.refresh_route()
+        try:
+            self.actions[0].logical_route_operations.create_routes([action.logical_route for action in self.actions])
+            return [action.to_string() + " ... Done" for action in self.actions]
+        except Exception as e:
+            return self._fallback(e)
+
+
+class UpdateConnectionsBatch(ActionsBatch):
+    def execute(self):
+        """
+        Connections to the ports migrated by the same batch are resolved to the new ports in advance, updated
+        connections are published after the batch succeeded
+        """
+        batch_connections = {action.src_port.name: action.dst_port.name for action in self.actions}
+        updated_connections = self.actions[0].updated_connections
+        for action in self.actions:
+            connected_to = action.src_port.connected_to
+            action.dst_port.connected_to = batch_connections.get(connected_to,
+                                                                 updated_connections.get(connected_to, connected_to))
+        try:
+            self.actions[0].resource_operations.update_connections([action.dst_port for action in self.actions])
+        except Exception as e:
+            return self._fallback(e)
+        updated_connections.update(batch_connections)
+        return [action.to_string() + " ... Done" for action in self.actions]
+
+
 class LogicalRouteAction(Action):
     __metaclass__ = ABCMeta
 
@@ -78,6 +285,34 @@ class LogicalRouteAction(Action):
         super(LogicalRouteAction, self).__init__(logger)
         self.logical_route = logical_route
         self.logical_route_operations = logical_route_operations
+        self._transit_resources = None
+
+    @property
+    def transit_resources(self):
+        """
+        Resources the route passes, defined by the route index on the first access, before the route is changed
+        :rtype: set
+        """
+        if self._transit_resources is None:
+            self._transit_resources = set(self.logical_route_operations.route_index.route_resources(
+                self.logical_route))
+        return self._transit_resources
+
+    @transit_resources.setter
+    def transit_resources(self, value):
+        self._transit_resources = set(value)
+
+    @property
+    def dependency_keys(self):
+        path_trie = self.logical_route_operations.path_trie
+        keys = {_reservation_key(self.logical_route.reservation_id),
+                _resource_key(path_trie, self.logical_route.source),
+                _resource_key(path_trie, self.logical_route.target)}
+        keys.update(map(_resource_name_key, self.transit_resources))
+        return keys
+
+    def _identity_unit(self):
+        return '{}|{}'.format(self.logical_route.source, self.logical_route.target)
 
     def __hash__(self):
         return hash(self.logical_route)
@@ -87,6 +322,11 @@ class LogicalRouteAction(Action):
 
 
 class RemoveRouteAction(LogicalRouteAction):
+    batch_class = RemoveRoutesBatch
+
+    @property
+    def batch_key(self):
+        return self.logical_route.reservation_id, self.logical_route.route_type
 
     def execute(self):
         try:
@@ -100,12 +340,14 @@ class RemoveRouteAction(LogicalRouteAction):
 
 
 class CreateRouteAction(LogicalRouteAction):
+    batch_class = CreateRoutesBatch
+
     def __init__(self, logical_route, logical_route_operations, updated_connections, logger):
         super(CreateRouteAction, self).__init__(logical_route, logical_route_operations, logger)
         self._updated_connections = updated_connections
 
     def execute(self):
-        self._refresh_route()
+        self.refresh_route()
         self.logger.debug('Create Logical Route {}'.format(self.logical_route))
         try:
             self.logical_route_operations.create_route(self.logical_route)
@@ -113,7 +355,18 @@ class CreateRouteAction(LogicalRouteAction):
         except Exception as e:
             self.logger.error('Cannot create route {}, reason {}'.format(self.logical_route, ','.join(e.args)))
 
-    def _refresh_route(self):
+    @property
+    def reads_connections(self):
+        return {self.logical_route.source, self.logical_route.target}
+
+    @property
+    def batch_key(self):
+        # The API creates a route for every pair of the sources and targets, routes of the batch share the source,
+        # they are refreshed to the same updated source
+        return (self.logical_route.reservation_id, self.logical_route.route_type, self.logical_route.route_alias,
+                self.logical_route.shared, self.logical_route.active, self.logical_route.source)
+
+    def refresh_route(self):
         self.logical_route.source = self._updated_connections.get(self.logical_route.source, self.logical_route.source)
         self.logical_route.target = self._updated_connections.get(self.logical_route.target, self.logical_route.target)
 
@@ -122,6 +375,8 @@ class CreateRouteAction(LogicalRouteAction):
 
 
 class UpdateConnectionAction(Action):
+    batch_class = UpdateConnectionsBatch
+
     def __init__(self, src_port, dst_port, resource_operations, updated_connections, logger):
         """
         :type src_port: cloudshell.migration.entities.Port
@@ -151,10 +406,37 @@ class UpdateConnectionAction(Action):
     def to_string(self):
         return 'Update Connection: {}=>{}'.format(self.dst_port.name, self.src_port.connected_to)
 
+    @property
+    def dependency_keys(self):
+        path_trie = self.resource_operations.path_trie
+        keys = {_resource_key(path_trie, self.src_port.name), _resource_key(path_trie, self.dst_port.name)}
+        if self.src_port.connected_to:
+            keys.add(_resource_key(path_trie, self.src_port.connected_to))
+        return keys
+
+    @property
+    def reads_connections(self):
+        return {self.src_port.connected_to} if self.src_port.connected_to else set()
+
+    @property
+    def writes_connections(self):
+        return {self.src_port.name}
+
+    @property
+    def batch_key(self):
+        # Actions of the batch share the updated connections of the run, batches of different resources pairs do not
+        # wait for each other
+        path_trie = self.resource_operations.path_trie
+        return (id(self.updated_connections), _resource_key(path_trie, self.src_port.name),
+                _resource_key(path_trie, self.dst_port.name))
+
     @property
     def _comparable_unit(self):
         return ''.join([self.src_port.name, self.src_port.connected_to or ''])
 
+    def _identity_unit(self):
+        return '{}|{}'.format(self.src_port.name, self.src_port.connected_to or '')
+
     def __hash__(self):
         return hash(self._comparable_unit)
 
@@ -175,6 +457,33 @@ class ConnectorAction(Action):
         super(ConnectorAction, self).__init__(logger)
         self.connector = connector
         self.route_connector_operations = route_connector_operations
+        self._transit_resources = None
+
+    @property
+    def transit_resources(self):
+        """
+        Resources passed by the routes of the connector endpoints, defined by the route index on the first access
+        :rtype: set
+        """
+        if self._transit_resources is None:
+            self._transit_resources = set(self.route_connector_operations.route_index.connector_resources(
+                self.connector))
+        return self._transit_resources
+
+    @transit_resources.setter
+    def transit_resources(self, value):
+        self._transit_resources = set(value)
+
+    @property
+    def dependency_keys(self):
+        path_trie = self.route_connector_operations.path_trie
+        keys = {_reservation_key(self.connector.reservation_id), _resource_key(path_trie, self.connector.source),
+                _resource_key(path_trie, self.connector.target)}
+        keys.update(map(_resource_name_key, self.transit_resources))
+        return keys
+
+    def _identity_unit(self):
+        return '{}|{}'.format(self.connector.source, self.connector.target)
 
     def __hash__(self):
         return hash(self.connector)
@@ -204,6 +513,10 @@ class CreateConnectorAction(ConnectorAction):
         super(CreateConnectorAction, self).__init__(connector, route_connector_operations, logger)
         self._updated_connections = updated_connections
 
+    @property
+    def reads_connections(self):
+        return {self.connector.source, self.connector.target}
+
     def execute(self):
         self.connector.source = self._updated_connections.get(self.connector.source, self.connector.source)
         self.connector.target = self._updated_connections.get(self.connector.target, self.connector.target)
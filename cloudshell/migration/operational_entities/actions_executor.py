@@ -0,0 +1,173 @@
+import sys
+from Queue import Queue, Empty
+from collections import deque, defaultdict
+from multiprocessing.pool import ThreadPool
+
+from cloudshell.migration.operational_entities.actions import ActionsBatch
+
+
+class _ActionNode(object):
+    """
+    Dependency graph node, node without action is a barrier joining several nodes
+    """
+
+    def __init__(self, action=None):
+        self.action = action
+        self.dependents = []
+        self.pending = 0
+
+    def add_dependency(self, node):
+        """
+        :type node: _ActionNode
+        """
+        node.dependents.append(self)
+        self.pending += 1
+
+
+class ActionsExecutor(object):
+    POLL_INTERVAL = 1
+
+    def __init__(self, logger, workers=1, journal=None):
+        """
+        :type logger: cloudshell.migration.helpers.log_helper.Logger
+        :param int workers: Max number of actions executed concurrently
+        :param cloudshell.migration.operational_entities.actions_journal.ActionsJournal journal: Journal of the
+            completed actions
+        """
+        self._logger = logger
+        self._workers = workers
+        self._journal = journal
+
+    def execute(self, actions_container):
+        """
+        Execute actions, results are yielded as the actions finished
+        :type actions_container: cloudshell.migration.operational_entities.actions.ActionsContainer
+        :rtype: collections.Iterable
+        """
+        if self._workers <= 1:
+            for phase in actions_container.batched_phases():
+                for action in phase:
+                    for result in self._results(action, action.execute()):
+                        yield result
+        else:
+            for result in self._execute_concurrently(self._build_graph(actions_container.batched_phases())):
+                yield result
+
+    def _build_graph(self, phases):
+        """
+        Action depends on the actions of the previous phases sharing a dependency key with it, and on the preceding
+        actions defining the updated connections it uses
+        :param list phases: Actions by the execution phase
+        :return: Graph nodes
+        :rtype: list
+        """
+        nodes = []
+        # Nodes of the latest phase affecting the key
+        frontier = {}
+        # Barrier nodes for the frontier groups
+        barriers = {}
+        connection_writers = {}
+        for phase in phases:
+            phase_frontier = defaultdict(list)
+            for action in phase:
+                node = _ActionNode(action)
+                dependencies = set()
+                for key in action.dependency_keys:
+                    if key in frontier:
+                        dependencies.add(self._barrier(key, frontier, barriers, nodes))
+                    phase_frontier[key].append(node)
+                for port_name in action.reads_connections:
+                    writer = connection_writers.get(port_name)
+                    if writer:
+                        dependencies.add(writer)
+                for dependency in dependencies:
+                    node.add_dependency(dependency)
+                for port_name in action.writes_connections:
+                    connection_writers[port_name] = node
+                nodes.append(node)
+            for key, key_nodes in phase_frontier.iteritems():
+                frontier[key] = key_nodes
+                barriers.pop(key, None)
+        return nodes
+
+    @staticmethod
+    def _barrier(key, frontier, barriers, nodes):
+        barrier = barriers.get(key)
+        if not barrier:
+            barrier = _ActionNode()
+            for node in frontier[key]:
+                barrier.add_dependency(node)
+            barriers[key] = barrier
+            nodes.append(barrier)
+        return barrier
+
+    def _execute_concurrently(self, nodes):
+        ready = deque(node for node in nodes if not node.pending)
+        completed = Queue()
+        running = 0
+        error = None
+        pool = ThreadPool(self._workers)
+        try:
+            while ready or running:
+                while ready and running < self._workers:
+                    node = ready.popleft()
+                    if node.action is None:
+                        self._complete(node, ready)
+                    else:
+                        pool.apply_async(self._execute_node, (node,), callback=completed.put)
+                        running += 1
+                if not running:
+                    continue
+
+                node, result, exc_info = self._wait(completed)
+                running -= 1
+                if exc_info:
+                    # Running actions are finished, new actions are not started
+                    error = error or exc_info
+                    ready.clear()
+                    continue
+                if not error:
+                    self._complete(node, ready)
+                # Actions finished after the failure are reported and journaled as well
+                for action_result in self._results(node.action, result):
+                    yield action_result
+        finally:
+            pool.close()
+            pool.join()
+        if error:
+            raise error[0], error[1], error[2]
+
+    def _results(self, action, result):
+        """
+        Batch returns result of every action, action without result failed
+        """
+        if isinstance(action, ActionsBatch):
+            actions_results = zip(action.actions, result)
+        else:
+            actions_results = [(action, result)]
+        for action, result in actions_results:
+            if self._journal and result is not None:
+                self._journal.completed(action)
+            yield result
+
+    def _wait(self, completed):
+        while True:
+            try:
+                return completed.get(timeout=self.POLL_INTERVAL)
+            except Empty:
+                continue
+
+    def _execute_node(self, node):
+        try:
+            return node, node.action.execute(), None
+        except BaseException:
+            # Worker thread does not survive the exception, it is re-raised in the main thread
+            self._logger.error('Action {} failed'.format(node.action))
+            return node, None, sys.exc_info()
+
+    @staticmethod
+    def _complete(node, ready):
+        for dependent in node.dependents:
+            dependent.pending -= 1
+            if not dependent.pending:
+                ready.append(dependent)
@@ -0,0 +1,187 @@
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+
+from cloudshell.migration.entities import LogicalRoute, Port, Connector
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.backup_codecs import entity_record, build_entity
+from cloudshell.migration.operational_entities.actions import ActionsContainer, RemoveRouteAction, \
+    CreateRouteAction, UpdateConnectionAction, RemoveConnectorAction, CreateConnectorAction, LogicalRouteAction, \
+    ConnectorAction
+
+
+class ActionsJournal(object):
+    """
+    Append-only journal of the planned and completed actions, every record is a JSON line synced to the disk
+    """
+    PLANNED = 'planned'
+    COMPLETED = 'completed'
+
+    def __init__(self, journal_path):
+        """
+        :param str journal_path: Journal file, records are appended to the existing journal
+        """
+        self.journal_path = journal_path
+        dir_path = os.path.dirname(os.path.abspath(journal_path))
+        if not os.path.exists(dir_path):
+            os.makedirs(dir_path)
+        self._journal_file = open(journal_path, 'a')
+        self._lock = Lock()
+
+    @staticmethod
+    def new_journal_path(config_operations):
+        """
+        New journal file in the backup location
+        :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+        :rtype: str
+        """
+        backup_path = config_operations.read_key_or_default(config_operations.KEY.BACKUP_LOCATION)
+        if not backup_path:
+            raise MigrationToolException('Backup location was not specified')
+        filename = datetime.now().strftime('%Y-%m-%d_%H-%M-%S') + '.journal'
+        return os.path.join(backup_path, filename)
+
+    def _write(self, records):
+        with self._lock:
+            for record in records:
+                self._journal_file.write(json.dumps(record, sort_keys=True) + '\n')
+            self._journal_file.flush()
+            os.fsync(self._journal_file.fileno())
+
+    def planned(self, actions):
+        """
+        :param collections.Iterable actions: Actions planned for the execution
+        """
+        self._write([dict(action_record(action), event=self.PLANNED) for action in actions])
+
+    def completed(self, action):
+        """
+        :type action: cloudshell.migration.operational_entities.actions.Action
+        """
+        self.completed_identities([action.identity])
+
+    def completed_identities(self, identities):
+        """
+        :param list identities: Identities of the completed actions
+        """
+        if identities:
+            self._write([{'event': self.COMPLETED, 'identity': identity} for identity in identities])
+
+    def close(self):
+        with self._lock:
+            self._journal_file.close()
+
+    @classmethod
+    def resume(cls, journal_path, resource_operations, route_connector_operations, logger):
+        """
+        Actions planned but not completed in the planned order, updated connections of the completed actions are
+        restored
+        :param str journal_path: Journal of the interrupted run
+        :type resource_operations: cloudshell.migration.operations.resource_operations.ResourceOperations
+        :type route_connector_operations: cloudshell.migration.operations.route_connector_operations.RouteConnectorOperations
+        :type logger: cloudshell.migration.helpers.log_helper.Logger
+        :rtype: ActionsContainer
+        """
+        planned = OrderedDict()
+        completed = set()
+        with open(journal_path) as journal_file:
+            for line_number, line in enumerate(journal_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last record can be incomplete if the run was killed while writing it
+                    logger.warning('Journal {} line {} is corrupted, skipped'.format(journal_path, line_number))
+                    continue
+                if record['event'] == cls.PLANNED:
+                    planned.setdefault(record['identity'], record)
+                else:
+                    completed.add(record['identity'])
+        if not planned:
+            raise MigrationToolException('Journal {} has no planned actions'.format(journal_path))
+
+        updated_connections = {}
+        records = []
+        for identity, record in planned.iteritems():
+            if identity not in completed:
+                records.append(record)
+            elif record['action'] == UpdateConnectionAction.__name__:
+                updated_connections[record['src_port']['name']] = record['dst_port']['name']
+        return build_actions_container(records, resource_operations, route_connector_operations, logger,
+                                       updated_connections)
+
+
+_CONTAINER_ATTRIBUTES = {RemoveRouteAction.__name__: 'remove_routes',
+                         CreateRouteAction.__name__: 'create_routes',
+                         UpdateConnectionAction.__name__: 'update_connections',
+                         RemoveConnectorAction.__name__: 'remove_connectors',
+                         CreateConnectorAction.__name__: 'create_connectors'}
+
+
+def action_record(action):
+    """
+    Action with its entities as a dictionary of the primitive types
+    :type action: cloudshell.migration.operational_entities.actions.Action
+    :rtype: dict
+    """
+    state = {'action': action.__class__.__name__, 'identity': action.identity}
+    if isinstance(action, LogicalRouteAction):
+        state['logical_route'] = entity_record(action.logical_route)
+        state['transit_resources'] = sorted(action.transit_resources)
+    elif isinstance(action, UpdateConnectionAction):
+        state['src_port'] = entity_record(action.src_port)
+        state['dst_port'] = entity_record(action.dst_port)
+    elif isinstance(action, ConnectorAction):
+        state['connector'] = entity_record(action.connector)
+        state['transit_resources'] = sorted(action.transit_resources)
+    else:
+        raise MigrationToolException('Action {} cannot be journaled'.format(action))
+    return state
+
+
+def build_actions_container(records, resource_operations, route_connector_operations, logger,
+                            updated_connections=None):
+    """
+    Actions built from the records keep their identities and the resources their routes pass
+    :param list records: Action records
+    :type resource_operations: cloudshell.migration.operations.resource_operations.ResourceOperations
+    :type route_connector_operations: cloudshell.migration.operations.route_connector_operations.RouteConnectorOperations
+    :type logger: cloudshell.migration.helpers.log_helper.Logger
+    :param dict updated_connections: Connections updated before
+    :rtype: ActionsContainer
+    """
+    if updated_connections is None:
+        updated_connections = {}
+    actions_container = ActionsContainer()
+    for record in records:
+        action = _build_action(record, resource_operations, route_connector_operations, updated_connections, logger)
+        action.identity = record['identity']
+        # Removed routes are not in the reservations anymore, the resources they passed are taken from the record
+        if 'transit_resources' in record:
+            action.transit_resources = record['transit_resources']
+        getattr(actions_container, _CONTAINER_ATTRIBUTES[record['action']]).append(action)
+    return actions_container
+
+
+def _build_action(record, resource_operations, route_connector_operations, updated_connections, logger):
+    action_name = record['action']
+    if action_name == RemoveRouteAction.__name__:
+        logical_route = build_entity(LogicalRoute, record['logical_route'])
+        return RemoveRouteAction(logical_route, route_connector_operations, logger)
+    if action_name == CreateRouteAction.__name__:
+        logical_route = build_entity(LogicalRoute, record['logical_route'])
+        return CreateRouteAction(logical_route, route_connector_operations, updated_connections, logger)
+    if action_name == UpdateConnectionAction.__name__:
+        src_port = build_entity(Port, record['src_port'])
+        dst_port = build_entity(Port, record['dst_port'])
+        return UpdateConnectionAction(src_port, dst_port, resource_operations, updated_connections, logger)
+    if action_name == RemoveConnectorAction.__name__:
+        connector = build_entity(Connector, record['connector'])
+        return RemoveConnectorAction(connector, route_connector_operations, logger)
+    if action_name == CreateConnectorAction.__name__:
+        connector = build_entity(Connector, record['connector'])
+        return CreateConnectorAction(connector, route_connector_operations, updated_connections, logger)
+    raise MigrationToolException('Unknown journal action {}'.format(action_name))
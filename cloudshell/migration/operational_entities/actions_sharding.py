@@ -0,0 +1,177 @@
+import cPickle as pickle
+from multiprocessing import Pool
+
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.session_helper import create_api_session, create_logger
+from cloudshell.migration.operational_entities.actions import ActionsContainer
+from cloudshell.migration.operational_entities.actions_executor import ActionsExecutor
+from cloudshell.migration.operational_entities.actions_journal import action_record, build_actions_container
+from cloudshell.migration.operations.resource_operations import ResourceOperations
+from cloudshell.migration.operations.route_connector_operations import RouteConnectorOperations
+
+
+class _DisjointSets(object):
+    """
+    Union-find over hashable keys
+    """
+
+    def __init__(self):
+        self._parents = {}
+
+    def find(self, key):
+        root = self._parents.setdefault(key, key)
+        while self._parents[root] != root:
+            root = self._parents[root]
+        # Path compression
+        while key != root:
+            parent = self._parents[key]
+            self._parents[key] = root
+            key = parent
+        return root
+
+    def union(self, key, other_key):
+        root = self.find(key)
+        other_root = self.find(other_key)
+        if root != other_root:
+            self._parents[other_root] = root
+
+
+def split_components(actions_container):
+    """
+    Split actions into independent components, actions of different components do not share resources or
+    reservations
+    :type actions_container: ActionsContainer
+    :rtype: list
+    """
+    disjoint_sets = _DisjointSets()
+    phases = actions_container.phases()
+    for phase in phases:
+        for action in phase:
+            keys = list(action.dependency_keys)
+            # Action without keys is a component of its own
+            first_key = keys[0] if keys else ('action', action.identity)
+            for key in keys:
+                disjoint_sets.union(first_key, key)
+
+    components = {}
+    for phase_index, phase in enumerate(phases):
+        for action in phase:
+            keys = list(action.dependency_keys)
+            root = disjoint_sets.find(keys[0] if keys else ('action', action.identity))
+            component = components.setdefault(root, [[] for _ in phases])
+            component[phase_index].append(action)
+    return [ActionsContainer(remove_routes=component[0], remove_connectors=component[1],
+                             update_connections=component[2], create_routes=component[3],
+                             create_connectors=component[4]) for component in components.itervalues()]
+
+
+class _CompletedActions(object):
+    """
+    Collects identities of the completed actions in the worker process
+    """
+
+    def __init__(self):
+        self.identities = []
+
+    def completed(self, action):
+        self.identities.append(action.identity)
+
+
+def _execute_component(arguments):
+    """
+    Executed in the worker process with its own API session, identities of the actions completed before a failure
+    are returned with the error
+    :param tuple arguments: Config operations, dry run, execution workers and action records
+    :return: Action results, identities of the completed actions and the error of the failed action or None
+    :rtype: tuple
+    """
+    config_operations, dry_run, workers, records = arguments
+    api = create_api_session(config_operations)
+    logger = create_logger(config_operations)
+    resource_operations = ResourceOperations(api, logger, config_operations, dry_run)
+    route_connector_operations = RouteConnectorOperations(api, logger, config_operations, dry_run,
+                                                          resource_operations.path_trie)
+    completed_actions = _CompletedActions()
+    results = []
+    error = None
+    try:
+        actions_container = build_actions_container(records, resource_operations, route_connector_operations, logger)
+        for result in ActionsExecutor(logger, workers, completed_actions).execute(actions_container):
+            results.append(result)
+    except Exception as e:
+        logger.exception('Component failed')
+        error = _picklable_error(e)
+    finally:
+        resource_operations.close()
+        route_connector_operations.close()
+    return results, completed_actions.identities, error
+
+
+def _picklable_error(error):
+    """
+    Error is passed to the parent process, errors which cannot be pickled are replaced with MigrationToolException
+    :type error: Exception
+    :rtype: Exception
+    """
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return MigrationToolException('{}: {}'.format(type(error).__name__, error))
+
+
+class ShardedActionsExecutor(object):
+    """
+    Independent components of the actions are executed in the pool of worker processes, each process uses its own
+    API session
+    """
+
+    def __init__(self, logger, config_operations, processes, workers, dry_run=False, journal=None):
+        """
+        :type logger: cloudshell.migration.helpers.log_helper.Logger
+        :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+        :param int processes: Max number of worker processes, 1 executes the actions in the current process
+        :param int workers: Max number of actions executed concurrently by a process
+        :param bool dry_run: Dry run
+        :param cloudshell.migration.operational_entities.actions_journal.ActionsJournal journal: Journal of the
+            completed actions
+        """
+        self._logger = logger
+        self._config_operations = config_operations
+        self._processes = processes
+        self._workers = workers
+        self._dry_run = dry_run
+        self._journal = journal
+
+    def execute(self, actions_container):
+        """
+        Execute actions, results of the component are yielded when the component finished. Failed component does
+        not stop the others, the error is raised when all components finished
+        :type actions_container: ActionsContainer
+        :rtype: collections.Iterable
+        """
+        components = split_components(actions_container) if self._processes > 1 else []
+        if len(components) <= 1:
+            for result in ActionsExecutor(self._logger, self._workers, self._journal).execute(actions_container):
+                yield result
+            return
+
+        self._logger.info('Executing {} independent components in {} processes'.format(
+            len(components), min(self._processes, len(components))))
+        arguments = [(self._config_operations, self._dry_run, self._workers,
+                      map(action_record, component.sequence())) for component in components]
+        pool = Pool(min(self._processes, len(components)))
+        error = None
+        try:
+            # Components running when another one failed are finished and journaled, the first error is raised
+            for results, identities, component_error in pool.imap_unordered(_execute_component, arguments):
+                if self._journal:
+                    self._journal.completed_identities(identities)
+                error = error or component_error
+                for result in results:
+                    yield result
+        finally:
+            pool.close()
+            pool.join()
+        if error:
+            raise error
@@ -14,6 +14,7 @@ class ConfigOperations(object):
     CONFIG_PATH = os.path.join(click.get_app_dir('Quali'), PACKAGE_NAME, 'cloudshell_config.yml')
     BACKUP_LOCATION = os.path.join(click.get_app_dir('Quali'), PACKAGE_NAME, 'Backup')
     LOG_PATH = os.path.join(click.get_app_dir('Quali'), PACKAGE_NAME, 'Log')
+    CACHE_LOCATION = os.path.join(click.get_app_dir('Quali'), PACKAGE_NAME, 'Cache')
     PORT_FAMILIES = ['L1 Switch Port', 'Port', 'CS_Port']
     L1_FAMILIES = ['L1 Switch']
 
@@ -28,6 +29,15 @@ class ConfigOperations(object):
         LOG_PATH = 'log_path'
         NEW_RESOURCE_NAME_PREFIX = 'name_prefix'
         BACKUP_LOCATION = 'backup_location'
+        # Performance
+        API_WORKERS = 'api_workers'
+        CACHE_LOCATION = 'cache_location'
+        CACHE_TTL = 'cache_ttl'
+        EXECUTION_WORKERS = 'execution_workers'
+        AUTOLOAD_WORKERS = 'autoload_workers'
+        EXECUTION_PROCESSES = 'execution_processes'
+        BACKUP_FORMAT = 'backup_format'
+        BACKUP_COMPRESSION = 'backup_compression'
         # Associations
         PATTERN = 'pattern'
         ASSOCIATE_BY_ADDRESS = 'by_address'
@@ -73,6 +83,14 @@ class ConfigOperations(object):
         KEY.LOG_LEVEL: 'DEBUG',
         KEY.NEW_RESOURCE_NAME_PREFIX: 'new_',
         KEY.BACKUP_LOCATION: BACKUP_LOCATION,
+        KEY.API_WORKERS: 10,
+        KEY.CACHE_LOCATION: CACHE_LOCATION,
+        KEY.CACHE_TTL: 600,
+        KEY.EXECUTION_WORKERS: 4,
+        KEY.AUTOLOAD_WORKERS: 5,
+        KEY.EXECUTION_PROCESSES: 1,
+        KEY.BACKUP_FORMAT: 'yaml',
+        KEY.BACKUP_COMPRESSION: 'none',
         # ASSOCIATIONS_TABLE_KEY: ASSOCIATIONS_TABLE,
     }
 
@@ -173,6 +191,9 @@ class ConfigOperations(object):
     def read_key_or_default(self, key):
         return self.read_key(key, self.DEFAULT_CONFIGURATION.get(key))
 
+    def read_int_key_or_default(self, key):
+        return int(self.read_key_or_default(key))
+
 
 class PasswordModification(object):
 
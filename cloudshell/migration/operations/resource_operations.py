@@ -2,7 +2,10 @@ from collections import defaultdict
 
 from backports.functools_lru_cache import lru_cache
 
+from cloudshell.api.cloudshell_api import PhysicalConnectionUpdateRequest
 from cloudshell.migration.entities import Resource, Port
+from cloudshell.migration.helpers.async_api import AsyncApiClient
+from cloudshell.migration.helpers.path_trie import PathTrie
 
 
 class ResourceOperations(object):
@@ -19,6 +22,10 @@ class ResourceOperations(object):
         self._dry_run = dry_run
 
         self.__resource_details = {}
+        # Loaded resources and ports
+        self.path_trie = PathTrie()
+        self._async_api = AsyncApiClient(api, config_operations.read_int_key_or_default(
+            config_operations.KEY.API_WORKERS))
 
     def _get_resource_details(self, resource):
         """
@@ -30,6 +37,29 @@ class ResourceOperations(object):
             self.__resource_details[resource.name] = details
         return details
 
+    def release_resource(self, resource):
+        """
+        Cached details and the loaded ports, attributes, routes and connectors of the resource are dropped, they are
+        requested again if the resource is loaded later
+        :type resource: cloudshell.migration.entities.Resource
+        """
+        self.__resource_details.pop(resource.name, None)
+        self.path_trie.discard(resource.name)
+        resource.ports = []
+        resource.attributes = {}
+        resource.associated_logical_routes = []
+        resource.associated_connectors = []
+
+    def load_resources_details(self, resources):
+        """
+        Details of the resources are requested at once and cached
+        :param list resources: Resources
+        """
+        resources = [resource for resource in resources if resource.name not in self.__resource_details]
+        async_results = [self._async_api.GetResourceDetails(resource.name) for resource in resources]
+        for resource, async_result in zip(resources, async_results):
+            self.__resource_details[resource.name] = async_result.get()
+
     @property
     @lru_cache()
     def installed_resources(self):
@@ -41,6 +71,7 @@ class ResourceOperations(object):
             resource = Resource(resource_info.Name, resource_info.Address, resource_info.ResourceFamilyName,
                                 resource_info.ResourceModelName, exist=True)
             installed_resources[resource.name] = resource
+            self.path_trie.add(resource.name)
         return installed_resources
 
     @property
@@ -99,6 +130,7 @@ class ResourceOperations(object):
         self._logger.debug('Getting ports for resource {}'.format(resource.name))
         resource_details = self._get_resource_details(resource)
         resource.ports = self._get_ports(resource_details)
+        self.path_trie.add(resource.name)
         return resource
 
     def _get_ports(self, resource_info):
@@ -134,6 +166,7 @@ class ResourceOperations(object):
             connected_to = None
             connection_weight = None
         port = Port(resource_info.Name, resource_info.FullAddress, connected_to, connection_weight)
+        self.path_trie.add(port.name)
         self._logger.debug(port.to_string())
         return port
 
@@ -171,7 +204,7 @@ class ResourceOperations(object):
         self._api.AutoLoad(resource.name)
         # self.is_loaded = True
         self._api.IncludeResource(resource.name)
-        del self.__resource_details[resource.name]
+        self.__resource_details.pop(resource.name, None)
         return resource
 
     def sync_from_device(self, resource):
@@ -195,6 +228,32 @@ class ResourceOperations(object):
             if port.connected_to and port.connection_weight:
                 self._api.UpdateConnectionWeight(port.name, port.connected_to, port.connection_weight)
 
+    def update_connections(self, ports):
+        """
+        Update connections of the ports with one call, the same connection defined from both sides is sent once
+        :param list ports: Ports with the new connections
+        """
+        self._logger.info('---- Updating {} Connections'.format(len(ports)))
+        requests = []
+        handled_connections = set()
+        for port in ports:
+            if port.connected_to:
+                connection = frozenset([port.name, port.connected_to])
+                if connection in handled_connections:
+                    continue
+                handled_connections.add(connection)
+            self._logger.debug('---- Updating Connection {}=>{}'.format(port.name, port.connected_to))
+            requests.append(PhysicalConnectionUpdateRequest(port.name, port.connected_to or '',
+                                                            port.connection_weight or ''))
+        if not self._dry_run:
+            self._api.UpdatePhysicalConnections(requests, True)
+
+    def close(self):
+        """
+        Stop the API worker threads
+        """
+        self._async_api.close()
+
     # @staticmethod
     # def define_port_connections(*resources):
     #     ports = []
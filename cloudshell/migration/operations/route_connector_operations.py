@@ -1,24 +1,33 @@
 from collections import defaultdict
+from itertools import izip
 
 from backports.functools_lru_cache import lru_cache
 
 from cloudshell.api.cloudshell_api import SetConnectorRequest
-from cloudshell.migration.entities import LogicalRoute, Connector
+from cloudshell.migration.entities import Connector
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.async_api import AsyncApiClient
+from cloudshell.migration.helpers.path_trie import PathTrie
+from cloudshell.migration.helpers.route_index import RouteIndex
 
 
 class RouteConnectorOperations(object):
-    def __init__(self, api, logger, dry_run=False):
+    def __init__(self, api, logger, config_operations, dry_run=False, path_trie=None):
         """
         :type api: cloudshell.api.cloudshell_api.CloudShellAPISession
         :type logger: cloudshell.migration.helpers.log_helper.Logger
+        :type config_operations: cloudshell.migration.operations.config_operations.ConfigOperations
+        :param PathTrie path_trie: Loaded resources and ports, shared with the resource operations
         """
         self._api = api
         self._logger = logger
+        self._config_operations = config_operations
         self._dry_run = dry_run
-        # self._logical_routes = {}
-        self._logical_routes_by_resource_name = defaultdict(set)
-        self._logical_routes_by_segment = {}
-        self._handled_logical_routes = []
+        self.path_trie = path_trie if path_trie is not None else PathTrie()
+        self._route_index = RouteIndex(self.path_trie)
+        self._connectors_by_resource_name = defaultdict(list)
+        self._async_api = AsyncApiClient(api, config_operations.read_int_key_or_default(
+            config_operations.KEY.API_WORKERS))
 
     @property
     @lru_cache()
@@ -26,90 +35,44 @@ class RouteConnectorOperations(object):
         return self._api.GetCurrentReservations().Reservations
 
     @lru_cache()
-    def _reservation_details(self, reservation_id):
-        return self._api.GetReservationDetails(reservation_id).ReservationDescription
-
-    # @property
-    # def logical_routes_by_resource_name(self):
-    #     if not self._logical_routes_by_resource_name:
-    #         active_routes = []
-    #         for reservation in self._api.GetCurrentReservations().Reservations:
-    #             if reservation.Id:
-    #                 details = self._api.GetReservationDetails(reservation.Id).ReservationDescription
-    #                 for route_info in details.ActiveRoutesInfo:
-    #                     self._define_logical_route_by_resource_name(reservation.Id, route_info, True)
-    #                     active_routes.append((route_info.Source, route_info.Target))
-    #                 for route_info in details.RequestedRoutesInfo:
-    #                     if (route_info.Source, route_info.Target) not in active_routes:
-    #                         self._define_logical_route_by_resource_name(reservation.Id, route_info, False)
-    #     return self._logical_routes_by_resource_name
+    def _scan_reservations(self):
+        """
+        Details of all current reservations are requested at once, logical routes and connectors indexes are filled
+        in the reservations order as the details arrive
+        """
+        reservation_ids = [reservation.Id for reservation in self._reservations if reservation.Id]
+        self._logger.debug('Scanning {} reservations'.format(len(reservation_ids)))
+        async_results = [self._async_api.GetReservationDetails(reservation_id) for reservation_id in reservation_ids]
+        for reservation_id, async_result in izip(reservation_ids, async_results):
+            details = async_result.get().ReservationDescription
+            self._route_index.add_reservation(reservation_id, details)
+            self._define_connectors(reservation_id, details)
+
+    @property
+    def route_index(self):
+        """
+        :rtype: RouteIndex
+        """
+        self._scan_reservations()
+        return self._route_index
 
     @property
-    @lru_cache()
     def logical_routes_by_segment(self):
-        if not self._logical_routes_by_segment:
-            active_routes = []
-            for reservation in self._reservations:
-                if reservation.Id:
-                    details = self._reservation_details(reservation.Id)
-                    for route_info in details.ActiveRoutesInfo:
-                        self._define_logical_route_by_segment(reservation.Id, route_info, True)
-                        active_routes.append((route_info.Source, route_info.Target))
-                    for route_info in details.RequestedRoutesInfo:
-                        if (route_info.Source, route_info.Target) not in active_routes:
-                            self._define_logical_route_by_segment(reservation.Id, route_info, False)
-        return self._logical_routes_by_segment
-
-    # def _define_logical_route_by_resource_name(self, reservation_id, route_info, active=True):
-    #     source = route_info.Source
-    #     target = route_info.Target
-    #     route_type = route_info.RouteType
-    #     route_alias = route_info.Alias
-    #     shared = route_info.Shared
-    #     logical_route = LogicalRoute(source, target, reservation_id, route_type, route_alias, active, shared)
-    #     for segment in route_info.Segments:
-    #         self._logical_routes_by_resource_name[segment.Source.split('/')[0]].add(logical_route)
-    #         self._logical_routes_by_resource_name[segment.Target.split('/')[0]].add(logical_route)
-
-    def _define_logical_route_by_segment(self, reservation_id, route_info, active=True):
-        source = route_info.Source
-        target = route_info.Target
-        route_type = route_info.RouteType
-        route_alias = route_info.Alias
-        shared = route_info.Shared
-        if source and target:
-            logical_route = LogicalRoute(source, target, reservation_id, route_type, route_alias, active, shared)
-            if route_info.Segments and logical_route not in self._handled_logical_routes:
-                self._handled_logical_routes.append(logical_route)
-                self._add_segment(logical_route, route_info.Segments[0], True)
-                self._add_segment(logical_route, route_info.Segments[-1], True)
-
-                for segment in route_info.Segments[1:-1]:
-                    self._add_segment(logical_route, segment, False)
-
-    def _add_segment(self, logical_route, segment, endpoint):
-        if not self._logical_routes_by_segment.get(segment.Source):
-            self._logical_routes_by_segment[segment.Source] = (logical_route, endpoint)
-        if not self._logical_routes_by_segment.get(segment.Target):
-            self._logical_routes_by_segment[segment.Target] = (logical_route, endpoint)
-
-        # for segment in route_info.Segments:
-        #     self._logical_routes_by_resource_name[segment.Source.split('/')[0]].add(logical_route)
-        #     self._logical_routes_by_resource_name[segment.Target.split('/')[0]].add(logical_route)
+        return self.route_index.segments
 
     def get_logical_routes_table(self, resource):
         """
         :type resource: cloudshell.migration.entities.Resource
         """
+        route_index = self.route_index
         logical_routes_table = []
+        handled = set()
         for port in resource.ports:
             if port.connected_to:
-                logical_route = self.logical_routes_by_segment.get(port.name)
-                if logical_route and logical_route not in logical_routes_table:
+                logical_route = route_index.by_segment(port.name)
+                if logical_route and logical_route not in handled:
+                    handled.add(logical_route)
                     logical_routes_table.append(logical_route)
-            # port.associated_logical_route = logical_route
-            # if logical_route and logical_route not in resource.associated_logical_routes:
-            #     resource.associated_logical_routes.append(logical_route)
         return logical_routes_table
 
     def define_endpoint_logical_routes(self, resource):
@@ -125,7 +88,11 @@ class RouteConnectorOperations(object):
         :type resource: cloudshell.migration.entities.Resource
         """
         logical_routes_table = self.get_logical_routes_table(resource)
-        resource.associated_logical_routes = list(set([route for route, endpoint in logical_routes_table]))
+        logical_routes = []
+        for route, endpoint in logical_routes_table:
+            if route not in logical_routes:
+                logical_routes.append(route)
+        resource.associated_logical_routes = logical_routes
         return resource
 
     def remove_route(self, logical_route):
@@ -155,27 +122,59 @@ class RouteConnectorOperations(object):
                                                  logical_route.route_type, 2, logical_route.route_alias,
                                                  logical_route.shared)
 
+    def remove_routes(self, logical_routes):
+        """
+        Remove routes of the same reservation and route type with one call
+        :param list logical_routes: Logical routes sharing reservation and route type
+        """
+        self._logger.debug('Removing logical routes {}'.format(', '.join(map(str, logical_routes))))
+        if not self._dry_run:
+            logical_route = logical_routes[0]
+            endpoints = []
+            for route in logical_routes:
+                endpoints.extend([route.source, route.target])
+            self._api.RemoveRoutesFromReservation(logical_route.reservation_id, endpoints, logical_route.route_type)
+
+    def create_routes(self, logical_routes):
+        """
+        Create routes of the same source, reservation, route type, alias, shared and active state with one call, the
+        API creates a route for every pair of the sources and targets
+        :param list logical_routes: Logical routes sharing the source, reservation and route attributes
+        """
+        self._logger.debug('Creating logical routes {}'.format(', '.join(map(str, logical_routes))))
+        sources = list({route.source for route in logical_routes})
+        if len(sources) > 1:
+            raise MigrationToolException('Routes created with one call have to share the source, sources {}'.format(
+                ', '.join(sources)))
+        if not self._dry_run:
+            logical_route = logical_routes[0]
+            targets = [route.target for route in logical_routes]
+            if logical_route.active:
+                self._api.CreateRoutesInReservation(logical_route.reservation_id, sources, targets, False,
+                                                    logical_route.route_type, 2, logical_route.route_alias,
+                                                    logical_route.shared)
+            else:
+                self._api.AddRoutesToReservation(logical_route.reservation_id, sources, targets,
+                                                 logical_route.route_type, 2, logical_route.route_alias,
+                                                 logical_route.shared)
+
     def load_connectors(self, resource):
         """
         :type resource: cloudshell.migration.entities.Resource
         """
+        self._scan_reservations()
         resource.associated_connectors = self._connectors_by_resource_name.get(resource.name, [])
         return resource
 
-    @property
-    @lru_cache()
-    def _connectors_by_resource_name(self):
-        connector_by_resource_name = defaultdict(list)
-        for reservation in self._reservations:
-            if reservation.Id:
-                details = self._reservation_details(reservation.Id)
-                for connector in details.Connectors:
-                    if connector.Source and connector.Target:
-                        connector_ent = Connector(connector.Source, connector.Target, reservation.Id,
-                                                  connector.Direction, connector.Type, connector.Alias)
-                        connector_by_resource_name[connector.Source.split('/')[0]].append(connector_ent)
-                        connector_by_resource_name[connector.Target.split('/')[0]].append(connector_ent)
-        return connector_by_resource_name
+    def _define_connectors(self, reservation_id, details):
+        for connector in details.Connectors:
+            if connector.Source and connector.Target:
+                connector_ent = Connector(connector.Source, connector.Target, reservation_id,
+                                          connector.Direction, connector.Type, connector.Alias)
+                self.path_trie.add(connector.Source)
+                self.path_trie.add(connector.Target)
+                self._connectors_by_resource_name[self.path_trie.resource(connector.Source)].append(connector_ent)
+                self._connectors_by_resource_name[self.path_trie.resource(connector.Target)].append(connector_ent)
 
     def update_connector(self, connector):
         """
@@ -193,3 +192,9 @@ class RouteConnectorOperations(object):
         """
         self._logger.debug('Removing connector {}'.format(connector))
         self._api.RemoveConnectorsFromReservation(connector.reservation_id, [connector.source, connector.target])
+
+    def close(self):
+        """
+        Stop the API worker threads
+        """
+        self._async_api.close()
@@ -17,13 +17,14 @@ setup(
     author='QualiSystems',
     author_email='info@qualisystems.com',
     url='https://github.com/QualiSystems/cloudshell-migration',
-    packages=find_packages(exclude=["*.tests", "*.tests.*", "tests.*", "tests"]),
+    packages=find_packages(exclude=["*.tests", "*.tests.*", "tests.*", "tests", "benchmarks.*", "benchmarks"]),
     package_data={'migration': ['data/*.yml', 'data/*.json']},
     entry_points={
         "console_scripts": ['migration_tool = cloudshell.migration.bootstrap:cli']
     },
     include_package_data=True,
     install_requires=get_file_content('requirements.txt'),
+    extras_require={'xz': ['backports.lzma']},
     license="Apache Software License 2.0",
     zip_safe=False,
     keywords='migration cloudshell quali command-line cli',
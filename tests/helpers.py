@@ -0,0 +1,109 @@
+import time
+from threading import Lock
+
+from mock import Mock
+
+from benchmarks.fake_api import Info
+from cloudshell.migration.entities import LogicalRoute, Port, Connector, Resource
+from cloudshell.migration.helpers.backup_codecs import BackupAttribute
+from cloudshell.migration.helpers.path_trie import PathTrie
+from cloudshell.migration.helpers.route_index import RouteIndex
+
+RESERVATION_ID = 'reservation-1'
+# Route A/P1 <-> B/P1 passes the trunk S1/P2 <-> S2/P1 between the switches S1 and S2
+TRANSIT_ROUTE_SEGMENTS = [('A/P1', 'S1/P1'), ('S1/P1', 'S1/P2'), ('S1/P2', 'S2/P1'), ('S2/P1', 'S2/P2'),
+                          ('S2/P2', 'B/P1')]
+
+
+def transit_route_index(path_trie=None):
+    """
+    :type path_trie: PathTrie
+    :return: Route index with the route A/P1 <-> B/P1 passing S1 and S2
+    :rtype: RouteIndex
+    """
+    route_index = RouteIndex(path_trie)
+    segments = [Info(Source=source, Target=target) for source, target in TRANSIT_ROUTE_SEGMENTS]
+    route_info = Info(Source='A/P1', Target='B/P1', RouteType='bi', Alias='Route', Shared=False, Segments=segments)
+    route_index.add_reservation(RESERVATION_ID, Info(ActiveRoutesInfo=[route_info], RequestedRoutesInfo=[]))
+    return route_index
+
+
+def transit_route():
+    return LogicalRoute('A/P1', 'B/P1', RESERVATION_ID, 'bi', 'Route')
+
+
+def transit_connector():
+    return Connector('A/P1', 'B/P1', RESERVATION_ID, 'bi', 'Connector', 'Connector')
+
+
+def trunk_ports():
+    """
+    :return: Trunk port of S2 and the associated port of its replacement N2
+    :rtype: tuple
+    """
+    return Port('S2/P1', 'S2/1', 'S1/P2'), Port('N2/P1', 'N2/1')
+
+
+def backup_resource(name, ports=2):
+    """
+    :param str name: Resource name
+    :param int ports: Number of ports, the first one is connected and has a route and a connector
+    :return: Resource with all the entities kept by the backups
+    :rtype: Resource
+    """
+    resource = Resource(name, '10.0.0.1', 'L1 Switch', 'Old Model', 'Old Driver', True)
+    resource.ports = [Port(name + '/M1/P{}'.format(index), '10.0.0.1/1/{}'.format(index)) for index in
+                      xrange(1, ports + 1)]
+    peer = name + ' Peer/M1/P1'
+    resource.ports[0].connected_to = peer
+    resource.ports[0].connection_weight = '10'
+    resource.associated_logical_routes = [LogicalRoute(resource.ports[0].name, peer, RESERVATION_ID, 'bi', 'Route',
+                                                       False, True)]
+    resource.associated_connectors = [Connector(resource.ports[0].name, peer, RESERVATION_ID, 'bi', 'Connector',
+                                                'Alias')]
+    resource.attributes = {'Serial Number': BackupAttribute('Serial Number', 'SN-1', 'String')}
+    return resource
+
+
+class RecordingOperations(object):
+    """
+    Resource and route connector operations recording when every call started and ended
+    """
+    DELAY = 0.05
+
+    def __init__(self, route_index=None):
+        self.route_index = route_index
+        self.path_trie = PathTrie()
+        self.events = []
+        self.updated_ports = []
+        self._lock = Lock()
+
+    def _run(self, name):
+        with self._lock:
+            self.events.append(('start', name))
+        time.sleep(self.DELAY)
+        with self._lock:
+            self.events.append(('end', name))
+
+    def position(self, event, name):
+        return self.events.index((event, name))
+
+    def remove_route(self, logical_route):
+        self._run('remove_route {}'.format(logical_route.source))
+
+    def create_route(self, logical_route):
+        self._run('create_route {}'.format(logical_route.source))
+
+    def update_connection(self, port):
+        self.updated_ports.append((port.name, port.connected_to))
+        self._run('update_connection {}'.format(port.name))
+
+    def remove_connector(self, connector):
+        self._run('remove_connector {}'.format(connector.source))
+
+    def update_connector(self, connector):
+        self._run('update_connector {}'.format(connector.source))
+
+
+def logger():
+    return Mock()
@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from mock import Mock
+
+from cloudshell.migration.entities import Port
+from cloudshell.migration.helpers.path_trie import PathTrie
+from cloudshell.migration.operational_entities.actions import ActionsContainer, UpdateConnectionAction, \
+    UpdateConnectionsBatch
+
+
+class TestUpdateConnectionsBatches(TestCase):
+    def setUp(self):
+        self.updated_connections = {}
+
+    def _action(self, src_resource, dst_resource, port_index, updated_connections=None):
+        src_port = Port('{}/P{}'.format(src_resource, port_index), connected_to='Peer/P{}'.format(port_index))
+        dst_port = Port('{}/P{}'.format(dst_resource, port_index))
+        if updated_connections is None:
+            updated_connections = self.updated_connections
+        return UpdateConnectionAction(src_port, dst_port, Mock(path_trie=PathTrie()), updated_connections, Mock())
+
+    def test_connections_are_batched_by_resources_pair(self):
+        actions = [self._action('S1', 'N1', 1), self._action('S2', 'N2', 1), self._action('S1', 'N1', 2),
+                   self._action('S2', 'N2', 2)]
+
+        update_connections = ActionsContainer(update_connections=actions).batched_phases()[2]
+
+        self.assertEqual(2, len(update_connections))
+        self.assertTrue(all(isinstance(batch, UpdateConnectionsBatch) for batch in update_connections))
+        self.assertEqual([[actions[0], actions[2]], [actions[1], actions[3]]],
+                         [batch.actions for batch in update_connections])
+
+    def test_batch_keys_of_resources_pair_do_not_cover_other_pairs(self):
+        actions = [self._action('S1', 'N1', 1), self._action('S2', 'N2', 1)]
+
+        batch, _ = ActionsContainer(update_connections=actions + [self._action('S1', 'N1', 2)]).batched_phases()[2]
+
+        self.assertNotIn(('resource', 'S2'), batch.dependency_keys)
+
+    def test_connections_of_different_runs_are_not_batched(self):
+        actions = [self._action('S1', 'N1', 1), self._action('S1', 'N1', 2, {})]
+
+        update_connections = ActionsContainer(update_connections=actions).batched_phases()[2]
+
+        self.assertEqual(actions, update_connections)
+
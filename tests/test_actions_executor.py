@@ -0,0 +1,124 @@
+from unittest import TestCase
+
+from mock import Mock
+
+from cloudshell.migration.entities import Port, Connector
+from cloudshell.migration.operational_entities.actions import ActionsContainer, RemoveRouteAction, \
+    CreateRouteAction, UpdateConnectionAction, RemoveConnectorAction, CreateConnectorAction
+from cloudshell.migration.operational_entities.actions_executor import ActionsExecutor
+from tests.helpers import RecordingOperations, transit_route_index, transit_route, transit_connector, trunk_ports, \
+    logger
+
+
+class TestActionsExecutor(TestCase):
+    def setUp(self):
+        self.operations = RecordingOperations(transit_route_index())
+        self.updated_connections = {}
+        self.logger = logger()
+
+    def _update_connection_action(self, src_port, dst_port):
+        return UpdateConnectionAction(src_port, dst_port, self.operations, self.updated_connections, self.logger)
+
+    def _execute(self, actions_container, workers=4):
+        return list(ActionsExecutor(self.logger, workers).execute(actions_container))
+
+    def test_transit_route_keys_include_resources_of_segments(self):
+        action = RemoveRouteAction(transit_route(), self.operations, self.logger)
+
+        self.assertEqual({('reservation', 'reservation-1'), ('resource', 'A'), ('resource', 'B'),
+                          ('resource', 'S1'), ('resource', 'S2')}, action.dependency_keys)
+
+    def test_connector_keys_include_resources_of_its_route(self):
+        action = RemoveConnectorAction(transit_connector(), self.operations, self.logger)
+
+        self.assertIn(('resource', 'S1'), action.dependency_keys)
+        self.assertIn(('resource', 'S2'), action.dependency_keys)
+
+    def test_transit_route_is_recreated_around_trunk_port_update(self):
+        logical_route = transit_route()
+        actions_container = ActionsContainer(
+            remove_routes=[RemoveRouteAction(logical_route, self.operations, self.logger)],
+            update_connections=[self._update_connection_action(*trunk_ports())],
+            create_routes=[CreateRouteAction(logical_route, self.operations, self.updated_connections,
+                                             self.logger)])
+
+        results = self._execute(actions_container)
+
+        self.assertEqual(3, len(results))
+        position = self.operations.position
+        self.assertLess(position('end', 'remove_route A/P1'), position('start', 'update_connection N2/P1'))
+        self.assertLess(position('end', 'update_connection N2/P1'), position('start', 'create_route A/P1'))
+
+    def test_transit_connector_is_recreated_after_trunk_port_update(self):
+        connector = transit_connector()
+        actions_container = ActionsContainer(
+            remove_connectors=[RemoveConnectorAction(connector, self.operations, self.logger)],
+            update_connections=[self._update_connection_action(*trunk_ports())],
+            create_connectors=[CreateConnectorAction(connector, self.operations, self.updated_connections,
+                                                     self.logger)])
+
+        self._execute(actions_container)
+
+        position = self.operations.position
+        self.assertLess(position('end', 'remove_connector A/P1'), position('start', 'update_connection N2/P1'))
+        self.assertLess(position('end', 'update_connection N2/P1'), position('start', 'update_connector A/P1'))
+
+    def test_independent_actions_run_concurrently(self):
+        actions_container = ActionsContainer(
+            remove_routes=[RemoveRouteAction(transit_route(), self.operations, self.logger)],
+            update_connections=[self._update_connection_action(Port('X/P1', 'X/1', 'Y/P1'), Port('Z/P1', 'Z/1'))])
+
+        self._execute(actions_container)
+
+        self.assertLess(self.operations.position('start', 'update_connection Z/P1'),
+                        self.operations.position('end', 'remove_route A/P1'))
+
+    def test_created_route_uses_updated_connections(self):
+        src_port, dst_port = Port('B/P1', 'B/1', 'S2/P2'), Port('C/P1', 'C/1')
+        logical_route = transit_route()
+        actions_container = ActionsContainer(
+            update_connections=[self._update_connection_action(src_port, dst_port)],
+            create_routes=[CreateRouteAction(logical_route, self.operations, self.updated_connections,
+                                             self.logger)])
+
+        self._execute(actions_container)
+
+        self.assertEqual('C/P1', logical_route.target)
+        self.assertEqual([('C/P1', 'S2/P2')], self.operations.updated_ports)
+
+    def test_single_worker_executes_phases_in_order(self):
+        logical_route = transit_route()
+        actions_container = ActionsContainer(
+            remove_routes=[RemoveRouteAction(logical_route, self.operations, self.logger)],
+            update_connections=[self._update_connection_action(*trunk_ports())],
+            create_routes=[CreateRouteAction(logical_route, self.operations, self.updated_connections,
+                                             self.logger)])
+
+        self._execute(actions_container, workers=1)
+
+        self.assertEqual(['remove_route A/P1', 'update_connection N2/P1', 'create_route A/P1'],
+                         [name for event, name in self.operations.events if event == 'start'])
+
+    def test_actions_finished_after_failure_are_journaled(self):
+        def remove_connector(connector):
+            raise ValueError('Connector {} is busy'.format(connector.source))
+
+        self.operations.remove_connector = remove_connector
+        failed_connector = Connector('X/P1', 'Y/P1', 'reservation-2', 'bi', 'Connector', 'Connector')
+        remove_route = RemoveRouteAction(transit_route(), self.operations, self.logger)
+        actions_container = ActionsContainer(
+            remove_routes=[remove_route],
+            remove_connectors=[RemoveConnectorAction(failed_connector, self.operations, self.logger)],
+            create_connectors=[CreateConnectorAction(failed_connector, self.operations, self.updated_connections,
+                                                     self.logger)])
+        journal = Mock()
+        results = []
+
+        with self.assertRaises(ValueError):
+            for result in ActionsExecutor(self.logger, 4, journal).execute(actions_container):
+                results.append(result)
+
+        # Route removal finished after the connector failed
+        self.assertEqual([remove_route.to_string() + ' ... Done'], results)
+        journal.completed.assert_called_once_with(remove_route)
+        self.assertNotIn(('start', 'update_connector X/P1'), self.operations.events)
@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import Mock
+
+from cloudshell.migration.entities import LogicalRoute, Port, Connector
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.path_trie import PathTrie
+from cloudshell.migration.operational_entities.actions import RemoveRouteAction, CreateRouteAction, \
+    UpdateConnectionAction, RemoveConnectorAction, CreateConnectorAction
+from cloudshell.migration.operational_entities.actions_journal import ActionsJournal
+
+
+class TestActionsJournal(TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.journal_path = os.path.join(self.work_dir, 'run.journal')
+        self.resource_operations = Mock(path_trie=PathTrie())
+        self.route_connector_operations = Mock(path_trie=self.resource_operations.path_trie)
+        # Routes of S1/P1 pass the switch T
+        self.route_connector_operations.route_index.route_resources.return_value = {'S1', 'T', 'B'}
+        self.route_connector_operations.route_index.connector_resources.return_value = {'S1', 'T', 'B'}
+        self.logger = Mock()
+        updated_connections = {}
+        logical_route = LogicalRoute('S1/P1', 'B/P1', 'reservation-1', 'bi', 'Route')
+        connector = Connector('S1/P1', 'B/P1', 'reservation-1', 'bi', 'Connector', 'Connector')
+        self.remove_route = RemoveRouteAction(logical_route, self.route_connector_operations, self.logger)
+        self.remove_connector = RemoveConnectorAction(connector, self.route_connector_operations, self.logger)
+        self.update_connections = [
+            UpdateConnectionAction(Port('S1/P{}'.format(index), 'S1/{}'.format(index), 'B/P{}'.format(index)),
+                                   Port('N1/P{}'.format(index), 'N1/{}'.format(index)), self.resource_operations,
+                                   updated_connections, self.logger) for index in (1, 2)]
+        self.create_route = CreateRouteAction(logical_route, self.route_connector_operations, updated_connections,
+                                              self.logger)
+        self.create_connector = CreateConnectorAction(connector, self.route_connector_operations,
+                                                      updated_connections, self.logger)
+        self.actions = [self.remove_route, self.remove_connector] + self.update_connections + [
+            self.create_route, self.create_connector]
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def _run(self, completed_actions):
+        journal = ActionsJournal(self.journal_path)
+        journal.planned(self.actions)
+        for action in completed_actions:
+            journal.completed(action)
+        journal.close()
+
+    def _resume(self):
+        return ActionsJournal.resume(self.journal_path, self.resource_operations, self.route_connector_operations,
+                                     self.logger)
+
+    def test_not_completed_actions_are_resumed_with_their_identities(self):
+        self._run([self.remove_route, self.update_connections[0]])
+
+        actions_container = self._resume()
+
+        self.assertEqual([action.identity for action in self.actions[1:2] + self.actions[3:]],
+                         [action.identity for action in actions_container.sequence()])
+        self.assertEqual([self.remove_connector.identity],
+                         [action.identity for action in actions_container.remove_connectors])
+
+    def test_run_interrupted_after_connection_updates(self):
+        self._run([self.remove_route, self.remove_connector] + self.update_connections)
+
+        actions_container = self._resume()
+
+        self.assertEqual([], list(actions_container.remove_routes))
+        self.assertEqual([], list(actions_container.update_connections))
+        create_route, = actions_container.create_routes
+        create_connector, = actions_container.create_connectors
+        self.assertEqual(self.create_route.identity, create_route.identity)
+        self.assertEqual('S1/P1', create_route.logical_route.source)
+
+        create_route.execute()
+        create_connector.execute()
+
+        route = self.route_connector_operations.create_route.call_args[0][0]
+        self.assertEqual(('N1/P1', 'B/P1'), (route.source, route.target))
+        connector = self.route_connector_operations.update_connector.call_args[0][0]
+        self.assertEqual(('N1/P1', 'B/P1'), (connector.source, connector.target))
+
+    def test_updated_connections_are_shared_by_resumed_actions(self):
+        self._run([self.update_connections[0]])
+
+        actions_container = self._resume()
+
+        update_connection, = actions_container.update_connections
+        create_route, = actions_container.create_routes
+        self.assertEqual({'S1/P1': 'N1/P1'}, update_connection.updated_connections)
+        self.assertIs(update_connection.updated_connections, create_route._updated_connections)
+
+        update_connection.execute()
+
+        self.assertEqual({'S1/P1': 'N1/P1', 'S1/P2': 'N1/P2'}, create_route._updated_connections)
+
+    def test_resumed_actions_keep_resources_passed_by_removed_routes(self):
+        self._run([self.remove_route, self.remove_connector])
+        # The routes are removed, the route index does not know them anymore
+        self.route_connector_operations.route_index.route_resources.return_value = set()
+        self.route_connector_operations.route_index.connector_resources.return_value = set()
+
+        actions_container = self._resume()
+
+        create_route, = actions_container.create_routes
+        create_connector, = actions_container.create_connectors
+        self.assertEqual({'S1', 'T', 'B'}, create_route.transit_resources)
+        self.assertEqual({'S1', 'T', 'B'}, create_connector.transit_resources)
+        self.assertIn(('resource', 'T'), create_route.dependency_keys)
+
+    def test_corrupted_last_line_is_skipped(self):
+        self._run([self.remove_route])
+        with open(self.journal_path, 'a') as journal_file:
+            journal_file.write('{"event": "completed", "identity": "RemoveConn')
+
+        actions_container = self._resume()
+
+        self.assertEqual(len(self.actions) - 1, len(actions_container.sequence()))
+        self.assertTrue(self.logger.warning.called)
+
+    def test_resumed_journal_is_continued(self):
+        self._run([self.remove_route])
+        actions_container = self._resume()
+        journal = ActionsJournal(self.journal_path)
+        for action in actions_container.sequence()[:2]:
+            journal.completed(action)
+        journal.close()
+
+        self.assertEqual(len(self.actions) - 3, len(self._resume().sequence()))
+
+    def test_journal_without_planned_actions_cannot_be_resumed(self):
+        open(self.journal_path, 'w').close()
+
+        with self.assertRaises(MigrationToolException):
+            self._resume()
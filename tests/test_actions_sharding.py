@@ -0,0 +1,162 @@
+import cPickle as pickle
+import time
+from unittest import TestCase
+
+from mock import Mock, patch
+
+from cloudshell.migration.entities import Port, LogicalRoute, Connector
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.path_trie import PathTrie
+from cloudshell.migration.helpers.route_index import RouteIndex
+from cloudshell.migration.operational_entities import actions_sharding
+from cloudshell.migration.operational_entities.actions import ActionsContainer, RemoveRouteAction, \
+    CreateRouteAction, UpdateConnectionAction, RemoveConnectorAction
+from cloudshell.migration.operational_entities.actions_journal import action_record, build_actions_container
+from cloudshell.migration.operational_entities.actions_sharding import split_components, _execute_component, \
+    ShardedActionsExecutor, _picklable_error
+from tests.helpers import RecordingOperations, transit_route_index, transit_route, trunk_ports, logger
+
+
+class TestSplitComponents(TestCase):
+    def setUp(self):
+        self.operations = RecordingOperations(transit_route_index())
+        self.updated_connections = {}
+        self.logger = logger()
+
+    def _actions_container(self):
+        logical_route = transit_route()
+        unrelated_update = UpdateConnectionAction(Port('X/P1', 'X/1', 'Y/P1'), Port('Z/P1', 'Z/1'),
+                                                  self.operations, self.updated_connections, self.logger)
+        return ActionsContainer(
+            remove_routes=[RemoveRouteAction(logical_route, self.operations, self.logger)],
+            update_connections=[UpdateConnectionAction(trunk_ports()[0], trunk_ports()[1], self.operations,
+                                                       self.updated_connections, self.logger), unrelated_update],
+            create_routes=[CreateRouteAction(logical_route, self.operations, self.updated_connections,
+                                             self.logger)])
+
+    @staticmethod
+    def _component_of(components, port_name):
+        for component in components:
+            if any(action.src_port.name == port_name for action in component.update_connections):
+                return component
+
+    def test_transit_route_and_trunk_port_update_are_one_component(self):
+        components = split_components(self._actions_container())
+
+        self.assertEqual(2, len(components))
+        component = self._component_of(components, 'S2/P1')
+        self.assertEqual(1, len(component.remove_routes))
+        self.assertEqual(1, len(component.create_routes))
+        unrelated_component = self._component_of(components, 'X/P1')
+        self.assertEqual(1, len(unrelated_component.sequence()))
+
+    def test_components_rebuilt_from_records_keep_transit_resources(self):
+        records = [action_record(action) for action in self._actions_container().sequence()]
+        # Worker process does not see the routes removed before
+        operations = RecordingOperations(RouteIndex())
+
+        actions_container = build_actions_container(records, operations, operations, self.logger)
+
+        self.assertEqual(2, len(split_components(actions_container)))
+        remove_route, = actions_container.remove_routes
+        self.assertEqual({'A', 'B', 'S1', 'S2'}, remove_route.transit_resources)
+
+
+def _route_operations():
+    operations = Mock()
+    operations.path_trie = PathTrie()
+    operations.route_index.route_resources.return_value = set()
+    operations.route_index.connector_resources.return_value = set()
+    return operations
+
+
+def _component_actions(source):
+    """
+    Route and connector removal of the resource, the reservation is named by the resource
+    """
+    operations = _route_operations()
+    reservation_id = 'reservation-{}'.format(source)
+    return [RemoveRouteAction(LogicalRoute(source + '/P1', source + '/P2', reservation_id, 'bi', 'Route'),
+                              operations, Mock()),
+            RemoveConnectorAction(Connector(source + '/P3', source + '/P4', reservation_id, 'bi', 'Connector',
+                                            'Connector'), operations, Mock())]
+
+
+def _fake_execute_component(arguments):
+    """
+    Component of the resource A fails at once, component of the resource B finishes later
+    """
+    records = arguments[-1]
+    identities = [record['identity'] for record in records]
+    if records[0]['logical_route']['source'].startswith('A/'):
+        return ['A done'], identities[:1], MigrationToolException('A failed')
+    time.sleep(0.2)
+    return ['B done', 'B done'], identities, None
+
+
+class TestExecuteComponent(TestCase):
+    def setUp(self):
+        self.api = Mock()
+        self.config_operations = Mock()
+        self.config_operations.read_int_key_or_default.return_value = 1
+        patch.object(actions_sharding, 'create_api_session', return_value=self.api).start()
+        patch.object(actions_sharding, 'create_logger', return_value=Mock()).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_completed_identities_are_returned_with_the_error(self):
+        self.api.RemoveConnectorsFromReservation.side_effect = ValueError('connector is busy')
+        remove_route, remove_connector = _component_actions('A')
+
+        results, identities, error = _execute_component((self.config_operations, False, 1, map(
+            action_record, [remove_route, remove_connector])))
+
+        self.assertEqual([remove_route.identity], identities)
+        self.assertEqual(1, len(results))
+        self.assertIsInstance(error, ValueError)
+        self.assertTrue(self.api.RemoveRoutesFromReservation.called)
+
+    def test_component_without_errors(self):
+        results, identities, error = _execute_component((self.config_operations, False, 1, map(
+            action_record, _component_actions('A'))))
+
+        self.assertEqual(2, len(identities))
+        self.assertIsNone(error)
+
+    def test_errors_are_passed_to_the_parent_process(self):
+        class LocalError(Exception):
+            pass
+
+        self.assertEqual('A failed', str(pickle.loads(pickle.dumps(_picklable_error(
+            MigrationToolException('A failed'))))))
+        error = _picklable_error(LocalError('not importable'))
+        self.assertIsInstance(error, MigrationToolException)
+        self.assertEqual('LocalError: not importable', str(pickle.loads(pickle.dumps(error))))
+
+
+
+class TestShardedActionsExecutor(TestCase):
+    def setUp(self):
+        patch.object(actions_sharding, '_execute_component', _fake_execute_component).start()
+        self.journal = Mock()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_running_components_are_finished_and_journaled_after_failure(self):
+        a_actions, b_actions = _component_actions('A'), _component_actions('B')
+        actions_container = ActionsContainer(remove_routes=[a_actions[0], b_actions[0]],
+                                             remove_connectors=[a_actions[1], b_actions[1]])
+        executor = ShardedActionsExecutor(Mock(), None, 2, 1, journal=self.journal)
+        results = []
+
+        with self.assertRaises(MigrationToolException):
+            for result in executor.execute(actions_container):
+                results.append(result)
+
+        self.assertEqual(['A done', 'B done', 'B done'], sorted(results))
+        journaled = [identity for call in self.journal.completed_identities.call_args_list for identity in
+                     call[0][0]]
+        self.assertEqual(sorted([a_actions[0].identity, b_actions[0].identity, b_actions[1].identity]),
+                         sorted(journaled))
@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from cloudshell.api.common_cloudshell_api import CloudShellAPIError
+
+from benchmarks.fake_api import Info
+from cloudshell.migration.exceptions import ReplayedApiError
+from cloudshell.migration.helpers.api_cassette import RecordingApiSession, ReplayApiSession
+
+
+class _Api(object):
+    def GetResourceDetails(self, resourceFullPath=''):
+        if resourceFullPath == 'Missing':
+            raise CloudShellAPIError(100, 'Resource Missing not found', '<xml/>')
+        if resourceFullPath == 'Broken':
+            raise ValueError('Broken response')
+        return Info(Name=resourceFullPath)
+
+
+class TestApiCassette(TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.cassette_path = os.path.join(self.work_dir, 'api.cassette')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def _record(self, *names):
+        api = RecordingApiSession(_Api(), self.cassette_path)
+        for name in names:
+            try:
+                api.GetResourceDetails(name)
+            except Exception:
+                pass
+        api.close()
+        return ReplayApiSession(self.cassette_path)
+
+    def test_replays_response(self):
+        api = self._record('Switch 1')
+
+        self.assertEqual('Switch 1', api.GetResourceDetails('Switch 1').Name)
+
+    def test_replays_error_of_the_recorded_type(self):
+        api = self._record('Missing', 'Broken')
+
+        with self.assertRaises(CloudShellAPIError) as context:
+            api.GetResourceDetails('Missing')
+        self.assertEqual(100, context.exception.code)
+        self.assertEqual('CloudShell API error 100: Resource Missing not found', str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            api.GetResourceDetails('Broken')
+        self.assertEqual('Broken response', str(context.exception))
+
+    def test_unknown_error_type_is_replayed_as_migration_tool_error(self):
+        api = self._record('Missing')
+        record, = api._records.values()[0]
+        record['error_record']['type'] = 'missing_module.MissingError'
+
+        with self.assertRaises(ReplayedApiError) as context:
+            api.GetResourceDetails('Missing')
+        self.assertEqual('missing_module.MissingError', context.exception.error_type)
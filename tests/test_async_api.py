@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from mock import Mock
+
+from cloudshell.migration.helpers.async_api import AsyncApiClient
+
+
+class TestAsyncApiClient(TestCase):
+    def test_calls_are_executed_in_place_with_one_worker(self):
+        api = Mock()
+        api.GetResourceDetails.return_value = 'details'
+        async_api = AsyncApiClient(api, 1)
+
+        self.assertEqual(async_api.GetResourceDetails('R 0').get(), 'details')
+        self.assertIsNone(async_api._pool)
+
+    def test_errors_are_handled_by_gather(self):
+        api = Mock()
+        api.GetResourceDetails.side_effect = ValueError('missing')
+        async_api = AsyncApiClient(api, 1)
+
+        self.assertEqual(AsyncApiClient.gather([async_api.GetResourceDetails('R 0')], lambda index, e: str(e)),
+                         ['missing'])
+
+    def test_close_stops_the_worker_threads(self):
+        api = Mock()
+        api.GetResourceDetails.side_effect = lambda name: name
+        async_api = AsyncApiClient(api, 4)
+
+        results = AsyncApiClient.gather([async_api.GetResourceDetails('R {}'.format(i)) for i in range(10)])
+        self.assertEqual(results, ['R {}'.format(i) for i in range(10)])
+        workers = list(async_api._pool._pool)
+        self.assertTrue(all(worker.is_alive() for worker in workers))
+
+        async_api.close()
+        self.assertIsNone(async_api._pool)
+        self.assertFalse(any(worker.is_alive() for worker in workers))
+
+    def test_clients_do_not_share_the_pool(self):
+        first, second = AsyncApiClient(Mock(), 2), AsyncApiClient(Mock(), 2)
+        first.GetResourceDetails('R 0').get()
+        second.GetResourceDetails('R 0').get()
+        try:
+            self.assertIsNot(first._pool, second._pool)
+        finally:
+            first.close()
+            second.close()
+
+    def test_close_without_calls(self):
+        async_api = AsyncApiClient(Mock(), 4)
+        async_api.close()
+        self.assertIsNone(async_api._pool)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+from StringIO import StringIO
+from unittest import TestCase
+
+import yaml
+
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.backup_codecs import YamlCodec, JsonLinesCodec, ManifestCodec, detect_codec, \
+    get_codec
+from cloudshell.migration.helpers.backup_writer import BackupWriter, load_backup
+from tests.helpers import backup_resource
+
+
+class TestBackupCodecs(TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.resources = [backup_resource('R 0'), backup_resource('R 1', 3)]
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def _round_trip(self, codec, resources=None):
+        backup_file = os.path.join(self.work_dir, 'backup' + codec.EXTENSION)
+        with BackupWriter(backup_file, codec) as backup_writer:
+            for resource in resources or self.resources:
+                backup_writer.write(resource)
+        return load_backup(backup_file)
+
+    def _assert_resources_equal(self, expected, loaded):
+        self.assertEqual(map(JsonLinesCodec.resource_record, expected), map(JsonLinesCodec.resource_record, loaded))
+
+    def test_yaml_round_trip(self):
+        self._assert_resources_equal(self.resources, self._round_trip(YamlCodec()))
+
+    def test_json_lines_round_trip(self):
+        loaded = self._round_trip(JsonLinesCodec())
+
+        self._assert_resources_equal(self.resources, loaded)
+        port = loaded[0].ports[0]
+        # ASCII values are str like the YAML loader keeps them
+        self.assertIs(str, type(port.name))
+        self.assertIs(port.name, loaded[0].associated_logical_routes[0].source)
+        self.assertEqual(('Serial Number', 'SN-1', 'String'), tuple(loaded[0].attributes['Serial Number']))
+
+    def test_json_lines_keeps_unicode_names(self):
+        resource = backup_resource(u'Résumé 0')
+
+        loaded, = self._round_trip(JsonLinesCodec(), [resource])
+
+        self.assertEqual(u'Résumé 0', loaded.name)
+        self.assertIs(unicode, type(loaded.name))
+        self.assertEqual(u'Résumé 0/M1/P1', loaded.ports[0].name)
+        self.assertIs(str, type(loaded.family))
+
+    def test_yaml_keeps_unicode_names(self):
+        loaded, = self._round_trip(YamlCodec(), [backup_resource(u'Résumé 0')])
+
+        self.assertEqual(u'Résumé 0/M1/P1', loaded.ports[0].name)
+
+    def test_legacy_single_document_yaml(self):
+        backup_file = os.path.join(self.work_dir, 'legacy.yaml')
+        with open(backup_file, 'w') as backup_stream:
+            yaml.dump(self.resources, backup_stream, default_flow_style=False)
+
+        self._assert_resources_equal(self.resources, load_backup(backup_file))
+
+    def test_detect_codec(self):
+        for codec in [YamlCodec(), JsonLinesCodec(), ManifestCodec(os.path.join(self.work_dir, 'Store'))]:
+            stream = StringIO()
+            codec.write_header(stream, os.path.join(self.work_dir, 'backup' + codec.EXTENSION))
+            stream.write('---\n' if isinstance(codec, YamlCodec) else '{}\n')
+            stream.seek(0)
+
+            self.assertIs(codec.__class__, detect_codec(stream).__class__)
+            # The header is read by the detected codec
+            self.assertEqual(0, stream.tell())
+
+    def test_unknown_format_is_not_detected(self):
+        with self.assertRaises(MigrationToolException):
+            detect_codec(StringIO('{"format": "unknown", "version": 1}\n'))
+
+    def test_newer_version_is_not_read(self):
+        stream = StringIO('{"format": "%s", "version": 2}\n' % JsonLinesCodec.FORMAT)
+
+        with self.assertRaises(MigrationToolException):
+            JsonLinesCodec().read_header(stream, 'backup.jsonl')
+
+    def test_unknown_codec_name(self):
+        with self.assertRaises(MigrationToolException):
+            get_codec('xml')
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import yaml
+from mock import Mock, patch
+
+from benchmarks.fake_api import SyntheticInventory, FakeApi
+from cloudshell.migration.command_handlers.backup_handler import BackupHandler
+from cloudshell.migration.operations.config_operations import ConfigOperations
+from cloudshell.migration.operations.resource_operations import ResourceOperations
+from cloudshell.migration.operations.route_connector_operations import RouteConnectorOperations
+
+
+class _LoadedStateWriter(object):
+    """
+    Backup writer measuring what is loaded when every resource is written
+    """
+
+    def __init__(self, resources, resource_operations):
+        self._resources = resources
+        self._resource_operations = resource_operations
+        self.written = 0
+        self.max_details = 0
+        self.max_ports = 0
+        # Resources list and reservations routes are indexed in the trie before the backup
+        self._indexed_paths = len(resource_operations.path_trie._nodes)
+        self.max_loaded_paths = 0
+
+    def write(self, resource):
+        self.written += 1
+        self.max_details = max(self.max_details, len(self._resource_operations._ResourceOperations__resource_details))
+        self.max_ports = max(self.max_ports, sum(len(resource.ports) for resource in self._resources))
+        self.max_loaded_paths = max(self.max_loaded_paths,
+                                    len(self._resource_operations.path_trie._nodes) - self._indexed_paths)
+
+    def flush(self):
+        pass
+
+
+class TestWriteResources(TestCase):
+    CHUNK_SIZE = 5
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        config_path = os.path.join(self.work_dir, 'config.yml')
+        with open(config_path, 'w') as config_file:
+            yaml.dump({'password': 'admin', 'backup_location': self.work_dir}, config_file)
+        self.config_operations = ConfigOperations(config_path)
+        patch.object(BackupHandler, 'CHUNK_SIZE', self.CHUNK_SIZE).start()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.work_dir)
+
+    def _write_resources(self, resources_number):
+        api = FakeApi(SyntheticInventory(resources_number))
+        resource_operations = ResourceOperations(api, Mock(), self.config_operations)
+        route_connector_operations = RouteConnectorOperations(api, Mock(), self.config_operations,
+                                                              path_trie=resource_operations.path_trie)
+        backup_handler = BackupHandler(api, Mock(), self.config_operations, None, resource_operations,
+                                       route_connector_operations)
+        resources = resource_operations.resources
+        route_connector_operations.route_index
+        backup_writer = _LoadedStateWriter(resources, resource_operations)
+        try:
+            backup_handler.write_resources(backup_writer, resources)
+        finally:
+            resource_operations.close()
+            route_connector_operations.close()
+        self.assertEqual(resources_number, backup_writer.written)
+        self.assertTrue(all(not resource.ports and not resource.attributes for resource in resources))
+        return backup_writer
+
+    def test_memory_does_not_grow_with_resources(self):
+        small = self._write_resources(self.CHUNK_SIZE * 2)
+        large = self._write_resources(self.CHUNK_SIZE * 8)
+
+        self.assertLessEqual(large.max_details, self.CHUNK_SIZE)
+        self.assertEqual(small.max_details, large.max_details)
+        self.assertEqual(small.max_ports, large.max_ports)
+        self.assertEqual(small.max_loaded_paths, large.max_loaded_paths)
@@ -0,0 +1,166 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+import yaml
+from click.testing import CliRunner
+from mock import patch, Mock
+
+from cloudshell.migration.bootstrap import cli
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers.backup_codecs import ManifestCodec
+from cloudshell.migration.helpers.backup_store import BackupStore
+from cloudshell.migration.helpers.backup_writer import BackupWriter, load_backup, find_manifests, \
+    referenced_digests, prune_store
+from tests.helpers import backup_resource
+
+
+class TestBackupStore(TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.backup_location = os.path.join(self.work_dir, 'Backup')
+        self.store_path = os.path.join(self.backup_location, 'Store')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def _backup(self, file_name, resources, backup_location=None):
+        backup_file = os.path.join(backup_location or self.backup_location, file_name)
+        codec = ManifestCodec(self.store_path)
+        with BackupWriter(backup_file, codec) as backup_writer:
+            for resource in resources:
+                backup_writer.write(resource)
+        return backup_file, codec
+
+    def test_unchanged_resources_are_stored_once(self):
+        resources = [backup_resource('R 0'), backup_resource('R 1')]
+        _, first_codec = self._backup('first.manifest', resources)
+        resources[1].ports[1].connected_to = 'R 2/M1/P1'
+        second_file, second_codec = self._backup('second.manifest', resources)
+
+        self.assertEqual((2, 0), (first_codec.stored, first_codec.reused))
+        self.assertEqual((1, 1), (second_codec.stored, second_codec.reused))
+        self.assertEqual(3, len(list(BackupStore(self.store_path).digests())))
+        self.assertEqual('R 2/M1/P1', load_backup(second_file)[1].ports[1].connected_to)
+
+    def test_missing_record_is_reported(self):
+        backup_file, _ = self._backup('backup.manifest', [backup_resource('R 0')])
+        store = BackupStore(self.store_path)
+        digest, = store.digests()
+        os.remove(store._record_path(digest))
+
+        with self.assertRaises(MigrationToolException):
+            load_backup(backup_file)
+
+    def test_store_path_is_relative_to_the_manifest(self):
+        self._backup('backup.manifest', [backup_resource('R 0')])
+        nested_file, _ = self._backup('backup.manifest', [backup_resource('R 1')],
+                                      os.path.join(self.backup_location, 'nested'))
+        with open(nested_file) as manifest_stream:
+            self.assertEqual(os.path.join('..', 'Store'), json.loads(manifest_stream.readline())['store'])
+
+        moved_location = os.path.join(self.work_dir, 'Moved')
+        shutil.move(self.backup_location, moved_location)
+
+        resource, = load_backup(os.path.join(moved_location, 'backup.manifest'))
+        self.assertEqual('R 0/M1/P1', resource.ports[0].name)
+        resource, = load_backup(os.path.join(moved_location, 'nested', 'backup.manifest'))
+        self.assertEqual('R 1/M1/P1', resource.ports[0].name)
+
+    def test_prune_removes_records_not_referenced(self):
+        first_file, _ = self._backup('first.manifest', [backup_resource('R 0'), backup_resource('R 1')])
+        second_file, _ = self._backup('second.manifest', [backup_resource('R 1'), backup_resource('R 2')])
+        os.remove(first_file)
+        store = BackupStore(self.store_path)
+
+        manifest_files = find_manifests(self.backup_location)
+        self.assertEqual([second_file], manifest_files)
+        digests = referenced_digests(manifest_files, self.store_path)
+        self.assertEqual(1, len(store.prune(digests, dry_run=True)))
+        self.assertEqual(3, len(list(store.digests())))
+
+        self.assertEqual(1, len(store.prune(digests)))
+        self.assertEqual(digests, set(store.digests()))
+        self.assertEqual(['R 1', 'R 2'], [resource.name for resource in load_backup(second_file)])
+
+    def test_manifests_are_found_by_the_extension(self):
+        backup_file, _ = self._backup('backup.manifest', [backup_resource('R 0')])
+        with gzip.open(os.path.join(self.backup_location, 'compressed.manifest.gz'), 'w') as compressed_file:
+            with open(backup_file) as manifest_stream:
+                compressed_file.write(manifest_stream.read())
+        for file_name in ['x.manifest.index.tmp', 'backup.manifest.tmp', 'backup.jsonl']:
+            with open(os.path.join(self.backup_location, file_name), 'w') as other_file:
+                other_file.write('{')
+
+        self.assertEqual([backup_file, os.path.join(self.backup_location, 'compressed.manifest.gz')],
+                         find_manifests(self.backup_location))
+        manifest_files, removed = prune_store(BackupStore(self.store_path), find_manifests(self.backup_location))
+        self.assertEqual(2, len(manifest_files))
+        self.assertEqual([], removed)
+
+    def test_registered_manifests_are_kept(self):
+        outside_file, _ = self._backup('outside.manifest', [backup_resource('R 0')], self.work_dir)
+        removed_file, _ = self._backup('removed.manifest', [backup_resource('R 1')], self.work_dir)
+        os.remove(removed_file)
+        store = BackupStore(self.store_path)
+
+        manifest_files, removed = prune_store(store)
+        self.assertEqual([outside_file], manifest_files)
+        self.assertEqual(1, len(removed))
+        self.assertEqual([outside_file], store.manifests())
+        self.assertEqual(['R 0'], [resource.name for resource in load_backup(outside_file)])
+
+    def test_records_of_the_backup_in_progress_are_kept(self):
+        backup_file = os.path.join(self.backup_location, 'backup.manifest')
+        backup_writer = BackupWriter(backup_file, ManifestCodec(self.store_path), flush_interval=10)
+        backup_writer.write(backup_resource('R 0'))
+        store = BackupStore(self.store_path)
+
+        self.assertEqual([], prune_store(store, find_manifests(self.backup_location))[1])
+        backup_writer.close()
+        self.assertEqual({}, store.pending())
+        self.assertEqual(([backup_file], []), prune_store(store))
+        self.assertEqual(['R 0'], [resource.name for resource in load_backup(backup_file)])
+
+    def test_prune_waits_for_the_store_lock(self):
+        self._backup('backup.manifest', [backup_resource('R 0')])
+        os.remove(os.path.join(self.backup_location, 'backup.manifest'))
+        removed = []
+        prune_thread = threading.Thread(target=lambda: removed.extend(prune_store(BackupStore(self.store_path))[1]))
+        with BackupStore(self.store_path).lock():
+            prune_thread.start()
+            prune_thread.join(0.2)
+            self.assertTrue(prune_thread.is_alive())
+            self.assertEqual([], removed)
+        prune_thread.join()
+        self.assertEqual(1, len(removed))
+
+    def test_manifests_of_other_stores_are_skipped(self):
+        other_file = os.path.join(self.work_dir, 'other.manifest')
+        with BackupWriter(other_file, ManifestCodec(os.path.join(self.work_dir, 'Other Store'))) as backup_writer:
+            backup_writer.write(backup_resource('R 0'))
+
+        self.assertEqual(set(), referenced_digests([other_file], self.store_path))
+
+    def test_prune_command(self):
+        # Outside manifest is moved after it was written, its registered path is gone
+        config_path = os.path.join(self.work_dir, 'config.yml')
+        with open(config_path, 'w') as config_file:
+            yaml.dump({'password': 'admin', 'backup_location': self.backup_location}, config_file)
+        first_file, _ = self._backup('first.manifest', [backup_resource('R 0')])
+        written_file, _ = self._backup('outside.manifest', [backup_resource('R 1')], self.work_dir)
+        outside_file = os.path.join(self.work_dir, 'moved.manifest')
+        shutil.move(written_file, outside_file)
+        os.remove(first_file)
+
+        with patch('cloudshell.migration.bootstrap._initialize_logger', return_value=Mock()):
+            result = CliRunner().invoke(cli, ['prune', '--config', config_path, '--backup-file', outside_file,
+                                              '--yes'])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn('Records removed: 1', result.output)
+        self.assertEqual(['R 1'], [resource.name for resource in load_backup(outside_file)])
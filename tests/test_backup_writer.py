@@ -0,0 +1,100 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import patch
+
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.helpers import backup_writer as backup_writer_module
+from cloudshell.migration.helpers.backup_codecs import YamlCodec, JsonLinesCodec
+from cloudshell.migration.helpers.backup_compression import open_backup_file, lzma, GZIP, XZ, EXTENSIONS
+from cloudshell.migration.helpers.backup_index import BackupIndex
+from cloudshell.migration.helpers.backup_writer import BackupWriter, load_backup_resources
+from tests.helpers import backup_resource
+
+COMPRESSIONS = [None, GZIP] + ([XZ] if lzma else [])
+
+
+class TestBackupIndex(TestCase):
+    NAMES = ['R {}'.format(index) for index in xrange(5)]
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.load_backup = patch.object(backup_writer_module, 'load_backup',
+                                        wraps=backup_writer_module.load_backup).start()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.work_dir)
+
+    def _write(self, codec, compression=None):
+        backup_file = os.path.join(self.work_dir, 'backup' + codec.EXTENSION + EXTENSIONS.get(compression, ''))
+        with BackupWriter(backup_file, codec, compression, flush_interval=2) as backup_writer:
+            for name in self.NAMES:
+                backup_writer.write(backup_resource(name))
+        return backup_file
+
+    def test_offsets_point_at_the_documents(self):
+        for codec in [YamlCodec(), JsonLinesCodec()]:
+            for compression in COMPRESSIONS:
+                backup_file = self._write(codec, compression)
+                with open_backup_file(backup_file) as backup_stream:
+                    content = backup_stream.read()
+
+                backup_index = BackupIndex.load(backup_file)
+
+                self.assertEqual(codec.NAME, backup_index.codec_name)
+                self.assertEqual(set(self.NAMES), set(backup_index.records))
+                for name, (offset, length) in backup_index.records.iteritems():
+                    self.assertEqual(name, codec.load_document(content[offset:offset + length]).name)
+
+    def test_requested_resources_are_read_by_the_index(self):
+        for codec in [YamlCodec(), JsonLinesCodec()]:
+            for compression in COMPRESSIONS:
+                backup_file = self._write(codec, compression)
+
+                resources = load_backup_resources(backup_file, ['R 3', 'R 1', 'Missing'])
+
+                self.assertEqual({'R 1', 'R 3'}, set(resources))
+                self.assertEqual('R 3/M1/P1', resources['R 3'].ports[0].name)
+        self.assertFalse(self.load_backup.called)
+
+    def test_stale_index_falls_back_to_the_whole_backup(self):
+        backup_file = self._write(JsonLinesCodec())
+        with open(backup_file, 'a') as backup_stream:
+            backup_stream.write(json.dumps(JsonLinesCodec.resource_record(backup_resource('R 5'))) + '\n')
+
+        self.assertIsNone(BackupIndex.load(backup_file))
+        resources = load_backup_resources(backup_file, ['R 1', 'R 5'])
+
+        self.assertEqual({'R 1', 'R 5'}, set(resources))
+        self.assertTrue(self.load_backup.called)
+
+    def test_missing_index_falls_back_to_the_whole_backup(self):
+        backup_file = self._write(YamlCodec(), GZIP)
+        os.remove(BackupIndex.index_path(backup_file))
+
+        self.assertEqual({'R 2'}, set(load_backup_resources(backup_file, ['R 2'])))
+        self.assertTrue(self.load_backup.called)
+
+    def test_index_of_another_backup_of_the_same_size_is_rejected(self):
+        backup_file = self._write(JsonLinesCodec())
+        backup_index = BackupIndex.load(backup_file)
+        backup_index.records['R 1'], backup_index.records['R 2'] = (backup_index.records['R 2'],
+                                                                    backup_index.records['R 1'])
+        backup_index.save(backup_file)
+
+        with self.assertRaises(MigrationToolException):
+            load_backup_resources(backup_file, ['R 1'])
+
+    def test_interrupted_backup_has_no_index(self):
+        backup_file = os.path.join(self.work_dir, 'backup.jsonl')
+        backup_writer = BackupWriter(backup_file, JsonLinesCodec())
+        backup_writer.write(backup_resource('R 0'))
+        backup_writer.flush()
+
+        self.assertIsNone(BackupIndex.load(backup_file))
+        backup_writer.close()
+        self.assertIsNotNone(BackupIndex.load(backup_file))
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import yaml
+from click.testing import CliRunner
+from mock import patch, Mock
+
+from benchmarks.fake_api import SyntheticInventory, FakeApi
+from cloudshell.migration.bootstrap import cli
+
+
+class TestStreamMigration(TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.work_dir, 'config.yml')
+        with open(self.config_path, 'w') as config_file:
+            yaml.dump({'password': 'admin', 'backup_location': self.work_dir, 'log_path': self.work_dir},
+                      config_file)
+        self.api = FakeApi(SyntheticInventory(2, reservations=1, routes_per_reservation=1))
+        patch('cloudshell.migration.bootstrap._initialize_api', return_value=self.api).start()
+        patch('cloudshell.migration.bootstrap._initialize_logger', return_value=Mock()).start()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.work_dir)
+
+    def _migrate(self, *args, **kwargs):
+        return CliRunner().invoke(cli, ['migrate', '--config', self.config_path, '--stream'] + list(args) + [
+            '*/L1 Switch/Old Model', '*/L1 Switch/New Model'], **kwargs)
+
+    def test_pairs_and_planned_actions_are_shown_before_confirmation(self):
+        result = self._migrate(input='n\n')
+
+        self.assertEqual(1, result.exit_code, result.output)
+        output, confirmation = result.output.split('Do you want to continue?')
+        self.assertIn('R 0/L1 Switch/Old Model/*=>new_R 0/L1 Switch/New Model/* (will be created)', output)
+        self.assertIn('R 1/L1 Switch/Old Model/*=>new_R 1/L1 Switch/New Model/* (will be created)', output)
+        self.assertIn('Connections of 8 SRC ports will be migrated', output)
+        self.assertIn('Remove Route: R 0/Chassis 1/Module 2/Sub Module 1/Port 1<->', output)
+        self.assertIn('Remove Connector: R 0/Chassis 1/Module 2/Sub Module 1/Port 1<->', output)
+        self.assertIn('Aborted', confirmation)
+        self.assertNotIn('CreateResource', self.api.calls)
+
+    def test_confirmed_stream_migrates_pairs(self):
+        result = self._migrate('--yes', '--no-backup')
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual(2, self.api.calls['CreateResource'])
+        self.assertIn('Migrating R 0/L1 Switch/Old Model/Old Driver=>new_R 0/L1 Switch/New Model/*:', result.output)
+
+
+class TestShowStatistics(TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.work_dir, 'config.yml')
+        with open(self.config_path, 'w') as config_file:
+            yaml.dump({'password': 'admin', 'log_path': self.work_dir}, config_file)
+        patch('cloudshell.migration.bootstrap.create_api_session', return_value=FakeApi(SyntheticInventory(2))).start()
+        self.logger = Mock(handlers=[Mock(baseFilename=os.path.join(self.work_dir, 'migration.log'))])
+        patch('cloudshell.migration.bootstrap.create_logger', return_value=self.logger).start()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.work_dir)
+
+    def test_statistics_are_written_to_the_log(self):
+        result = CliRunner().invoke(cli, ['show', '--config', self.config_path, '--no-cache', '--stats'])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn('API calls statistics:', result.output)
+        message, = [call[0][0] for call in self.logger.info.call_args_list]
+        self.assertTrue(message.startswith('API calls statistics:'))
+        self.assertIn('GetResourceList', message)
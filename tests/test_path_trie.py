@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from cloudshell.migration.helpers.path_trie import PathTrie
+
+
+class TestPathTrie(TestCase):
+    def setUp(self):
+        self.path_trie = PathTrie()
+        self.path_trie.add('R 0')
+        self.path_trie.add('R 0/M1/P1')
+
+    def test_added_paths_are_resolved(self):
+        self.assertEqual('R 0', self.path_trie.resource('R 0/M1/P1'))
+        self.assertEqual('M1/P1', self.path_trie.relative('R 0/M1/P1'))
+        self.assertEqual('P1', self.path_trie.leaf('R 0/M1/P1'))
+        self.assertIn('R 0/M1/P1', self.path_trie)
+        # Prefix of the added path is not known
+        self.assertNotIn('R 0/M1', self.path_trie)
+
+    def test_unknown_paths_are_resolved_without_adding_them(self):
+        nodes = len(self.path_trie._nodes)
+
+        self.assertEqual('R 1', self.path_trie.resource('R 1/M1/P1'))
+        self.assertEqual('M1/P1', self.path_trie.relative('R 1/M1/P1'))
+        self.assertEqual('', self.path_trie.relative('R 1'))
+        self.assertEqual('P1', self.path_trie.leaf('R 1/M1/P1'))
+        self.assertEqual('R 1', self.path_trie.leaf('R 1'))
+
+        self.assertEqual(nodes, len(self.path_trie._nodes))
+        self.assertNotIn('R 1/M1/P1', self.path_trie)
+
+    def test_subtree_lists_known_paths(self):
+        self.path_trie.add('R 0/M1/P2')
+        self.path_trie.add('R 0/M2/P1')
+        self.path_trie.add('R 10/M1/P1')
+
+        self.assertEqual(['R 0/M1/P1', 'R 0/M1/P2'], sorted(self.path_trie.subtree('R 0/M1')))
+        self.assertEqual(4, len(self.path_trie.subtree('R 0')))
+        self.assertEqual([], self.path_trie.subtree('R 1'))
+
+    def test_prefix_queries(self):
+        self.assertTrue(self.path_trie.has_prefix('R 0/M1'))
+        self.assertFalse(self.path_trie.has_prefix('R 0/M2'))
+        # Prefixes are matched by the path elements, not by the characters
+        self.assertFalse(self.path_trie.has_prefix('R'))
+
+    def test_discarded_subtree(self):
+        self.path_trie.discard('R 0')
+
+        self.assertFalse(self.path_trie.has_prefix('R 0'))
+        self.assertEqual('R 0', self.path_trie.resource('R 0/M1/P1'))
+
+    def test_tries_are_not_shared(self):
+        self.assertNotIn('R 0/M1/P1', PathTrie())
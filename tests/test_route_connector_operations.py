@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from mock import Mock
+
+from cloudshell.migration.entities import LogicalRoute
+from cloudshell.migration.exceptions import MigrationToolException
+from cloudshell.migration.operational_entities.actions import ActionsContainer, CreateRouteAction, \
+    CreateRoutesBatch
+from cloudshell.migration.operations.route_connector_operations import RouteConnectorOperations
+
+
+class TestCreateRoutes(TestCase):
+    def setUp(self):
+        self.api = Mock()
+        config_operations = Mock()
+        config_operations.read_int_key_or_default.return_value = 1
+        self.operations = RouteConnectorOperations(self.api, Mock(), config_operations)
+
+    @staticmethod
+    def _route(source, target, active=True):
+        return LogicalRoute(source, target, 'reservation-1', 'bi', 'Route', active)
+
+    def test_routes_of_one_source_are_created_with_one_call(self):
+        self.operations.create_routes([self._route('A/P1', 'B/P1'), self._route('A/P1', 'C/P1')])
+
+        self.api.CreateRoutesInReservation.assert_called_once_with('reservation-1', ['A/P1'], ['B/P1', 'C/P1'],
+                                                                   False, 'bi', 2, 'Route', False)
+
+    def test_inactive_routes_of_one_source_are_added_with_one_call(self):
+        self.operations.create_routes([self._route('A/P1', 'B/P1', False), self._route('A/P1', 'C/P1', False)])
+
+        self.api.AddRoutesToReservation.assert_called_once_with('reservation-1', ['A/P1'], ['B/P1', 'C/P1'], 'bi',
+                                                                2, 'Route', False)
+
+    def test_routes_of_different_sources_are_not_created_with_one_call(self):
+        with self.assertRaises(MigrationToolException):
+            self.operations.create_routes([self._route('A/P1', 'B/P1'), self._route('C/P1', 'D/P1')])
+        self.assertFalse(self.api.CreateRoutesInReservation.called)
+
+    def test_create_route_actions_are_batched_by_source(self):
+        routes = [self._route('A/P1', 'B/P1'), self._route('C/P1', 'D/P1'), self._route('A/P1', 'E/P1')]
+        actions_container = ActionsContainer(
+            create_routes=[CreateRouteAction(route, self.operations, {}, Mock()) for route in routes])
+
+        create_routes = actions_container.batched_phases()[3]
+
+        self.assertEqual(2, len(create_routes))
+        batch, action = create_routes
+        self.assertIsInstance(batch, CreateRoutesBatch)
+        self.assertEqual([routes[0], routes[2]], [batch_action.logical_route for batch_action in batch.actions])
+        self.assertIs(routes[1], action.logical_route)
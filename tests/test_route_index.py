@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from cloudshell.migration.helpers.path_trie import PathTrie
+from benchmarks.fake_api import Info
+from tests.helpers import transit_route_index, transit_route, RESERVATION_ID
+
+
+class TestRouteIndex(TestCase):
+    def setUp(self):
+        self.path_trie = PathTrie()
+        self.route_index = transit_route_index(self.path_trie)
+
+    def test_segments_ports_are_added_to_the_trie(self):
+        self.assertEqual(['S2/P1', 'S2/P2'], sorted(self.path_trie.subtree('S2')))
+        self.assertTrue(self.path_trie.has_prefix('A'))
+
+    def test_route_resources(self):
+        self.assertEqual({'A', 'S1', 'S2', 'B'}, self.route_index.route_resources(transit_route()))
+
+    def test_routes_by_resource(self):
+        self.assertEqual({transit_route()}, self.route_index.by_resource('S1'))
+        self.assertEqual({transit_route()}, self.route_index.by_resource('B'))
+        self.assertEqual(set(), self.route_index.by_resource('C'))
+
+    def test_resource_of_several_routes(self):
+        segments = [Info(Source='C/P1', Target='S1/P3'), Info(Source='S1/P3', Target='D/P1')]
+        self.route_index.add_reservation('reservation-2', Info(ActiveRoutesInfo=[], RequestedRoutesInfo=[
+            Info(Source='C/P1', Target='D/P1', RouteType='bi', Alias='Route', Shared=False, Segments=segments)]))
+
+        self.assertEqual({('A/P1', 'B/P1'), ('C/P1', 'D/P1')},
+                         {(route.source, route.target) for route in self.route_index.by_resource('S1')})
+        self.assertEqual([('A/P1', 'B/P1')], [(route.source, route.target) for route in
+                                              self.route_index.by_reservation(RESERVATION_ID)])
+
+    def test_endpoint_and_transit_ports(self):
+        self.assertTrue(self.route_index.is_endpoint('A/P1'))
+        self.assertTrue(self.route_index.is_endpoint('S1/P1'))
+        self.assertFalse(self.route_index.is_endpoint('S1/P2'))
+        self.assertIsNone(self.route_index.is_endpoint('C/P1'))
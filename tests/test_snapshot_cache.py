@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from benchmarks.fake_api import Info
+from cloudshell.migration.helpers.snapshot_cache import SnapshotCache
+
+
+class TestSnapshotCache(TestCase):
+    KEY = ('GetResourceDetails', 'Switch 1')
+
+    def setUp(self):
+        self.cache_location = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_location)
+
+    def _cache(self, username='admin', ttl=600, refresh=False):
+        return SnapshotCache(self.cache_location, 'localhost', 'Global', username, ttl, refresh)
+
+    def _store_details(self):
+        port = Info(Name='Switch 1/Port 1', Connections=[Info(FullPath='Switch 2/Port 1', Weight=None)],
+                    ChildResources=[])
+        snapshot_cache = self._cache()
+        snapshot_cache.set(self.KEY, Info(Name='Switch 1', ChildResources=[port], Connections=[]))
+        snapshot_cache.save()
+
+    def test_stored_as_plain_records(self):
+        self._store_details()
+
+        found, details = self._cache().get(self.KEY)
+
+        self.assertTrue(found)
+        self.assertEqual('Switch 1', details.Name)
+        self.assertIs(str, type(details.Name))
+        self.assertEqual('Switch 2/Port 1', details.ChildResources[0].Connections[0].FullPath)
+        self.assertIsNone(details.ChildResources[0].Connections[0].Weight)
+        cache_file, = os.listdir(self.cache_location)
+        self.assertTrue(cache_file.endswith('.json'))
+
+    def test_snapshot_of_another_user_is_not_used(self):
+        self._store_details()
+
+        self.assertEqual((False, None), self._cache(username='operator').get(self.KEY))
+
+    def test_expired_and_refreshed_entries_are_not_used(self):
+        self._store_details()
+        time.sleep(0.01)
+
+        self.assertEqual((False, None), self._cache(ttl=0).get(self.KEY))
+        self.assertEqual((False, None), self._cache(refresh=True).get(self.KEY))
+
+    def test_delete_removes_stored_snapshot(self):
+        self._store_details()
+
+        self._cache().delete()
+
+        self.assertEqual([], os.listdir(self.cache_location))
+        self.assertEqual((False, None), self._cache().get(self.KEY))